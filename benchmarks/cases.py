@@ -0,0 +1,276 @@
+"""
+The benchmark cases, each comparing a Serializable type against pickle and hand-written struct code
+
+Every case is built for a payload size and returns one Implementation per way of saving the same data. Each
+implementation has an encode function returning bytes and a decode function loading them back.
+"""
+from pyserialization.composite import Composite
+from pyserialization.seriallist import serial_list
+from pyserialization.serialfloat import SerialDouble
+from pyserialization.serialint import SerialU8, SerialU32
+from pyserialization.serialstring import SerialString
+from pyserialization.union import Union
+
+import collections
+import pickle
+import random
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+Implementation = collections.namedtuple('Implementation', 'name encode decode')
+
+SIZES = collections.OrderedDict([('small', 0), ('medium', 1), ('large', 2)])
+
+_U32 = struct.Struct('=I')
+_RECORD = struct.Struct('=IddB')
+
+
+class Record(Composite):
+    id = SerialU32
+    x = SerialDouble
+    y = SerialDouble
+    flags = SerialU8
+    name = SerialString
+
+
+class Message(Union):
+    record = Record
+    number = SerialU32
+    text = SerialString
+
+
+RecordList = serial_list(Record)
+MessageList = serial_list(Message)
+IntList = serial_list(SerialU32)
+CompactIntList = serial_list(SerialU32, compact=True)
+
+
+def _pickle(value):
+    """Returns the Implementation saving a Python value with pickle"""
+    return Implementation('pickle', lambda: pickle.dumps(value, pickle.HIGHEST_PROTOCOL), pickle.loads)
+
+
+def _serializable(name, obj):
+    """Returns the Implementation saving a Serializable object with to_bytes and loading it with from_bytes"""
+    Type = type(obj)
+    return Implementation(name, obj.to_bytes, lambda data: Type.from_bytes(data)[0])
+
+
+def _ints(size):
+    """Each of many SerialU32s saved on its own"""
+    count = (100, 10000, 200000)[size]
+    values = [random.randrange(1 << 32) for _ in range(count)]
+    objects = [SerialU32(value) for value in values]
+
+    def encode():
+        return b''.join([obj.to_bytes() for obj in objects])
+
+    def decode(data):
+        index, end_index = 0, len(data)
+        loaded = []
+        while index < end_index:
+            obj, index = SerialU32.from_bytes(data, index)
+            loaded.append(obj)
+        return loaded
+
+    def encode_struct():
+        return b''.join([_U32.pack(value) for value in values])
+
+    def decode_struct(data):
+        return [value for value, in _U32.iter_unpack(data)]
+
+    return count, [Implementation('pyserialization', encode, decode),
+                   Implementation('struct', encode_struct, decode_struct),
+                   _pickle(values)]
+
+
+def _strings(size):
+    """A single SerialString of a few bytes up to a few megabytes"""
+    length = (16, 4096, 4 << 20)[size]
+    value = ''.join(random.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(min(length, 4096)))
+    value = (value * (length // len(value) + 1))[:length]
+
+    def encode_struct():
+        data = value.encode('utf-8')
+        return _U32.pack(len(data)) + data
+
+    def decode_struct(data):
+        length, = _U32.unpack_from(data)
+        return str(data[4:4 + length], 'utf-8')
+
+    return 1, [_serializable('pyserialization', SerialString(value)),
+               Implementation('struct', encode_struct, decode_struct),
+               _pickle(value)]
+
+
+def _lists(size):
+    """A SerialList of U32s, both as objects and compact"""
+    count = (100, 10000, 1000000)[size]
+    values = [random.randrange(1 << 32) for _ in range(count)]
+
+    def encode_struct():
+        return struct.pack('=I{}I'.format(count), count, *values)
+
+    def decode_struct(data):
+        length, = _U32.unpack_from(data)
+        return list(struct.unpack_from('={}I'.format(length), data, 4))
+
+    return count, [_serializable('pyserialization', IntList(values)),
+                   _serializable('pyserialization compact', CompactIntList(values)),
+                   Implementation('struct', encode_struct, decode_struct),
+                   _pickle(values)]
+
+
+def _record_values(count):
+    """Returns the values of count records as tuples"""
+    return [(number, random.random(), random.random(), number % 256, 'record {}'.format(number))
+            for number in range(count)]
+
+
+def _record(values):
+    """Returns a Record with the values of a tuple"""
+    record = Record()
+    record.id, record.x, record.y, record.flags, record.name = values
+    return record
+
+
+def _encode_record(values):
+    """Saves the values of a record tuple with struct"""
+    name = values[4].encode('utf-8')
+    return _RECORD.pack(*values[:4]) + _U32.pack(len(name)) + name
+
+
+def _decode_record(data, index):
+    """Loads a record tuple saved by _encode_record and returns it and the index past it"""
+    number, x, y, flags = _RECORD.unpack_from(data, index)
+    index += _RECORD.size
+    length, = _U32.unpack_from(data, index)
+    index += 4
+    return (number, x, y, flags, str(data[index:index + length], 'utf-8')), index + length
+
+
+def _composites(size):
+    """A list of Composites of ints, doubles and a string"""
+    count = (10, 1000, 100000)[size]
+    values = _record_values(count)
+
+    def encode_struct():
+        return _U32.pack(count) + b''.join([_encode_record(record) for record in values])
+
+    def decode_struct(data):
+        length, = _U32.unpack_from(data)
+        index, loaded = 4, []
+        for _ in range(length):
+            record, index = _decode_record(data, index)
+            loaded.append(record)
+        return loaded
+
+    return count, [_serializable('pyserialization', RecordList([_record(record) for record in values])),
+                   Implementation('struct', encode_struct, decode_struct),
+                   _pickle(values)]
+
+
+def _unions(size):
+    """A list of Unions of records, ints and strings"""
+    count = (10, 1000, 100000)[size]
+    values = []
+    for number, record in enumerate(_record_values(count)):
+        values.append((number % 3, (record, number, record[4])[number % 3]))
+    messages = MessageList()
+    for tag, value in values:
+        messages.append(Message(Record, _record(value)) if tag == 0 else
+                        Message(SerialU32, value) if tag == 1 else Message(SerialString, value))
+
+    def encode_struct():
+        parts = [_U32.pack(count)]
+        for tag, value in values:
+            if tag == 0:
+                parts.append(b'\x00' + _encode_record(value))
+            elif tag == 1:
+                parts.append(b'\x01' + _U32.pack(value))
+            else:
+                data = value.encode('utf-8')
+                parts.append(b'\x02' + _U32.pack(len(data)) + data)
+        return b''.join(parts)
+
+    def decode_struct(data):
+        length, = _U32.unpack_from(data)
+        index, loaded = 4, []
+        for _ in range(length):
+            tag = data[index]
+            index += 1
+            if tag == 0:
+                value, index = _decode_record(data, index)
+            elif tag == 1:
+                value, = _U32.unpack_from(data, index)
+                index += 4
+            else:
+                text_length, = _U32.unpack_from(data, index)
+                value = str(data[index + 4:index + 4 + text_length], 'utf-8')
+                index += 4 + text_length
+            loaded.append((tag, value))
+        return loaded
+
+    return count, [_serializable('pyserialization', messages),
+                   Implementation('struct', encode_struct, decode_struct),
+                   _pickle(values)]
+
+
+def _ndarrays(size):
+    """A single float64 SerialNdArray"""
+    from pyserialization.serialndarray import SerialNdArray, SerialAlignedNdArray
+    shape = ((16, 8), (256, 512), (2048, 1024))[size]
+    array = np.random.default_rng(0).random(shape)
+
+    def encode_struct():
+        return struct.pack('=2I', *array.shape) + array.tobytes()
+
+    def decode_struct(data):
+        shape = struct.unpack_from('=2I', data)
+        return np.frombuffer(data, np.float64, shape[0] * shape[1], 8).reshape(shape)
+
+    return 1, [_serializable('pyserialization', SerialNdArray(array)),
+               _serializable('pyserialization aligned', SerialAlignedNdArray(array)),
+               Implementation('struct', encode_struct, decode_struct),
+               _pickle(array)]
+
+
+def _images(size):
+    """A single RGB SerialImage, saved as PNG and as raw pixels"""
+    from pyserialization.serialimage import SerialImage, SerialRawImage
+    side = (16, 256, 1024)[size]
+    pixels = np.random.default_rng(0).integers(0, 256, (side, side, 3), np.uint8) if np is not None else \
+        bytes(random.randrange(256) for _ in range(side * side * 3))
+    image = Image.fromarray(pixels) if np is not None else Image.frombytes('RGB', (side, side), pixels)
+
+    def encode_struct():
+        return struct.pack('=2I', *image.size) + image.tobytes()
+
+    def decode_struct(data):
+        return Image.frombytes('RGB', struct.unpack_from('=2I', data), bytes(data[8:]))
+
+    return 1, [_serializable('pyserialization', SerialImage(image)),
+               _serializable('pyserialization raw', SerialRawImage(image)),
+               Implementation('struct', encode_struct, decode_struct),
+               _pickle(image)]
+
+
+CASES = collections.OrderedDict([
+    ('int', (_ints, None)),
+    ('string', (_strings, None)),
+    ('list', (_lists, None)),
+    ('composite', (_composites, None)),
+    ('union', (_unions, None)),
+    ('ndarray', (_ndarrays, 'numpy' if np is None else None)),
+    ('image', (_images, 'PIL' if Image is None else None)),
+])
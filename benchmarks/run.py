@@ -0,0 +1,180 @@
+"""
+Measures how fast every benchmark case is encoded and decoded and how much memory it takes, and saves the results as
+JSON that can be compared between commits
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cases import CASES, SIZES
+
+
+def _best_time(function, repeat, min_time):
+    """
+    Returns the shortest time of one call to function out of repeat timed batches
+
+    Each batch makes enough calls to take at least min_time seconds.
+
+    Args:
+        function: The function to time
+        repeat:   The number of batches
+        min_time: The shortest time of a batch in seconds
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    times = [elapsed] + timer.repeat(repeat - 1, number) if repeat > 1 else [elapsed]
+    return min(times) / number
+
+
+def _peak_memory(function):
+    """Returns the largest number of bytes allocated at once while calling function"""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _commit():
+    """Returns the hash of the checked out commit, or None if it is not known"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(case_names, size_names, repeat=5, min_time=0.2, log=sys.stderr):
+    """
+    Runs the benchmark cases and returns a list of results, one per operation of each implementation
+
+    Args:
+        case_names: The names of the cases to run
+        size_names: The names of the payload sizes to run each case at
+        repeat:     The number of timed batches, of which the fastest is kept
+        min_time:   The shortest time of a batch in seconds
+        log:        A text stream that progress is written to, or None
+    """
+    results = []
+    for case_name in case_names:
+        build, missing = CASES[case_name]
+        if missing is not None:
+            if log is not None:
+                log.write('{}: skipped, {} is not installed\n'.format(case_name, missing))
+            continue
+        for size_name in size_names:
+            random.seed(0)
+            count, implementations = build(SIZES[size_name])
+            for implementation in implementations:
+                data = implementation.encode()
+                operations = (('encode', implementation.encode), ('decode', lambda: implementation.decode(data)))
+                for operation, function in operations:
+                    seconds = _best_time(function, repeat, min_time)
+                    result = {
+                        'case': case_name,
+                        'size': size_name,
+                        'implementation': implementation.name,
+                        'operation': operation,
+                        'objects': count,
+                        'bytes': len(data),
+                        'seconds': seconds,
+                        'mb_per_s': len(data) / seconds / 1e6,
+                        'objects_per_s': count / seconds,
+                        'peak_memory': _peak_memory(function),
+                    }
+                    results.append(result)
+                    if log is not None:
+                        log.write('{case} {size} {implementation} {operation}: {mb_per_s:.1f} MB/s, '
+                                  '{objects_per_s:.0f} objects/s, {peak_memory} bytes peak\n'.format(**result))
+    return results
+
+
+def _key(result):
+    """Returns what identifies a result between runs"""
+    return result['case'], result['size'], result['implementation'], result['operation']
+
+
+def compare(before, after, threshold=0.1):
+    """
+    Returns a line describing every result of after that is more than threshold slower or bigger than in before
+
+    Args:
+        before:    The results of the earlier run
+        after:     The results of the later run
+        threshold: The fraction of time or peak memory that a result may grow by
+    """
+    earlier = {_key(result): result for result in before}
+    regressions = []
+    for result in after:
+        previous = earlier.get(_key(result))
+        if previous is None:
+            continue
+        for field in ('seconds', 'peak_memory'):
+            if previous[field] and result[field] > previous[field] * (1 + threshold):
+                regressions.append('{} {} {} {}: {} {:.0%} higher ({} -> {})'.format(
+                    *_key(result), field, result[field] / previous[field] - 1, previous[field], result[field]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the Serializable types against pickle and struct')
+    parser.add_argument('--cases', default=','.join(CASES), help='comma separated cases to run')
+    parser.add_argument('--sizes', default=','.join(SIZES), help='comma separated payload sizes to run')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed batches, of which the best is kept')
+    parser.add_argument('--min-time', type=float, default=0.2, help='shortest time of a batch in seconds')
+    parser.add_argument('--output', help='file to save the JSON results to, instead of printing them')
+    parser.add_argument('--compare', help='JSON results of an earlier run to check for regressions against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='fraction a result may get slower or bigger by')
+    args = parser.parse_args(argv)
+
+    case_names = args.cases.split(',')
+    size_names = args.sizes.split(',')
+    for names, known in ((case_names, CASES), (size_names, SIZES)):
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            parser.error('unknown value {}, expected one of {}'.format(', '.join(unknown), ', '.join(known)))
+
+    report = {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': run(case_names, size_names, args.repeat, args.min_time),
+    }
+    text = json.dumps(report, indent=2, sort_keys=True) + '\n'
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(text)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file)['results'], report['results'], args.threshold)
+        for line in regressions:
+            sys.stderr.write('regression: {}\n'.format(line))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,7 +9,7 @@ setup(
     name='PySerialization',
     packages=['pyserialization'],
     package_dir={'': 'src'},
-    python_requires=">=3.4",
+    python_requires=">=3.7",
     extras_require={'saveablendarray': ['numpy'],
                     'saveableimage': ['PIL']},
     version='1.2',
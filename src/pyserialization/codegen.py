@@ -0,0 +1,657 @@
+from pyserialization.composite import Composite, CompositeMeta
+from pyserialization.serializable import _byte_order, _struct_type
+from pyserialization.union import Union, UnionMeta
+
+import builtins
+import inspect
+import linecache
+import re
+import struct
+
+
+_METHODS = ('load_in_place', 'skip', 'serialized_size', 'write_into')
+_UNBOUND = object()
+
+
+class _Fixed:
+    """A fixed-width scalar value, loaded into or saved from the _value of an object"""
+    def __init__(self, target, struct_type, value=None, order='=', default=None):
+        """
+        Args:
+            target:      The expression of the object holding the value
+            struct_type: The class that declares the struct label of the value
+            value:       An expression saved instead of the object's _value, such as a constant union tag
+            order:       The struct byte order character the value's type is created with
+            default:     The struct the value's type is created with, which the object's _struct is checked against
+                         before the value is packed with others, or None if the object is known to use it
+        """
+        self.target = target
+        self.struct_type = struct_type
+        self.order = order
+        self.default = default
+        self.value = '{}._value'.format(target) if value is None else value
+
+
+class _Call:
+    """An object loaded and saved through its own Serializable methods"""
+    def __init__(self, target, Type):
+        """
+        Args:
+            target: The expression of the object
+            Type:   The Serializable type of the object
+        """
+        self.target = target
+        self.Type = Type
+
+
+class _Source:
+    """Collects the lines of the generated source and the objects it refers to by name"""
+    def __init__(self):
+        self.lines = []
+        self.namespace = {'_new': object.__new__}
+        self._count = 0
+
+    def name(self, prefix, obj=_UNBOUND):
+        """
+        Returns a new unique name, bound to obj in the namespace of the generated source if one is given
+
+        Args:
+            prefix: The start of the name
+            obj:    The object the name refers to
+        """
+        self._count += 1
+        name = '_{}{}'.format(prefix, self._count)
+        if obj is not _UNBOUND:
+            self.namespace[name] = obj
+        return name
+
+    def add(self, indent, line, *args):
+        """
+        Adds a line of source
+
+        Args:
+            indent: The number of levels the line is indented
+            line:   The line, formatted with args
+        """
+        self.lines.append('    ' * indent + line.format(*args))
+
+    def text(self):
+        """Returns the source, leaving out the lines binding the __dict__ of a composite whose values are all unused"""
+        lines = []
+        for line in self.lines:
+            match = re.match(r'\s*(_d\d+) = ', line)
+            if match is None or any(re.search(r'\b{}\b'.format(match.group(1)), other) for other in self.lines
+                                    if other is not line):
+                lines.append(line)
+        return '\n'.join(lines) + '\n'
+
+
+def _is_list(Type):
+    """Returns True if Type is a list type returned by serial_list without compact"""
+    return isinstance(Type, type) and issubclass(Type, list) and hasattr(Type, '__listtype__')
+
+
+def _generic(Type, base):
+    """
+    Returns True if Type still loads and saves itself with the methods of base or with compiled ones
+
+    Args:
+        Type: A subclass of base
+        base: Composite, Union or a SerialList type
+    """
+    compiled = Type.__dict__.get('__compiled__', {})
+    for name in _METHODS:
+        method = inspect.getattr_static(Type, name)
+        if method is not inspect.getattr_static(base, name) and method is not compiled.get(name, (None,))[0]:
+            return False
+    return True
+
+
+def _inlined(Type):
+    """Returns True if the attributes of a Composite type can be loaded and saved directly by the code containing it"""
+    return isinstance(Type, CompositeMeta) and not Type.__lazy__ and _generic(Type, Composite)
+
+
+def _checked(target, struct_type, Type):
+    """
+    Returns the _Fixed value of an existing object of a fixed-width scalar type, which may have its own byte order
+
+    Args:
+        target:      The expression of the object
+        struct_type: The class that declares the struct label of Type
+        Type:        The Serializable type of the object
+    """
+    return _Fixed(target, struct_type, order=_byte_order(Type), default=Type()._struct)
+
+
+def _flatten(Type, _dict, source, indent):
+    """
+    Adds the lines binding the __dict__ of each nested composite and returns every value of a Composite type in order
+
+    Nested composites that can be inlined are flattened into their own values, so adjacent fixed-width values of
+    different composites are loaded and saved together.
+
+    Args:
+        Type:   A Composite type that can be inlined
+        _dict:  The expression of the __dict__ of the composite
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    values = []
+    for key in Type.__ordered__:
+        MemberType = Type.__typemap__[key]
+        target = '{}[{!r}]'.format(_dict, key)
+        struct_type = _struct_type(MemberType)
+        if struct_type is not None:
+            values.append(_checked(target, struct_type, MemberType))
+        elif _inlined(MemberType):
+            member_dict = source.name('d')
+            source.add(indent, '{} = {}.__dict__', member_dict, target)
+            values.extend(_flatten(MemberType, member_dict, source, indent))
+        else:
+            values.append(_Call(target, MemberType))
+    return values
+
+
+def _values(Type, target, source, indent):
+    """
+    Returns every value of an object of Type, adding the lines binding the __dict__ of a composite that is inlined
+
+    Args:
+        Type:   Any Serializable type
+        target: The expression of the object
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    struct_type = _struct_type(Type)
+    if struct_type is not None:
+        return [_checked(target, struct_type, Type)]
+    if _inlined(Type):
+        _dict = source.name('d')
+        source.add(indent, '{} = {}.__dict__', _dict, target)
+        return _flatten(Type, _dict, source, indent)
+    return [_Call(target, Type)]
+
+
+def _slots(obj):
+    """Returns the names of every slot of an object, or None if it also has a __dict__"""
+    if hasattr(obj, '__dict__'):
+        return None
+    return [slot for cls in type(obj).__mro__ for slot in cls.__dict__.get('__slots__', ())]
+
+
+def _add_new(Type, target, source, indent):
+    """
+    Adds the lines creating an object of Type to be loaded into the variable target and returns its values
+
+    Ints, floating points and chars are given the slot values of an object made by their __init__, apart from the
+    value that is loaded, and composites that can be inlined are given a new object for each attribute, so neither
+    calls __init__. Any other type is called.
+
+    Args:
+        Type:   Any Serializable type
+        target: The name of the variable
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    struct_type = _struct_type(Type)
+    if struct_type is not None and Type.__init__ is struct_type.__init__:
+        default = Type()
+        slots = _slots(default)
+        if slots is not None:
+            source.add(indent, '{} = _new({})', target, source.name('T', Type))
+            for slot in slots:
+                if slot != '_value':
+                    source.add(indent, '{}.{} = {}', target, slot, source.name('c', getattr(default, slot)))
+            return [_Fixed(target, struct_type, order=_byte_order(Type))]
+    if _inlined(Type) and Type.__init__ is Composite.__init__:
+        _dict = source.name('d')
+        source.add(indent, '{} = _new({})', target, source.name('T', Type))
+        source.add(indent, '{} = {}.__dict__', _dict, target)
+        values = []
+        for key in Type.__ordered__:
+            member = source.name('o')
+            values.extend(_add_new(Type.__typemap__[key], member, source, indent))
+            source.add(indent, '{}[{!r}] = {}', _dict, key, member)
+        return values
+    source.add(indent, '{} = {}()', target, source.name('T', Type))
+    return _values(Type, target, source, indent)
+
+
+def _runs(values):
+    """
+    Groups adjacent _Fixed values with the same byte order into lists, leaving every _Call on its own
+
+    Args:
+        values: The _Fixed and _Call values in order
+    """
+    runs = []
+    for value in values:
+        if isinstance(value, _Fixed) and runs and isinstance(runs[-1], list) and runs[-1][0].order == value.order:
+            runs[-1].append(value)
+        else:
+            runs.append([value] if isinstance(value, _Fixed) else value)
+    return runs
+
+
+def _struct(run, source):
+    """
+    Returns the name of the struct packing a run of _Fixed values and its size
+
+    Every value is in the byte order its type is created with and standard sizes, the same format each type uses on its
+    own.
+
+    Args:
+        run:    The list of _Fixed values
+        source: The _Source to add the struct to
+    """
+    packer = struct.Struct(run[0].order + ''.join(value.struct_type._struct_label for value in run))
+    return source.name('s', packer), packer.size
+
+
+def _add_load(values, source, indent):
+    """
+    Adds the lines loading values from data at index and leaving index past them
+
+    Args:
+        values: The _Fixed and _Call values in order
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    for run in _runs(values):
+        if isinstance(run, _Call):
+            source.add(indent, 'index = {}.load_in_place(data, index)', run.target)
+        elif _add_check(run, source, indent):
+            _add_load_run(run, source, indent + 1)
+            source.add(indent, 'else:')
+            for value in run:
+                if value.default is not None:
+                    source.add(indent + 1, 'index = {}.load_in_place(data, index)', value.target)
+                else:
+                    _add_load_run([value], source, indent + 1)
+        else:
+            _add_load_run(run, source, indent)
+
+
+def _add_check(run, source, indent):
+    """
+    Adds the line checking that every object of a run of _Fixed values uses the struct its type is created with and
+    returns True, or returns False if there is nothing to check
+
+    Objects whose byte order was changed with set_endianness fail the check and are loaded and saved on their own.
+
+    Args:
+        run:    The list of _Fixed values
+        source: The _Source to add to
+        indent: The indentation of the line
+    """
+    checks = ['{}._struct is {}'.format(value.target, source.name('k', value.default))
+              for value in run if value.default is not None]
+    if checks:
+        source.add(indent, 'if {}:', ' and '.join(checks))
+    return bool(checks)
+
+
+def _add_load_run(run, source, indent):
+    """
+    Adds the lines loading a run of _Fixed values with one struct call and leaving index past them
+
+    Args:
+        run:    The list of _Fixed values
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    packer, size = _struct(run, source)
+    unpackers = [getattr(value.struct_type, '_unpack_value', None) for value in run]
+    if not any(unpackers):
+        source.add(indent, '{}, = {}.unpack_from(data, index)',
+                   ', '.join('{}._value'.format(value.target) for value in run), packer)
+    else:
+        loaded = source.name('v')
+        source.add(indent, '{} = {}.unpack_from(data, index)', loaded, packer)
+        for position, (value, unpack) in enumerate(zip(run, unpackers)):
+            if unpack is None:
+                source.add(indent, '{}._value = {}[{}]', value.target, loaded, position)
+            else:
+                source.add(indent, '{}._value = {}({}[{}])', value.target, source.name('u', unpack), loaded,
+                           position)
+    source.add(indent, 'index += {}', size)
+
+
+def _add_skip(values, source, indent):
+    """
+    Adds the lines moving index past values in data
+
+    Args:
+        values: The _Fixed and _Call values in order
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    size = 0
+    for value in values:
+        if isinstance(value, _Fixed):
+            size += value.struct_type.__fixed_size__
+        elif value.Type.__fixed_size__ is not None:
+            size += value.Type.__fixed_size__
+        else:
+            if size:
+                source.add(indent, 'index += {}', size)
+                size = 0
+            source.add(indent, 'index = {}.skip(data, index)', source.name('T', value.Type))
+    if size:
+        source.add(indent, 'index += {}', size)
+
+
+def _add_size(values, total, source, indent):
+    """
+    Adds the lines adding the size of values to the variable total
+
+    Args:
+        values: The _Fixed and _Call values in order
+        total:  The name of the variable
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    size = 0
+    calls = []
+    for value in values:
+        if isinstance(value, _Fixed):
+            size += value.struct_type.__fixed_size__
+        elif value.Type.__fixed_size__ is not None:
+            size += value.Type.__fixed_size__
+        else:
+            calls.append('{}.serialized_size()'.format(value.target))
+    if size or calls:
+        source.add(indent, '{} += {}', total, ' + '.join(([str(size)] if size else []) + calls))
+
+
+def _add_write(values, source, indent):
+    """
+    Adds the lines writing values into buffer at offset and leaving offset past them
+
+    Args:
+        values: The _Fixed and _Call values in order
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    for run in _runs(values):
+        if isinstance(run, _Call):
+            source.add(indent, 'offset = {}.write_into(buffer, offset)', run.target)
+        elif _add_check(run, source, indent):
+            _add_write_run(run, source, indent + 1)
+            source.add(indent, 'else:')
+            for value in run:
+                if value.default is not None:
+                    source.add(indent + 1, 'offset = {}.write_into(buffer, offset)', value.target)
+                else:
+                    _add_write_run([value], source, indent + 1)
+        else:
+            _add_write_run(run, source, indent)
+
+
+def _add_write_run(run, source, indent):
+    """
+    Adds the lines writing a run of _Fixed values with one struct call and leaving offset past them
+
+    Args:
+        run:    The list of _Fixed values
+        source: The _Source to add to
+        indent: The indentation of the lines
+    """
+    packer, size = _struct(run, source)
+    arguments = []
+    for value in run:
+        pack = getattr(value.struct_type, '_pack_value', None)
+        arguments.append(value.value if pack is None else '{}({})'.format(source.name('p', pack), value.value))
+    source.add(indent, '{}.pack_into(buffer, offset, {})', packer, ', '.join(arguments))
+    source.add(indent, 'offset += {}', size)
+
+
+def _add_load_length(length_type, source, indent):
+    """Adds the lines loading the number of objects of a list into size and leaving index past it"""
+    struct_type = _struct_type(length_type)
+    if struct_type is None:
+        source.add(indent, 'size, index = {}.from_bytes(data, index)', source.name('L', length_type))
+        source.add(indent, 'size = size.get()')
+        return
+    packer, size = _struct([_Fixed(None, struct_type, order=_byte_order(length_type))], source)
+    source.add(indent, 'size, = {}.unpack_from(data, index)', packer)
+    source.add(indent, 'index += {}', size)
+
+
+def _generate_composite(Type, source):
+    """
+    Adds the methods of a Composite type to source and returns their names
+
+    Args:
+        Type:   A Composite type that can be inlined
+        source: The _Source to add to
+    """
+    source.add(0, 'def load_in_place(self, data, index=0):')
+    _add_load(_values(Type, 'self', source, 1), source, 1)
+    source.add(1, 'return index')
+
+    values = _values(Type, 'self', _Source(), 1)
+    source.add(0, 'def skip(cls, data, index=0):')
+    _add_skip(values, source, 1)
+    source.add(1, 'return index')
+
+    source.add(0, 'def serialized_size(self):')
+    if Type.__fixed_size__ is not None:
+        source.add(1, 'return {}', Type.__fixed_size__)
+    else:
+        source.add(1, 'total = 0')
+        _add_size(_values(Type, 'self', source, 1), 'total', source, 1)
+        source.add(1, 'return total')
+
+    source.add(0, 'def write_into(self, buffer, offset=0):')
+    _add_write(_values(Type, 'self', source, 1), source, 1)
+    source.add(1, 'return offset')
+    return _METHODS
+
+
+def _generate_list(Type, source):
+    """
+    Adds the methods of a SerialList type to source and returns their names
+
+    Args:
+        Type:   A list type returned by serial_list
+        source: The _Source to add to
+    """
+    list_type, length_type = Type.__listtype__, Type.__lengthtype__
+    length_struct = _struct_type(length_type)
+
+    source.add(0, 'def load_in_place(self, data, index=0):')
+    _add_load_length(length_type, source, 1)
+    if Type.__reuse__:
+        source.add(1, 'if size < len(self):')
+        source.add(2, 'del self[size:]')
+        source.add(1, 'for position, item in enumerate(self):')
+        source.add(2, 'if type(item) is {}:', source.name('T', list_type))
+        _add_load(_values(list_type, 'item', source, 3), source, 3)
+        source.add(2, 'else:')
+        _add_load(_add_new(list_type, 'item', source, 3), source, 3)
+        source.add(3, 'list.__setitem__(self, position, item)')
+        source.add(1, 'size -= len(self)')
+    source.add(1, 'items = []')
+    source.add(1, 'append = items.append')
+    source.add(1, 'for _ in range(size):')
+    _add_load(_add_new(list_type, 'item', source, 2), source, 2)
+    source.add(2, 'append(item)')
+    if not Type.__reuse__:
+        source.add(1, 'list.clear(self)')
+    source.add(1, 'list.extend(self, items)')
+    source.add(1, 'return index')
+
+    source.add(0, 'def skip(cls, data, index=0):')
+    _add_load_length(length_type, source, 1)
+    if list_type.__fixed_size__ is not None:
+        source.add(1, 'return index + size * {}', list_type.__fixed_size__)
+    else:
+        source.add(1, 'for _ in range(size):')
+        _add_skip(_values(list_type, 'item', _Source(), 2), source, 2)
+        source.add(1, 'return index')
+
+    source.add(0, 'def serialized_size(self):')
+    if length_struct is None:
+        source.add(1, 'total = {}(len(self)).serialized_size()', source.name('L', length_type))
+    else:
+        source.add(1, 'total = {}', length_struct.__fixed_size__)
+    if list_type.__fixed_size__ is not None:
+        source.add(1, 'total += len(self) * {}', list_type.__fixed_size__)
+    else:
+        source.add(1, 'for item in self:')
+        _add_size(_values(list_type, 'item', source, 2), 'total', source, 2)
+    source.add(1, 'return total')
+
+    source.add(0, 'def write_into(self, buffer, offset=0):')
+    if length_struct is None:
+        source.add(1, 'offset = {}(len(self)).write_into(buffer, offset)', source.name('L', length_type))
+    else:
+        packer, size = _struct([_Fixed(None, length_struct, order=_byte_order(length_type))], source)
+        source.add(1, '{}.pack_into(buffer, offset, len(self))', packer)
+        source.add(1, 'offset += {}', size)
+    source.add(1, 'for item in self:')
+    _add_write(_values(list_type, 'item', source, 2), source, 2)
+    source.add(1, 'return offset')
+    return _METHODS
+
+
+def _add_branches(Type, subject, source, add_branch, error):
+    """
+    Adds an if statement with a branch for each type of a Union, raising a ValueError if none match
+
+    Args:
+        Type:       A Union type with at least one type
+        subject:    A format string of the condition of a branch, given the index and the name of the type
+        source:     The _Source to add to
+        add_branch: A function adding the body of a branch, given the index and the type
+        error:      The line raising the ValueError
+    """
+    for position, key in enumerate(Type.__ordered__):
+        MemberType = Type.__typemap__[key]
+        source.add(1, '{} {}:', 'if' if position == 0 else 'elif',
+                   subject.format(position, source.name('T', MemberType)))
+        add_branch(position, MemberType)
+    source.add(1, 'else:')
+    source.lines.append('        ' + error)
+
+
+def _generate_union(Type, source):
+    """
+    Adds the methods of a Union type to source and returns their names
+
+    Args:
+        Type:   A Union type
+        source: The _Source to add to
+    """
+    tag_struct = _struct_type(Type.__tagtype__)
+    tag_packer, tag_size = _struct([_Fixed(None, tag_struct, order=_byte_order(Type.__tagtype__))], source)
+
+    def add_load(position, MemberType):
+        _add_load(_add_new(MemberType, 'item', source, 2), source, 2)
+
+    source.add(0, 'def load_in_place(self, data, index=0):')
+    source.add(1, 'tag, = {}.unpack_from(data, index)', tag_packer)
+    source.add(1, 'index += {}', tag_size)
+    _add_branches(Type, 'tag == {0}', source, add_load,
+                  "raise ValueError('Union index {} is out of range'.format(tag))")
+    source.add(1, 'self._current = item')
+    source.add(1, 'return index')
+
+    def add_skip(position, MemberType):
+        _add_skip(_values(MemberType, 'item', _Source(), 2), source, 2)
+
+    source.add(0, 'def skip(cls, data, index=0):')
+    source.add(1, 'tag, = {}.unpack_from(data, index)', tag_packer)
+    source.add(1, 'index += {}', tag_size)
+    _add_branches(Type, 'tag == {0}', source, add_skip,
+                  "raise ValueError('Union index {} is out of range'.format(tag))")
+    source.add(1, 'return index')
+
+    def add_write(position, MemberType):
+        tag = _Fixed(None, tag_struct, str(position), _byte_order(Type.__tagtype__))
+        _add_write([tag] + _values(MemberType, 'item', source, 2), source, 2)
+
+    source.add(0, 'def write_into(self, buffer, offset=0):')
+    source.add(1, 'item = self._current')
+    source.add(1, 'if item is None:')
+    source.add(2, "raise ValueError('Union is null')")
+    source.add(1, 'item_type = type(item)')
+    _add_branches(Type, 'item_type is {1}', source, add_write,
+                  "raise ValueError('Invalid Type {}'.format(item_type))")
+    source.add(1, 'return offset')
+    return ('load_in_place', 'skip', 'write_into')
+
+
+def _base(Type):
+    """
+    Returns the class whose methods a Composite, Union or SerialList type is loaded and saved with when not compiled,
+    or None if the type cannot be compiled
+
+    Args:
+        Type: Any Serializable type
+    """
+    if isinstance(Type, CompositeMeta):
+        base = None if Type.__lazy__ else Composite
+    elif isinstance(Type, UnionMeta):
+        base = Union if Type.__ordered__ else None
+    elif _is_list(Type):
+        base = next(base for base in Type.__mro__ if '__listtype__' in base.__dict__)
+    else:
+        return None
+    return base if base is not None and _generic(Type, base) else None
+
+
+def compile(Type, dump=None):
+    """
+    Replaces how a Composite, Union or SerialList type is loaded and saved with generated Python code and returns it
+
+    load_in_place, skip, serialized_size and write_into are generated as straight-line code specialized to the schema
+    of the type. Adjacent ints, floating points and chars are loaded and saved with one struct call, including those
+    of nested composites, which are inlined, and every other attribute calls its own methods directly. The bytes
+    produced are the same. Every Composite, Union and SerialList type used by the type is compiled as well.
+
+    The code is generated once and kept on the type, with the source in __source__. Subclasses of a compiled type
+    go back to the methods the type had before it was compiled, since they may add attributes. Values whose byte order
+    was changed with set_endianness are loaded and saved on their own. Lazy composites and types that override how they
+    are loaded or saved cannot be compiled.
+
+    Args:
+        Type: The Composite, Union or SerialList type to compile
+        dump: A text stream, such as sys.stdout, that the generated source is written to
+    """
+    if '__compiled__' not in Type.__dict__:
+        base = _base(Type)
+        if base is None:
+            raise ValueError("'{}' cannot be compiled".format(Type))
+        members = [Type.__listtype__] if _is_list(Type) else Type.__typemap__.values()
+        for MemberType in members:
+            if _base(MemberType) is not None:
+                compile(MemberType)
+
+        source = _Source()
+        if base is Composite:
+            names = _generate_composite(Type, source)
+        elif base is Union:
+            names = _generate_union(Type, source)
+        else:
+            names = _generate_list(Type, source)
+        text = source.text()
+        filename = '<compiled {} at {:#x}>'.format(Type.__qualname__, id(Type))
+        code = builtins.compile(text, filename, 'exec')
+        linecache.cache[filename] = (len(text), None, text.splitlines(True), filename)
+        exec(code, source.namespace)
+
+        compiled = {}
+        for name in names:
+            method = source.namespace[name]
+            if name == 'skip':
+                method = classmethod(method)
+            compiled[name] = (method, inspect.getattr_static(Type, name))
+            type.__setattr__(Type, name, method)
+        type.__setattr__(Type, '__compiled__', compiled)
+        type.__setattr__(Type, '__source__', text)
+    if dump is not None:
+        dump.write(Type.__source__)
+    return Type
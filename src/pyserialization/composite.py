@@ -1,15 +1,286 @@
-from pyserialization.serializable import Serializable
+from pyserialization.serializable import Serializable, _byte_order, _read_exactly, _struct_type
 
 from abc import ABCMeta
 import collections
 import inspect
+import operator
+import struct
+
+
+_get_struct = operator.attrgetter('_struct')
+
+
+class _FixedRun:
+    """
+    A run of adjacent fixed-width attributes that are loaded and saved with one precompiled struct.
+
+    Every attribute in the run is stored in the struct module's standard size with the byte order its type is created
+    with, the same format each type uses on its own, so the bytes produced are identical to saving the attributes one
+    at a time. Attributes whose endianness was changed after they were created are loaded and saved one at a time.
+    """
+    def __init__(self, keys, types):
+        """
+        Args:
+            keys: The attribute names in the run, in declaration order
+            types: The Serializable types of the attributes, all created with the same byte order
+        """
+        struct_types = [_struct_type(Type) for Type in types]
+        self.keys = tuple(keys)
+        self.structs = tuple(Type()._struct for Type in types)
+        self.struct = struct.Struct(_byte_order(types[0]) + ''.join(Type._struct_label for Type in struct_types))
+        unpackers = tuple(getattr(Type, '_unpack_value', None) for Type in struct_types)
+        packers = tuple(getattr(Type, '_pack_value', None) for Type in struct_types)
+        self.unpackers = unpackers if any(unpackers) else None
+        self.packers = packers if any(packers) else None
+
+    def _members(self, _dict):
+        """Returns the attributes in the run, or None if any of them no longer uses the struct of its type"""
+        members = [_dict[key] for key in self.keys]
+        if tuple(map(_get_struct, members)) != self.structs:
+            return None
+        return members
+
+    def load(self, _dict, data, index):
+        """Unpacks the whole run directly from data and stores each value in its attribute"""
+        members = self._members(_dict)
+        if members is None:
+            for key in self.keys:
+                index = _dict[key].load_in_place(data, index)
+            return index
+        values = self.struct.unpack_from(data, index)
+        if self.unpackers is None:
+            for member, value in zip(members, values):
+                member._value = value
+        else:
+            for member, unpack, value in zip(members, self.unpackers, values):
+                member._value = value if unpack is None else unpack(value)
+        return index + self.struct.size
+
+    def defer(self, _dict, data, index, pending):
+        """Loads the whole run immediately, since that is cheaper than tracking where each value is"""
+        return self.load(_dict, data, index)
+
+    def skip(self, data, index):
+        """Returns the index past the run"""
+        return index + self.struct.size
+
+    def read(self, _dict, stream):
+        """Reads the whole run from stream and stores each value in its attribute"""
+        self.load(_dict, _read_exactly(stream, self.struct.size), 0)
+
+    async def read_async(self, _dict, reader):
+        """Reads the whole run from an asyncio.StreamReader and stores each value in its attribute"""
+        self.load(_dict, await reader.readexactly(self.struct.size), 0)
+
+    def size(self, _dict):
+        """Returns the size of the run"""
+        return self.struct.size
+
+    def write(self, _dict, buffer, offset):
+        """Packs the values of the whole run directly into buffer"""
+        members = self._members(_dict)
+        if members is None:
+            for key in self.keys:
+                offset = _dict[key].write_into(buffer, offset)
+            return offset
+        self.struct.pack_into(buffer, offset, *self._values(members))
+        return offset + self.struct.size
+
+    def stream(self, _dict, stream):
+        """Packs the values of the whole run and writes them to stream"""
+        members = self._members(_dict)
+        if members is None:
+            for key in self.keys:
+                _dict[key].write_to(stream)
+            return
+        stream.write(self.struct.pack(*self._values(members)))
+
+    def _values(self, members):
+        """Returns the value of each attribute in the run as it is packed"""
+        if self.packers is None:
+            return [member._value for member in members]
+        return [member._value if pack is None else pack(member._value) for member, pack in zip(members, self.packers)]
+
+
+class _Member:
+    """
+    An attribute that is loaded and saved through its own Serializable methods
+
+    When loaded lazily, the attribute is entered in the pending dict as (data, start, end) instead of being loaded. It
+    is loaded on first access and until then is saved by copying its original bytes.
+    """
+    def __init__(self, key, Type):
+        """
+        Args:
+            key: The attribute name
+            Type: The Serializable type of the attribute
+        """
+        self.key = key
+        self.Type = Type
+
+    def load(self, _dict, data, index):
+        """Calls load_in_place on the attribute"""
+        return _dict[self.key].load_in_place(data, index)
+
+    def defer(self, _dict, data, index, pending):
+        """Skips over the attribute and records where its data is"""
+        end_index = self.Type.skip(data, index)
+        pending[self.key] = (data, index, end_index)
+        return end_index
+
+    def skip(self, data, index):
+        """Returns the index past the attribute"""
+        return self.Type.skip(data, index)
+
+    def read(self, _dict, stream):
+        """Calls load_from on the attribute"""
+        _dict[self.key].load_from(stream)
+
+    async def read_async(self, _dict, reader):
+        """Calls load_async on the attribute"""
+        await _dict[self.key].load_async(reader)
+
+    def size(self, _dict):
+        """Returns the serialized size of the attribute"""
+        pending = _dict.get('_pending')
+        if pending and self.key in pending:
+            _, start, end_index = pending[self.key]
+            return end_index - start
+        return _dict[self.key].serialized_size()
+
+    def write(self, _dict, buffer, offset):
+        """Calls write_into on the attribute, or copies its original bytes if it has not been loaded yet"""
+        pending = _dict.get('_pending')
+        if pending and self.key in pending:
+            data, start, end_index = pending[self.key]
+            with memoryview(data) as view:
+                buffer[offset:offset + end_index - start] = view[start:end_index]
+            return offset + end_index - start
+        return _dict[self.key].write_into(buffer, offset)
+
+    def stream(self, _dict, stream):
+        """Calls write_to on the attribute, or writes its original bytes if it has not been loaded yet"""
+        pending = _dict.get('_pending')
+        if pending and self.key in pending:
+            data, start, end_index = pending[self.key]
+            stream.write(memoryview(data)[start:end_index])
+        else:
+            _dict[self.key].write_to(stream)
+
+
+class _Field:
+    """
+    Data descriptor installed on a Composite class for each Serializable attribute.
+
+    Getting the attribute returns the result of its 'get' method if it has one, otherwise the attribute itself. Setting
+    the attribute calls its 'set' method if it has one, otherwise setting is disallowed.
+    """
+    def __init__(self, key, Type):
+        """
+        Args:
+            key: The attribute name
+            Type: The Serializable type of the attribute
+        """
+        self.key = key
+        self.Type = Type
+        self.has_get = callable(getattr(Type, 'get', None))
+        self.has_set = callable(getattr(Type, 'set', None))
+
+    def __get__(self, instance, owner):
+        """Returns the attribute's value, or the attribute type when accessed on the class"""
+        if instance is None:
+            return self.Type
+        serializable = instance.__dict__[self.key]
+        return serializable.get() if self.has_get else serializable
+
+    def __set__(self, instance, value):
+        """Calls set on the attribute"""
+        if not self.has_set:
+            raise ValueError("Cannot assign directly to '{}' ({})".format(self.key, self.Type))
+        instance.__dict__[self.key].set(value)
+
+
+class _LazyField(_Field):
+    """A _Field of a lazy Composite, which loads the attribute on first access if it is still pending"""
+
+    def __get__(self, instance, owner):
+        """Loads the attribute if it is pending and returns its value"""
+        if instance is None:
+            return self.Type
+        _dict = instance.__dict__
+        serializable = _dict[self.key]
+        pending = _dict['_pending']
+        if self.key in pending:
+            data, index, _ = pending.pop(self.key)
+            serializable.load_in_place(data, index)
+        return serializable.get() if self.has_get else serializable
+
+    def __set__(self, instance, value):
+        """Calls set on the attribute, which no longer needs to be loaded"""
+        _Field.__set__(self, instance, value)
+        instance.__dict__['_pending'].pop(self.key, None)
+
+
+def _build_codec(ordered, typemap):
+    """
+    Returns the list of steps used to load and save a Composite.
+
+    Adjacent fixed-width scalar attributes (ints, floating points and chars) with the same byte order are merged into a
+    single _FixedRun, every other attribute becomes its own _Member step.
+
+    Args:
+        ordered: The attribute names in declaration order
+        typemap: The mapping of attribute names to their Serializable types
+    """
+    codec = []
+    keys, types = [], []
+    for key in ordered:
+        Type = typemap[key]
+        if _struct_type(Type) is not None:
+            if keys and _byte_order(Type) != _byte_order(types[0]):
+                codec.append(_FixedRun(keys, types))
+                keys, types = [], []
+            keys.append(key)
+            types.append(Type)
+            continue
+        if keys:
+            codec.append(_FixedRun(keys, types))
+            keys, types = [], []
+        codec.append(_Member(key, Type))
+    if keys:
+        codec.append(_FixedRun(keys, types))
+    return codec
+
+
+def _numpy_format(key, Type):
+    """
+    Returns the numpy.dtype format of an int, floating point, char or fixed-size Composite attribute
+
+    Every attribute is stored in the byte order its type is created with, the same order used by each type on its own,
+    so the format uses it too.
+
+    Args:
+        key: The attribute name, used in the error message
+        Type: The Serializable type of the attribute
+    """
+    if isinstance(Type, CompositeMeta):
+        return Type.numpy_dtype()
+    struct_type = _struct_type(Type)
+    if struct_type is not None:
+        if struct_type._struct_label == 'c':
+            return 'S1'
+        if getattr(struct_type, '_unpack_value', None) is None:
+            return _byte_order(Type) + struct_type._struct_label
+    raise ValueError("Attribute '{}' ({}) cannot be stored in a numpy.dtype".format(key, Type))
 
 
 class CompositeMeta(ABCMeta):
     """
     Meta class that keeps track of an ordered list of class attributes to later be used by the Composite class.
 
-    Adds all class attributes of type Serializable type to member __ordered__ of the class __dict__
+    Adds all class attributes of type Serializable type to member __ordered__ of the class __dict__ and precompiles
+    the steps used to load and save them into member __codec__. If every attribute has a fixed size, __fixed_size__ is
+    set to their total size. Each attribute is then replaced by a descriptor that gets and sets the instance's value.
     """
     @classmethod
     def __prepare__(mcs, name, bases):
@@ -19,13 +290,20 @@ class CompositeMeta(ABCMeta):
         for base in bases:
             if hasattr(base, '__ordered__'):
                 for key in base.__ordered__:
-                    classdict[key] = base.__dict__[key]
+                    classdict[key] = base.__typemap__[key]
         classdict['__ordered__'] = [key for key in classdict.keys() if
                                     inspect.isclass(classdict[key]) and
                                     issubclass(classdict[key], Serializable)]
         classdict['__typemap__'] = {key: classdict[key] for key in classdict['__ordered__']}
+        classdict['__codec__'] = _build_codec(classdict['__ordered__'], classdict['__typemap__'])
+        sizes = [classdict['__typemap__'][key].__fixed_size__ for key in classdict['__ordered__']]
+        classdict['__fixed_size__'] = sum(sizes) if None not in sizes else None
 
-        return type.__new__(mcs, name, bases, dict(classdict))
+        cls = ABCMeta.__new__(mcs, name, bases, dict(classdict))
+        Field = _LazyField if cls.__lazy__ else _Field
+        for key, Type in cls.__typemap__.items():
+            type.__setattr__(cls, key, Field(key, Type))
+        return cls
 
 
 class Composite(Serializable, metaclass=CompositeMeta):
@@ -39,7 +317,8 @@ class Composite(Serializable, metaclass=CompositeMeta):
     then setting that attribute will call its set method; otherwise setting is disallowed.
 
     The bytearray representation of a Composite is each bytearray representation of the composite in the order they were
-    declared, one after another
+    declared, one after another. Adjacent int, floating point and char attributes are loaded and saved together with a
+    single struct call, which produces exactly the same bytes as saving them one at a time.
 
     Ex.
     class Composite1(Composite):
@@ -48,7 +327,19 @@ class Composite(Serializable, metaclass=CompositeMeta):
 
         Every Composite1 that is created will have val1 and val2 attributes of the specified types. Running val1 = 5
         will call val1.set(5) but val2 does not have a set methohd so val2 = [4] will raise an Exception.
+
+    If a subclass sets the class attribute __lazy__ to True, load_in_place only loads the int, floating point and char
+    attributes and records where every other attribute is. Each of those is loaded the first time it is accessed, and
+    is saved by copying its original bytes until then. The data must not be modified while attributes are pending.
+
+    Attribute access goes through a descriptor installed on the class for each attribute, so accessing anything else
+    on a Composite costs the same as on any other object.
+
+    Composites made only of ints, floating points, chars and other such composites can also be converted to and from
+    numpy structured arrays with numpy_dtype, array_from_bytes and to_bytes_from_array, which load or save any number
+    of records with a single copy. numpy is only imported when these are used.
     """
+    __lazy__ = False
 
     def __init__(self):
         """
@@ -57,9 +348,12 @@ class Composite(Serializable, metaclass=CompositeMeta):
         Serializable.__init__(self)
         for key, Type in self.__typemap__.items():
             self.__dict__[key] = Type()
+        if self.__lazy__:
+            self.__dict__['_pending'] = {}
 
     def __str__(self):
         """Represents a Composite as {attr1: str(attr1), attr2: str(attr2), ...}"""
+        self._load_pending()
         string = '{'
         for key in self.__ordered__:
             string += '{}: {}, '.format(key, self.__dict__[key])
@@ -67,34 +361,6 @@ class Composite(Serializable, metaclass=CompositeMeta):
         string += '}'
         return string
 
-    def __setattr__(self, key, value):
-        """
-        Catches all attribute settings to Serializable types
-
-        Only allows the setting if the attribute being set has a 'set' method. If it does
-        it calls attribute.set(value). Otherwise setting is disallowed on the attribute.
-        """
-        if key in self.__ordered__:
-            serializable = self.__dict__[key]
-            if not callable(getattr(serializable, 'set', None)):
-                raise ValueError("Cannot assign directly to '{}' ({})".format(key, type(serializable)))
-            serializable.set(value)
-        else:
-            Serializable.__setattr__(self, key, value)
-
-    def __getattribute__(self, item):
-        """
-        Catches all attribute getting to Serializable types.
-
-        If the attribute defines a 'get' method it returns that instead, otherwise it just returns the attribute.
-        """
-        get_attribute = lambda item: Serializable.__getattribute__(self, item)
-        _dict = get_attribute('__dict__')
-        if item not in type(self).__ordered__:
-            return get_attribute(item)
-        serializable = _dict[item]
-        return serializable.get() if callable(getattr(serializable, 'get', None)) else serializable
-
     def set(self, other):
         """
         Sets each Serializable attribute of Composite with the attributes of another of the same Composite.
@@ -104,18 +370,131 @@ class Composite(Serializable, metaclass=CompositeMeta):
         """
         if type(other) != type(self):
             raise ValueError("Types do not match: '{}' != '{}'".format(type(other), type(self)))
-        for serializable in other.__ordered__:
-            self.__setattr__(serializable, other.__getattribute__(serializable))
+        for key in other.__ordered__:
+            setattr(self, key, getattr(other, key))
+
+    def __getstate__(self):
+        """Returns the attributes to pickle, loading every pending attribute first since data cannot be pickled"""
+        self._load_pending()
+        return self.__dict__
+
+    def _load_pending(self):
+        """Loads every attribute that is still pending from a lazy load"""
+        for key in list(self.__dict__.get('_pending', ())):
+            getattr(self, key)
 
     def load_in_place(self, data, index=0):
-        """Recursively calls load_in_place on each Serializable attribute."""
-        for key in self.__ordered__:
-            index = self.__dict__[key].load_in_place(data, index)
+        """
+        Loads each run of fixed-width attributes with one struct call and recursively loads every other attribute
+
+        If the class is lazy, the other attributes are skipped over and loaded when they are first accessed.
+        """
+        _dict = self.__dict__
+        if self.__lazy__:
+            pending = _dict['_pending'] = {}
+            for step in self.__codec__:
+                index = step.defer(_dict, data, index, pending)
+            return index
+        for step in self.__codec__:
+            index = step.load(_dict, data, index)
+        return index
+
+    @classmethod
+    def skip(cls, data, index=0):
+        """Returns the index past the composite by skipping each attribute"""
+        if cls.__fixed_size__ is not None:
+            return index + cls.__fixed_size__
+        for step in cls.__codec__:
+            index = step.skip(data, index)
         return index
 
+    def load_from(self, stream):
+        """
+        Reads each run of fixed-width attributes with one read and recursively reads every other attribute
+
+        Lazy classes read every attribute immediately, since the stream cannot be returned to later.
+        """
+        _dict = self.__dict__
+        _dict.get('_pending', {}).clear()
+        for step in self.__codec__:
+            step.read(_dict, stream)
+
+    async def load_async(self, reader):
+        """Reads each run of fixed-width attributes with one read and recursively reads every other attribute"""
+        _dict = self.__dict__
+        _dict.get('_pending', {}).clear()
+        for step in self.__codec__:
+            await step.read_async(_dict, reader)
+
     def to_bytes(self):
-        """Recursively calls to_bytes on each Serializable attribute"""
-        data = bytearray()
-        for key in self.__ordered__:
-            data += self.__dict__[key].to_bytes()
+        """Saves each run of fixed-width attributes with one struct call and recursively saves every other attribute"""
+        data = bytearray(self.serialized_size())
+        self.write_into(data)
         return data
+
+    def serialized_size(self):
+        """Returns the sum of the sizes of each Serializable attribute"""
+        _dict = self.__dict__
+        return sum(step.size(_dict) for step in self.__codec__)
+
+    def write_into(self, buffer, offset=0):
+        """Writes each run of fixed-width attributes with one struct call and every other attribute recursively"""
+        _dict = self.__dict__
+        for step in self.__codec__:
+            offset = step.write(_dict, buffer, offset)
+        return offset
+
+    def write_to(self, stream):
+        """Writes each run of fixed-width attributes with one write and every other attribute recursively to stream"""
+        _dict = self.__dict__
+        for step in self.__codec__:
+            step.stream(_dict, stream)
+
+    @classmethod
+    def numpy_dtype(cls):
+        """
+        Returns the numpy structured dtype with one field per attribute laid out exactly like the bytearray
+        representation of the composite
+
+        Chars are stored as 'S1' and nested composites as nested structured dtypes. A ValueError is raised if any
+        attribute is not an int, floating point, char or such a composite.
+        """
+        dtype = cls.__dict__.get('_numpy_dtype')
+        if dtype is None:
+            import numpy as np
+            dtype = np.dtype([(key, _numpy_format(key, cls.__typemap__[key])) for key in cls.__ordered__])
+            type.__setattr__(cls, '_numpy_dtype', dtype)
+        return dtype
+
+    @classmethod
+    def array_from_bytes(cls, data, count, index=0):
+        """
+        Returns a numpy structured array of count packed composites and the index just past them
+
+        The array is a read-only view of data if data is immutable, so no records are copied.
+
+        Args:
+            data:  The bytearray containing the composites
+            count: The number of composites to load
+            index: The index in the bytearray where the data starts
+        """
+        import numpy as np
+        dtype = cls.numpy_dtype()
+        end_index = index + count * dtype.itemsize
+        if end_index > len(data):
+            raise ValueError('Data too short for {} composites of {} bytes'.format(count, dtype.itemsize))
+        return np.frombuffer(data, dtype, count, index), end_index
+
+    @classmethod
+    def to_bytes_from_array(cls, array):
+        """
+        Saves every record of a numpy structured array as packed composites
+
+        Args:
+            array: A numpy array with the dtype returned by numpy_dtype
+        """
+        import numpy as np
+        dtype = cls.numpy_dtype()
+        if array.dtype != dtype:
+            raise ValueError("Array dtype '{}' does not match '{}'".format(array.dtype, dtype))
+        return np.ascontiguousarray(array).tobytes()
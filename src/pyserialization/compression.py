@@ -0,0 +1,316 @@
+from pyserialization.serializable import Serializable, _read_exactly
+from pyserialization.serialint import SerialU8, SerialU32
+
+import bz2
+import enum
+import hashlib
+import lzma
+import zlib
+
+
+class Codec(enum.Enum):
+    """Enumerates the standard library compression codecs and the tag used to identify each in saved data"""
+    none = 0
+    zlib = 1
+    bz2 = 2
+    lzma = 3
+
+
+def _codec(codec):
+    """
+    Returns the Codec named by a string, or the Codec itself
+
+    Args:
+        codec: A Codec or the name of one, such as 'zlib'
+    """
+    if isinstance(codec, Codec):
+        return codec
+    try:
+        return Codec[codec]
+    except KeyError:
+        raise ValueError('Not a valid codec: {}'.format(codec))
+
+
+def _codec_from_tag(tag):
+    """
+    Returns the Codec identified by a loaded tag
+
+    Args:
+        tag: The int tag of the codec
+    """
+    try:
+        return Codec(tag)
+    except ValueError:
+        raise ValueError('Unknown codec tag {}'.format(tag))
+
+
+def compress(codec, data, level=None):
+    """
+    Compresses a bytes-like object and returns the compressed bytes
+
+    The standard library codecs release the GIL while compressing, so several blocks can be compressed at once from
+    different threads.
+
+    Args:
+        codec: A Codec or the name of one
+        data:  Any object supporting the buffer protocol
+        level: The compression level, or None for the codec's default
+    """
+    codec = _codec(codec)
+    if codec == Codec.zlib:
+        return zlib.compress(data, -1 if level is None else level)
+    if codec == Codec.bz2:
+        return bz2.compress(data, 9 if level is None else level)
+    if codec == Codec.lzma:
+        return lzma.compress(data, preset=level)
+    return bytes(data)
+
+
+def decompress(codec, data):
+    """
+    Decompresses a bytes-like object and returns the original bytes
+
+    Args:
+        codec: A Codec or the name of one
+        data:  Any object supporting the buffer protocol
+    """
+    codec = _codec(codec)
+    if codec == Codec.zlib:
+        return zlib.decompress(data)
+    if codec == Codec.bz2:
+        return bz2.decompress(data)
+    if codec == Codec.lzma:
+        return lzma.decompress(data)
+    return bytes(data)
+
+
+class _NullCompressor:
+    """A compressor for Codec.none that returns the data unchanged"""
+    def compress(self, data):
+        return bytes(data)
+
+    def flush(self):
+        return b''
+
+
+def _compressor(codec, level=None):
+    """
+    Returns an incremental compressor object with compress and flush methods
+
+    Args:
+        codec: A Codec or the name of one
+        level: The compression level, or None for the codec's default
+    """
+    codec = _codec(codec)
+    if codec == Codec.zlib:
+        return zlib.compressobj(-1 if level is None else level)
+    if codec == Codec.bz2:
+        return bz2.BZ2Compressor(9 if level is None else level)
+    if codec == Codec.lzma:
+        return lzma.LZMACompressor(preset=level)
+    return _NullCompressor()
+
+
+class _HashingStream:
+    """A write-only binary stream that only keeps a digest of everything written to it"""
+    def __init__(self):
+        self.hash = hashlib.blake2b()
+        self.position = 0
+
+    def tell(self):
+        """Returns the number of bytes written so far"""
+        return self.position
+
+    def write(self, data):
+        """Adds data to the digest"""
+        self.hash.update(data)
+        self.position += len(data)
+        return len(data)
+
+    def digest(self):
+        """Returns the digest of everything written"""
+        return self.hash.digest()
+
+
+class _CompressingStream:
+    """
+    A write-only binary stream that compresses everything written to it
+
+    Small writes are collected until there are at least buffer_size bytes, so the compressor is not called for every
+    few bytes. If hashed is True, a digest of the uncompressed bytes is kept as well.
+    """
+    def __init__(self, codec, level=None, buffer_size=1 << 16, hashed=False):
+        """
+        Args:
+            codec:       A Codec or the name of one
+            level:       The compression level, or None for the codec's default
+            buffer_size: The number of bytes collected before they are compressed
+            hashed:      If True, a digest of the uncompressed bytes is kept for digest
+        """
+        self.compressor = _compressor(codec, level)
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.chunks = []
+        self.position = 0
+        self.hash = hashlib.blake2b() if hashed else None
+
+    def tell(self):
+        """Returns the number of uncompressed bytes written so far"""
+        return self.position
+
+    def write(self, data):
+        """Adds data to the stream, compressing the collected bytes once there are enough"""
+        self.buffer += data
+        self.position += len(data)
+        if self.hash is not None:
+            self.hash.update(data)
+        if len(self.buffer) >= self.buffer_size:
+            self.chunks.append(self.compressor.compress(self.buffer))
+            self.buffer = bytearray()
+        return len(data)
+
+    def getvalue(self):
+        """Compresses the remaining bytes and returns everything compressed"""
+        self.chunks.append(self.compressor.compress(self.buffer))
+        self.chunks.append(self.compressor.flush())
+        self.buffer = bytearray()
+        return b''.join(self.chunks)
+
+    def digest(self):
+        """Returns the digest of the uncompressed bytes"""
+        return self.hash.digest()
+
+
+def serial_compressed(compressed_type, codec='zlib', level=None):
+    """
+    Returns a Serializable type that saves a compressed_type object compressed
+
+    The type is saved as the codec tag as a U8, the size of the compressed data as a U32 and then the compressed data.
+    The object is written to the compressor in pieces with write_to, so its uncompressed bytearray representation is
+    never created as a whole. The codec is read from the data, so data saved with any codec can be loaded.
+
+    Args:
+        compressed_type: The Serializable type to compress
+        codec:           The Codec or name of the codec used to save, such as 'zlib', 'bz2' or 'lzma'
+        level:           The compression level, or None for the codec's default
+    """
+    codec = _codec(codec)
+
+    class SerialCompressed(Serializable):
+        """
+        A compressed compressed_type object
+
+        The object has to be compressed to know its size, so serialized_size keeps the compressed data with a digest of
+        the uncompressed bytes, and the next call to write_into reuses it if the object still saves the same bytes.
+        """
+        value_type = compressed_type
+
+        def __init__(self, value=None):
+            """
+            Initializes the compressed object with a new compressed_type object or an existing value
+
+            Args:
+                value: A compressed_type object or a value that can be converted to one
+            """
+            self._compressed = None
+            self.set(compressed_type() if value is None else value)
+
+        def __str__(self):
+            """Returns the __str__ representation of the compressed object"""
+            return self._value.__str__()
+
+        def get(self):
+            """Returns the compressed_type object"""
+            return self._value
+
+        def set(self, value):
+            """
+            Sets the compressed object
+
+            Args:
+                value: A compressed_type object or a value that can be converted to one
+            """
+            if not isinstance(value, compressed_type):
+                try:
+                    value = compressed_type(value)
+                except:
+                    raise ValueError("'{}' is of type '{}', not '{}'".format(value, type(value), compressed_type))
+            self._value = value
+            self._compressed = None
+
+        def load_in_place(self, data, index=0):
+            """Loads the codec tag, the compressed size and then decompresses and loads the compressed_type object"""
+            tag, index = SerialU8.from_bytes(data, index)
+            size, index = SerialU32.from_bytes(data, index)
+            end_index = index + size.get()
+            if end_index > len(data):
+                raise ValueError('Data too short for {} compressed bytes'.format(size.get()))
+            with memoryview(data) as view:
+                self._load(tag.get(), view[index:end_index])
+            return end_index
+
+        @classmethod
+        def skip(cls, data, index=0):
+            """Returns the index past the compressed data by loading only its size"""
+            size, index = SerialU32.from_bytes(data, index + 1)
+            return index + size.get()
+
+        def load_from(self, stream):
+            """Reads the codec tag, the compressed size and then the compressed data from stream"""
+            tag = SerialU8.read_from(stream)
+            size = SerialU32.read_from(stream)
+            self._load(tag.get(), _read_exactly(stream, size.get()))
+
+        def _load(self, tag, compressed):
+            """Decompresses the data and loads the compressed_type object from it"""
+            self.set(compressed_type.from_bytes(decompress(_codec_from_tag(tag), compressed))[0])
+
+        def to_bytes(self):
+            """Saves the codec tag, the compressed size and then the compressed data, compressing the object once"""
+            compressed = self._compress().getvalue()
+            data = bytearray(5 + len(compressed))
+            self._write_compressed(data, 0, compressed)
+            return data
+
+        def serialized_size(self):
+            """
+            Returns the size of the codec tag, the U32 size and the compressed data
+
+            The object has to be compressed to know its size, so the compressed data is kept with a digest of the
+            uncompressed bytes and reused by the next call to write_into if the object has not changed
+            """
+            stream = self._compress(hashed=True)
+            self._compressed = stream.digest(), stream.getvalue()
+            return 5 + len(self._compressed[1])
+
+        def write_into(self, buffer, offset=0):
+            """Writes the codec tag, the compressed size and then the compressed data directly into buffer"""
+            cached, self._compressed = self._compressed, None
+            if cached is not None:
+                stream = _HashingStream()
+                self._value.write_to(stream)
+                if stream.digest() == cached[0]:
+                    return self._write_compressed(buffer, offset, cached[1])
+            return self._write_compressed(buffer, offset, self._compress().getvalue())
+
+        @staticmethod
+        def _write_compressed(buffer, offset, compressed):
+            """Writes the codec tag, the compressed size and then the compressed data directly into buffer"""
+            offset = SerialU8(codec.value).write_into(buffer, offset)
+            offset = SerialU32(len(compressed)).write_into(buffer, offset)
+            end_index = offset + len(compressed)
+            buffer[offset:end_index] = compressed
+            return end_index
+
+        def _compress(self, hashed=False):
+            """
+            Returns a _CompressingStream the compressed_type object was written to in pieces
+
+            Args:
+                hashed: If True, the stream also keeps a digest of the uncompressed bytes
+            """
+            stream = _CompressingStream(codec, level, hashed=hashed)
+            self._value.write_to(stream)
+            return stream
+
+    return SerialCompressed
@@ -0,0 +1,171 @@
+from pyserialization.serialint import SerialU32
+from pyserialization.union import UnionMeta
+
+import struct
+
+
+_IOV_MAX = 1024
+_LENGTH = struct.Struct('=I')
+
+
+class MessageWriter:
+    """
+    Writes Serializable messages to a socket as frames, sending many small messages together
+
+    Each frame is the size of the rest of the frame as a U32, the index of the message type in a Union type, sized
+    the same as the Union saves it, and then the message. Frames are kept until at least batch_size bytes are waiting
+    and are then sent with a single sendmsg call, or a single sendall on platforms without sendmsg.
+
+    Ex.
+    class Message(Union):
+        ping = Ping
+        data = Data
+
+    with MessageWriter(sock, Message) as writer:
+        writer.write(Ping())
+    """
+    def __init__(self, sock, union_type, batch_size=1 << 16):
+        """
+        Args:
+            sock:       A connected stream socket
+            union_type: The Union type whose types are the messages that can be written
+            batch_size: The number of waiting bytes that causes the frames to be sent
+        """
+        if not isinstance(union_type, UnionMeta):
+            raise ValueError("'{}' is not a Union type".format(union_type))
+        self._socket = sock
+        self._union_type = union_type
+        self._batch_size = batch_size
+        self._frames = []
+        self._waiting = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+
+    def write(self, message):
+        """
+        Adds a message to be sent, sending every waiting frame once there are enough
+
+        Args:
+            message: An object of one of the types of the Union type, or a Union object
+        """
+        if isinstance(message, self._union_type):
+            message = message.get()
+        tag_type = self._union_type.__tagtype__
+        try:
+            tag = tag_type(self._union_type.__indexmap__[type(message)])
+        except KeyError:
+            raise ValueError("'{}' is not a message type of '{}'".format(type(message), self._union_type))
+        size = tag_type.__fixed_size__ + message.serialized_size()
+        frame = bytearray(4 + size)
+        offset = SerialU32(size).write_into(frame)
+        message.write_into(frame, tag.write_into(frame, offset))
+        self._frames.append(frame)
+        self._waiting += len(frame)
+        if self._waiting >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        """Sends every waiting frame"""
+        frames, self._frames, self._waiting = self._frames, [], 0
+        if not hasattr(self._socket, 'sendmsg'):
+            self._socket.sendall(b''.join(frames))
+            return
+        views = [memoryview(frame) for frame in frames]
+        while views:
+            sent = self._socket.sendmsg(views[:_IOV_MAX])
+            while views and sent >= len(views[0]):
+                sent -= len(views[0])
+                views.pop(0)
+            if sent:
+                views[0] = views[0][sent:]
+
+
+class MessageReader:
+    """
+    Reads the frames written by a MessageWriter from a socket and returns the message in each
+
+    Data is received in large chunks into a buffer that is reused for every message, and each message is loaded
+    directly from the buffer. Types that keep a view of the data they were loaded from, such as SerialBytesView,
+    SerialAlignedNdArray or lazy composites, would see the buffer change and cannot be used as messages.
+
+    Iterating over the reader returns each message until the connection is closed.
+    """
+    def __init__(self, sock, union_type, buffer_size=1 << 16, max_frame_size=1 << 26):
+        """
+        Args:
+            sock:           A connected stream socket
+            union_type:     The Union type whose types are the messages that can be read
+            buffer_size:    The initial size of the receive buffer, which grows to fit larger messages
+            max_frame_size: The largest frame size that is accepted. A ValueError is raised for a larger frame before
+                            the buffer grows for it, so a malformed size cannot allocate a huge buffer
+        """
+        if not isinstance(union_type, UnionMeta):
+            raise ValueError("'{}' is not a Union type".format(union_type))
+        self._socket = sock
+        self._union_type = union_type
+        self._max_frame_size = max_frame_size
+        self._buffer = bytearray(buffer_size)
+        self._start = 0
+        self._end = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        message = self.read()
+        if message is None:
+            raise StopIteration
+        return message
+
+    def read(self):
+        """
+        Returns the next message, or None if the connection was closed after the last message
+
+        An EOFError is raised if the connection is closed in the middle of a message.
+        """
+        while True:
+            message = self._next_message()
+            if message is not None:
+                return message
+            if not self._receive():
+                if self._start != self._end:
+                    raise EOFError('Connection closed after {} bytes of a message'.format(self._end - self._start))
+                return None
+
+    def _next_message(self):
+        """Returns the message in the buffer if a whole frame has been received, otherwise None"""
+        if self._end - self._start < 4:
+            return None
+        size, = _LENGTH.unpack_from(self._buffer, self._start)
+        if size > self._max_frame_size:
+            raise ValueError('Frame of {} bytes is larger than the maximum of {}'.format(size, self._max_frame_size))
+        end_index = self._start + 4 + size
+        if end_index > self._end:
+            if 4 + size > len(self._buffer):
+                self._compact()
+                self._buffer.extend(bytes(4 + size - len(self._buffer)))
+            return None
+        union, index = self._union_type.from_bytes(self._buffer, self._start + 4)
+        if index != end_index:
+            raise ValueError('Message used {} bytes of a {} byte frame'.format(index - self._start - 4, size))
+        self._start = end_index
+        return union.get()
+
+    def _compact(self):
+        """Moves the unread bytes to the front of the buffer"""
+        self._buffer[:self._end - self._start] = self._buffer[self._start:self._end]
+        self._start, self._end = 0, self._end - self._start
+
+    def _receive(self):
+        """Receives as many bytes as fit in the buffer and returns False if the connection was closed"""
+        if self._end == len(self._buffer):
+            self._compact()
+        with memoryview(self._buffer) as view:
+            received = self._socket.recv_into(view[self._end:])
+        self._end += received
+        return received > 0
@@ -0,0 +1,63 @@
+import concurrent.futures
+import itertools
+import multiprocessing
+import threading
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+_keys = itertools.count()
+
+
+def _shards(count, workers):
+    """
+    Returns the (start, stop) of each shard when splitting count items between workers
+
+    Each worker gets about four shards so that uneven shards still keep every worker busy.
+
+    Args:
+        count:   The number of items
+        workers: The number of worker processes
+    """
+    shard_count = max(1, min(count, workers * 4))
+    bounds = [count * i // shard_count for i in range(shard_count + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _map_forked(function, shared, args, workers):
+    """
+    Returns a list of the results of function called with each tuple of args in a pool of forked worker processes
+
+    shared is stored in the module under a key of its own before the workers are forked, so they can use it without it
+    being pickled, and the key is passed to function before its args. Every call has its own key, so several threads
+    can use worker processes at once. Returns None if the platform cannot fork, in which case the caller should do the
+    work itself.
+
+    Args:
+        function: A module level function run in the workers, taking the key of shared and then the args
+        shared:   Any object the workers need, such as the list being saved
+        args:     A list of tuples of arguments for each call to function
+        workers:  The number of worker processes
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    with _shared_lock:
+        key = next(_keys)
+        _shared[key] = shared
+    context = multiprocessing.get_context('fork')
+    try:
+        with concurrent.futures.ProcessPoolExecutor(workers, mp_context=context) as executor:
+            return list(executor.map(function, itertools.repeat(key), *zip(*args)))
+    finally:
+        with _shared_lock:
+            del _shared[key]
+
+
+def _encode_shard(key, start, stop):
+    """Returns the items start to stop of the shared list saved one after another"""
+    values = _shared[key][start:stop]
+    data = bytearray(sum(value.serialized_size() for value in values))
+    offset = 0
+    for value in values:
+        offset = value.write_into(data, offset)
+    return bytes(data)
@@ -0,0 +1,200 @@
+from pyserialization.serializable import Serializable, _type_hooks, _types_by_id
+
+import atexit
+import functools
+import inspect
+import sys
+import threading
+import time
+
+
+_active = None
+_METHODS = (('load_in_place', 'decode'), ('write_into', 'encode'), ('to_bytes', 'encode'))
+_SORT_KEYS = {
+    'time': lambda stats: stats.encode_time + stats.decode_time,
+    'own': lambda stats: stats.own_time,
+    'calls': lambda stats: stats.encode_calls + stats.decode_calls,
+    'bytes': lambda stats: stats.encode_bytes + stats.decode_bytes,
+}
+
+
+class TypeStats:
+    """
+    The statistics collected for one Serializable type
+
+    Properties:
+        encode_calls: The number of calls to to_bytes or write_into
+        decode_calls: The number of calls to load_in_place
+        encode_time:  The seconds spent in to_bytes or write_into, including the attributes or items written by it
+        decode_time:  The seconds spent in load_in_place, including the attributes or items loaded by it
+        own_time:     The seconds spent encoding and decoding, not including other instrumented calls made by them
+        encode_bytes: The number of bytes written
+        decode_bytes: The number of bytes loaded
+        max_depth:    The largest number of instrumented calls that a call was made from, 0 for a top-level call
+    """
+    __slots__ = ('encode_calls', 'decode_calls', 'encode_time', 'decode_time', 'own_time', 'encode_bytes',
+                 'decode_bytes', 'max_depth')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+
+def _type_name(Type):
+    """Returns the name a type is known by in its module, or its qualified name if it has none"""
+    module = sys.modules.get(Type.__module__)
+    for name, value in vars(module).items() if module is not None else ():
+        if value is Type:
+            return name
+    name = Type.__qualname__.rpartition('.<locals>.')[2]
+    list_type = getattr(Type, '__listtype__', None)
+    if list_type is not None:
+        return '{}[{}]'.format(name, _type_name(list_type))
+    return name
+
+
+class Profile:
+    """
+    Collects how often, how long and with how many bytes each Serializable type is encoded and decoded
+
+    While the profile is enabled, the load_in_place, write_into and to_bytes methods of every Serializable type,
+    including those created later, are replaced by wrappers that record each call under the type of the object.
+    Disabling the profile restores the original methods, so nothing is measured and nothing costs extra outside of it.
+    A to_bytes call is recorded as one encode, and a write_into call it makes on the same object is not recorded again.
+    from_bytes is measured through the load_in_place call it makes, and the values of composite runs or compiled code
+    that are loaded and saved without calling their own methods are counted as part of their parent. Only one profile
+    can be enabled at a time.
+
+    Ex.
+    with Profile() as profile:
+        message.to_bytes()
+    print(profile.report())
+    """
+    def __init__(self):
+        self.stats = {}
+        self._local = threading.local()
+        self._originals = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    def enable(self):
+        """Starts recording the calls of every Serializable type"""
+        global _active
+        if _active is not None:
+            raise ValueError('A profile is already enabled')
+        _active = self
+        for Type in [Serializable] + list(_types_by_id.values()):
+            self._instrument(Type)
+        _type_hooks.append(self._instrument)
+
+    def disable(self):
+        """Stops recording and restores the original methods of every type"""
+        global _active
+        if _active is not self:
+            return
+        _type_hooks.remove(self._instrument)
+        for Type, name, original in reversed(self._originals):
+            type.__setattr__(Type, name, original)
+        self._originals = []
+        _active = None
+
+    def _instrument(self, Type):
+        """Replaces the methods defined by a type itself with wrappers recording each call"""
+        for name, kind in _METHODS:
+            method = Type.__dict__.get(name)
+            if inspect.isfunction(method):
+                self._originals.append((Type, name, method))
+                type.__setattr__(Type, name, self._wrap(method, name, kind))
+
+    def _wrap(self, method, method_name, kind):
+        """
+        Returns a function recording the calls to a load_in_place, write_into or to_bytes method
+
+        Args:
+            method:      The original method
+            method_name: The name of the method
+            kind:        'decode' for load_in_place or 'encode' for write_into and to_bytes
+        """
+        stats_by_type = self.stats
+        local = self._local
+        clock = time.perf_counter
+        calls, seconds, size = kind + '_calls', kind + '_time', kind + '_bytes'
+        saving = method_name == 'to_bytes'
+        delegated = method_name == 'write_into'
+
+        if not saving:
+            parameter = list(inspect.signature(method).parameters.values())[2]
+            name, default = parameter.name, parameter.default
+
+        @functools.wraps(method)
+        def wrapper(obj, *args, **kwargs):
+            stack = local.__dict__.setdefault('stack', [])
+            depth = len(stack)
+            outer = local.__dict__.get('saving')
+            if delegated and outer is not None and outer[0] is obj and outer[1] == depth:
+                return method(obj, *args, **kwargs)
+            if saving:
+                local.saving = obj, depth + 1
+            stack.append(0.0)
+            start = clock()
+            result = None
+            try:
+                result = method(obj, *args, **kwargs)
+                return result
+            finally:
+                elapsed = clock() - start
+                if saving:
+                    local.saving = outer
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                stats = stats_by_type.get(type(obj))
+                if stats is None:
+                    stats = stats_by_type[type(obj)] = TypeStats()
+                setattr(stats, calls, getattr(stats, calls) + 1)
+                setattr(stats, seconds, getattr(stats, seconds) + elapsed)
+                stats.own_time += elapsed - children
+                if saving and result is not None:
+                    setattr(stats, size, getattr(stats, size) + len(result))
+                elif result is not None:
+                    start_index = args[1] if len(args) > 1 else kwargs.get(name, default)
+                    setattr(stats, size, getattr(stats, size) + result - start_index)
+                if depth > stats.max_depth:
+                    stats.max_depth = depth
+        return wrapper
+
+    def report(self, sort='time', limit=None):
+        """
+        Returns a table of the statistics of each type, most costly first
+
+        Args:
+            sort:  What the types are ordered by: 'time' for encode and decode time including nested calls, 'own' for
+                   time not spent in nested calls, 'calls' or 'bytes'
+            limit: The largest number of types to include, or None for all of them
+        """
+        if sort not in _SORT_KEYS:
+            raise ValueError("Cannot sort by '{}', expected one of {}".format(sort, ', '.join(_SORT_KEYS)))
+        key = _SORT_KEYS[sort]
+        rows = sorted(self.stats.items(), key=lambda item: key(item[1]), reverse=True)[:limit]
+        names = [_type_name(Type) for Type, _ in rows]
+        width = max([len(name) for name in names] + [4])
+        lines = ['{:<{}} {:>9} {:>9} {:>11} {:>11} {:>11} {:>12} {:>12} {:>5}'.format(
+            'type', width, 'encodes', 'decodes', 'encode ms', 'decode ms', 'own ms', 'bytes out', 'bytes in', 'depth')]
+        for name, (_, stats) in zip(names, rows):
+            lines.append('{:<{}} {:>9} {:>9} {:>11.3f} {:>11.3f} {:>11.3f} {:>12} {:>12} {:>5}'.format(
+                name, width, stats.encode_calls, stats.decode_calls, stats.encode_time * 1000,
+                stats.decode_time * 1000, stats.own_time * 1000, stats.encode_bytes, stats.decode_bytes,
+                stats.max_depth))
+        return '\n'.join(lines) + '\n'
+
+
+def _profile_process():
+    """Profiles the whole process and writes the report to stderr when it exits, for PYSERIALIZATION_PROFILE"""
+    profile = Profile()
+    profile.enable()
+    atexit.register(lambda: sys.stderr.write(profile.report()))
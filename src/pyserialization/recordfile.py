@@ -0,0 +1,135 @@
+from pyserialization.composite import Composite
+
+import collections.abc
+import mmap
+
+
+class MappedList(collections.abc.Sequence):
+    """
+    A list-like view of a buffer packed with fixed-size Composite records.
+
+    Records are only decoded when they are accessed, so indexing is O(1) no matter how large the buffer is. If the
+    buffer is writable, assigning a record writes it directly into the buffer.
+
+    Ex.
+    class Sample(Composite):
+        time = SerialDouble
+        value = SerialS32
+
+    samples = MappedList(Sample, data)
+    samples[10].value    # Decodes only the eleventh record
+    """
+
+    record_type = property(lambda self: self._record_type)
+
+    def __init__(self, record_type, buffer):
+        """
+        Args:
+            record_type: A Composite type made only of fixed-size attributes
+            buffer: Any object supporting the buffer protocol, such as bytes, bytearray or mmap
+        """
+        if not (isinstance(record_type, type) and issubclass(record_type, Composite)):
+            raise ValueError("'{}' is not a Composite type".format(record_type))
+        if not record_type.__fixed_size__:
+            raise ValueError("'{}' does not have a fixed size".format(record_type))
+        if len(buffer) % record_type.__fixed_size__ != 0:
+            raise ValueError('Buffer size {} is not a multiple of the record size {}'.format(
+                len(buffer), record_type.__fixed_size__))
+        self._record_type = record_type
+        self._buffer = buffer
+
+    def __len__(self):
+        """Returns the number of records in the buffer"""
+        return len(self._buffer) // self._record_type.__fixed_size__
+
+    def __getitem__(self, index):
+        """
+        Decodes the record at an index, or a list of the records in a slice
+
+        Args:
+            index: An int or slice
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._record_type.from_bytes(self._buffer, self._offset(index))[0]
+
+    def __setitem__(self, index, value):
+        """
+        Writes a record, or an iterable of records to a slice, directly into the buffer
+
+        Args:
+            index: An int or slice
+            value: A record_type object, or an iterable of them for a slice
+        """
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            values = list(value)
+            if len(values) != len(indices):
+                raise ValueError('Cannot assign {} records to a slice of {}'.format(len(values), len(indices)))
+            for i, record in zip(indices, values):
+                self[i] = record
+            return
+        if type(value) != self._record_type:
+            raise ValueError("Types do not match: '{}' != '{}'".format(type(value), self._record_type))
+        value.write_into(self._buffer, self._offset(index))
+
+    def _offset(self, index):
+        """
+        Returns the offset of the record at an index in the buffer
+
+        Args:
+            index: The index of the record, which may be negative
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('Record index out of range')
+        return index * self._record_type.__fixed_size__
+
+
+class RecordFile(MappedList):
+    """
+    A MappedList over a file of fixed-size Composite records that is memory mapped instead of read into memory.
+
+    Should be closed when no longer used, preferably by using it as a context manager.
+
+    Ex.
+    with RecordFile(Sample, 'samples.bin') as samples:
+        print(len(samples), samples[-1].value)
+    """
+
+    def __init__(self, record_type, path, writable=False):
+        """
+        Args:
+            record_type: A Composite type made only of fixed-size attributes
+            path: The path to the file of records
+            writable: If True, assigning a record writes it to the file
+        """
+        self._file = open(path, 'r+b' if writable else 'rb')
+        try:
+            if self._file.seek(0, 2) == 0:
+                buffer = bytes()
+            else:
+                buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+            MappedList.__init__(self, record_type, buffer)
+        except:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Unmaps and closes the file"""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def flush(self):
+        """Flushes records that were written back to the file"""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.flush()
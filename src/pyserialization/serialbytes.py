@@ -1,9 +1,12 @@
-from pyserialization.serializable import Serializable
+from pyserialization.serializable import Serializable, _read_exactly
 from pyserialization.serialint import SerialU32
+from pyserialization.serialvarint import SerialVarUInt
 
 
 class SerialBytes(Serializable):
     """A Serializable bytes object that also saved its length"""
+    __slots__ = ('_value',)
+    _length_type = SerialU32
 
     def __init__(self, value=bytes()):
         """initializes the SerialChar with an initial value of no bytes"""
@@ -24,22 +27,88 @@ class SerialBytes(Serializable):
         Args:
             value: The bytes to store
         """
-        if not isinstance(value, (bytes, bytearray)):
+        if not isinstance(value, (bytes, bytearray, memoryview)):
             raise ValueError("Value not bytes! {}".format(value))
         self._value = value
 
     def load_in_place(self, data, index=0):
-        """Loads the size of the bytes object and the actual bytes"""
-        size, index = SerialU32.from_bytes(data, index)
-        self._value = data[index:index+size.get()]
+        """Loads the size of the bytes object and then copies the actual bytes"""
+        size, index = self._length_type.from_bytes(data, index)
+        end_index = index + size.get()
+        if end_index > len(data):
+            raise ValueError('Data too short for {} bytes'.format(size.get()))
+        with memoryview(data) as view:
+            self._value = self._view(view[index:end_index])
+        return end_index
+
+    @classmethod
+    def skip(cls, data, index=0):
+        """Returns the index past the bytes object by loading only its size"""
+        size, index = cls._length_type.from_bytes(data, index)
         return index + size.get()
 
+    def load_from(self, stream):
+        """Reads the size of the bytes object and then the actual bytes from stream"""
+        size = self._length_type.read_from(stream)
+        self._value = bytes(_read_exactly(stream, size.get()))
+
+    async def load_async(self, reader):
+        """Reads the size of the bytes object and then the actual bytes from an asyncio.StreamReader"""
+        size = await self._length_type.read_async(reader)
+        self._value = await reader.readexactly(size.get())
+
+    @staticmethod
+    def _view(view):
+        """Returns the value stored for a view of the loaded bytes"""
+        return view.tobytes()
+
     def to_bytes(self):
         """Saves the size of the bytes object and then the bytes object"""
-        size = SerialU32(len(self._value))
-        data = size.to_bytes() + self._value
+        data = bytearray(self.serialized_size())
+        self.write_into(data)
         return data
 
+    def serialized_size(self):
+        """Returns the size of the length plus the bytes object"""
+        return self._length_type(len(self._value)).serialized_size() + len(self._value)
+
+    def write_into(self, buffer, offset=0):
+        """Writes the size of the bytes object and then the bytes object directly into buffer"""
+        offset = self._length_type(len(self._value)).write_into(buffer, offset)
+        end_index = offset + len(self._value)
+        buffer[offset:end_index] = self._value
+        return end_index
+
+
+class SerialBytesView(SerialBytes):
+    """
+    A SerialBytes that loads a memoryview into the data it was loaded from instead of copying the bytes.
+
+    The view keeps the source buffer alive, and a bytearray source cannot be resized while the view exists.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def _view(view):
+        """Returns the view of the loaded bytes itself"""
+        return view
+
+    def load_from(self, stream):
+        """Reads the size of the bytes object and then a view of the actual bytes from stream"""
+        size = self._length_type.read_from(stream)
+        self._value = memoryview(_read_exactly(stream, size.get()))
+
+    async def load_async(self, reader):
+        """Reads the size of the bytes object and then a view of the actual bytes from an asyncio.StreamReader"""
+        size = await self._length_type.read_async(reader)
+        self._value = memoryview(await reader.readexactly(size.get()))
+
+
+class SerialVarBytes(SerialBytes):
+    """A SerialBytes that saves its length as a varint, taking a single byte for fewer than 128 bytes"""
+    __slots__ = ()
+    _length_type = SerialVarUInt
+
 
 if __name__ == '__main__':
     data = b'adf432989ihadf'
@@ -1,14 +1,19 @@
-from pyserialization.serializable import Serializable
+from pyserialization.serializable import Serializable, _read_exactly
 
 import struct
 
 
 class SerialChar(Serializable):
     """A Serializable char type that is converted with the python struct module"""
+    __slots__ = ('_value',)
+    __fixed_size__ = 1
+    _struct_label = 'c'
+    _unpack_value = staticmethod(bytes.decode)
+    _pack_value = staticmethod(str.encode)
+    _struct = struct.Struct('c')
 
     def __init__(self, value=chr(0)):
         """initializes the SerialChar with an initial value of the null char"""
-        self._format_string = 'c'
         self.set(value)
 
     def __str__(self):
@@ -35,12 +40,24 @@ class SerialChar(Serializable):
         self._value = value
 
     def load_in_place(self, data, index=0):
-        """Loads a character type using the struct module"""
-        end_index = index + 1
-        char = struct.unpack(self._format_string, data[index:end_index])[0]
+        """Loads a character type using the struct module without copying data"""
+        char = self._struct.unpack_from(data, index)[0]
         self._value = char.decode()
-        return end_index
+        return index + 1
+
+    def load_from(self, stream):
+        """Reads the character from stream"""
+        self.load_in_place(_read_exactly(stream, 1))
 
     def to_bytes(self):
         """Converts a character type using the struct module"""
-        return bytearray(struct.pack(self._format_string, self._value.encode()))
+        return bytearray(self._struct.pack(self._value.encode()))
+
+    def serialized_size(self):
+        """Returns the size of a character"""
+        return 1
+
+    def write_into(self, buffer, offset=0):
+        """Writes a character type directly into buffer using the struct module"""
+        self._struct.pack_into(buffer, offset, self._value.encode())
+        return offset + 1
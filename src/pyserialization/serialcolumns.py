@@ -0,0 +1,457 @@
+from pyserialization.composite import CompositeMeta
+from pyserialization.serializable import Serializable, _byte_order, _byte_swapped, _read_exactly, _struct_type
+from pyserialization.serialint import SerialU32
+from pyserialization.seriallist import _array_typecode
+
+import array
+import collections.abc
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_OFFSET_TYPECODE = _array_typecode('I')
+
+
+class _FixedColumn:
+    """
+    A column of a fixed-width int, floating point, char or enum attribute, saved as its values packed back to back.
+
+    Ints and floating points are held in an array.array in native byte order and are loaded and saved with a single
+    copy, which is byte swapped when the attribute type uses the other byte order. Other values are held in a list.
+    """
+    def __init__(self, struct_type, Type):
+        """
+        Args:
+            struct_type: The class that declares the struct label of the attribute type
+            Type:        The Serializable type of the attribute
+        """
+        self.label = struct_type._struct_label
+        self.order = _byte_order(Type)
+        self.swap = _byte_swapped(Type)
+        self.itemsize = struct.calcsize('=' + self.label)
+        self.unpack = getattr(struct_type, '_unpack_value', None)
+        self.pack = getattr(struct_type, '_pack_value', None)
+        self.typecode = _array_typecode(self.label) if self.unpack is None else None
+        self.values = self._new()
+
+    def _new(self):
+        """Returns empty storage for the column"""
+        return array.array(self.typecode) if self.typecode is not None else []
+
+    def append(self, serializable):
+        """Adds the value of an attribute to the column"""
+        self.values.append(serializable._value)
+
+    def assign(self, index, serializable):
+        """Replaces the value at an index with the value of an attribute"""
+        self.values[index] = serializable._value
+
+    def extract(self, index, serializable):
+        """Sets an attribute to the value at an index"""
+        serializable._value = self.values[index]
+
+    def clear(self):
+        """Removes every value"""
+        self.values = self._new()
+
+    def size(self):
+        """Returns the size of the saved column"""
+        return len(self.values) * self.itemsize
+
+    def write(self, buffer, offset):
+        """Writes the packed values directly into buffer"""
+        end_index = offset + self.size()
+        if self.typecode is not None:
+            values = self.values
+            if self.swap:
+                values = array.array(self.typecode, values)
+                values.byteswap()
+            with memoryview(values) as view:
+                buffer[offset:end_index] = view.cast('B')
+        else:
+            values = self.values if self.pack is None else [self.pack(value) for value in self.values]
+            struct.pack_into('{}{}{}'.format(self.order, len(values), self.label), buffer, offset, *values)
+        return end_index
+
+    def load(self, data, index, count):
+        """Loads count packed values from data"""
+        end_index = self.skip(data, index, count)
+        if self.typecode is not None:
+            self.values = array.array(self.typecode)
+            with memoryview(data) as view:
+                self.values.frombytes(view[index:end_index])
+            if self.swap:
+                self.values.byteswap()
+        else:
+            values = struct.unpack_from('{}{}{}'.format(self.order, count, self.label), data, index)
+            self.values = list(values) if self.unpack is None else [self.unpack(value) for value in values]
+        return end_index
+
+    def skip(self, data, index, count):
+        """Returns the index past count packed values"""
+        end_index = index + count * self.itemsize
+        if end_index > len(data):
+            raise ValueError('Data too short for a column of {} values'.format(count))
+        return end_index
+
+    def read(self, stream, count):
+        """Reads count packed values from stream"""
+        self.load(_read_exactly(stream, count * self.itemsize), 0, count)
+
+
+class _StringColumn:
+    """
+    A column of a string attribute, saved as the U32 end offset of each encoded string followed by the encoded
+    strings joined together.
+
+    The column is held in the same form, so loading and saving it are two copies no matter how many strings it has.
+    """
+    def __init__(self, encoding):
+        """
+        Args:
+            encoding: The encoding of the string type
+        """
+        self.encoding = encoding
+        self.clear()
+
+    @property
+    def values(self):
+        """Returns a list of every string in the column"""
+        return [self._get(index) for index in range(len(self.offsets))]
+
+    def _get(self, index):
+        """Returns the string at an index"""
+        start = self.offsets[index - 1] if index > 0 else 0
+        return str(self.blob[start:self.offsets[index]], self.encoding)
+
+    def append(self, serializable):
+        """Adds the value of a string attribute to the column"""
+        self.blob += serializable.get().encode(self.encoding)
+        self.offsets.append(len(self.blob))
+
+    def assign(self, index, serializable):
+        """Replaces the string at an index with the value of a string attribute"""
+        index = range(len(self.offsets))[index]
+        start = self.offsets[index - 1] if index > 0 else 0
+        data = serializable.get().encode(self.encoding)
+        difference = len(data) - (self.offsets[index] - start)
+        self.blob[start:self.offsets[index]] = data
+        for position in range(index, len(self.offsets)):
+            self.offsets[position] += difference
+
+    def extract(self, index, serializable):
+        """Sets a string attribute to the string at an index"""
+        serializable.set(self._get(range(len(self.offsets))[index]))
+
+    def clear(self):
+        """Removes every string"""
+        self.offsets = array.array(_OFFSET_TYPECODE)
+        self.blob = bytearray()
+
+    def size(self):
+        """Returns the size of the saved column"""
+        return len(self.offsets) * self.offsets.itemsize + len(self.blob)
+
+    def write(self, buffer, offset):
+        """Writes the offsets and then the joined strings directly into buffer"""
+        blob_index = offset + len(self.offsets) * self.offsets.itemsize
+        with memoryview(self.offsets) as view:
+            buffer[offset:blob_index] = view.cast('B')
+        end_index = blob_index + len(self.blob)
+        buffer[blob_index:end_index] = self.blob
+        return end_index
+
+    def load(self, data, index, count):
+        """Loads count offsets and then the joined strings from data"""
+        blob_index = index + count * self.offsets.itemsize
+        self.offsets = array.array(_OFFSET_TYPECODE)
+        with memoryview(data) as view:
+            self.offsets.frombytes(view[index:blob_index])
+            if len(self.offsets) != count:
+                raise ValueError('Data too short for a column of {} strings'.format(count))
+            end_index = blob_index + (self.offsets[-1] if count else 0)
+            self.blob = bytearray(view[blob_index:end_index])
+        if len(self.blob) != end_index - blob_index:
+            raise ValueError('Data too short for a column of {} strings'.format(count))
+        return end_index
+
+    def skip(self, data, index, count):
+        """Returns the index past count offsets and the joined strings by loading only the last offset"""
+        if count == 0:
+            return index
+        blob_index = index + count * self.offsets.itemsize
+        last, = struct.unpack_from('=I', data, blob_index - self.offsets.itemsize)
+        return blob_index + last
+
+    def read(self, stream, count):
+        """Reads count offsets and then the joined strings from stream"""
+        self.offsets = array.array(_OFFSET_TYPECODE)
+        self.offsets.frombytes(_read_exactly(stream, count * self.offsets.itemsize))
+        self.blob = bytearray(_read_exactly(stream, self.offsets[-1] if count else 0))
+
+
+class _ObjectColumn:
+    """A column of any other attribute, saved as each attribute one after another"""
+    def __init__(self, Type):
+        """
+        Args:
+            Type: The Serializable type of the attribute
+        """
+        self.Type = Type
+        self.values = []
+
+    def append(self, serializable):
+        """Adds an attribute to the column"""
+        self.values.append(serializable)
+
+    def assign(self, index, serializable):
+        """Replaces the attribute at an index"""
+        self.values[index] = serializable
+
+    def extract(self, index, serializable):
+        """Returns the attribute at an index, which replaces the attribute of the record"""
+        return self.values[index]
+
+    def clear(self):
+        """Removes every attribute"""
+        self.values = []
+
+    def size(self):
+        """Returns the size of every saved attribute"""
+        return sum(value.serialized_size() for value in self.values)
+
+    def write(self, buffer, offset):
+        """Writes every attribute directly into buffer"""
+        for value in self.values:
+            offset = value.write_into(buffer, offset)
+        return offset
+
+    def load(self, data, index, count):
+        """Loads count attributes from data"""
+        self.values = []
+        for _ in range(count):
+            value, index = self.Type.from_bytes(data, index)
+            self.values.append(value)
+        return index
+
+    def skip(self, data, index, count):
+        """Returns the index past count attributes"""
+        for _ in range(count):
+            index = self.Type.skip(data, index)
+        return index
+
+    def read(self, stream, count):
+        """Reads count attributes from stream"""
+        self.values = [self.Type.read_from(stream) for _ in range(count)]
+
+
+def _create_column(Type):
+    """
+    Returns an empty column for an attribute type
+
+    Args:
+        Type: The Serializable type of the attribute
+    """
+    struct_type = _struct_type(Type)
+    if struct_type is not None:
+        return _FixedColumn(struct_type, Type)
+    if getattr(Type, '_encoding', None) is not None:
+        return _StringColumn(Type._encoding)
+    return _ObjectColumn(Type)
+
+
+def serial_columns(composite_type):
+    """
+    Returns a Serializable list type that stores composite_type records column by column
+
+    The list is saved as the number of records as a U32 followed by one column per attribute, in declaration order.
+    Int, floating point, char and enum columns are their values packed back to back, string columns are the U32 end
+    offset of each encoded string followed by the encoded strings, and every other column is each attribute saved one
+    after another. Records are only created when they are accessed, and the values of a single attribute can be
+    retrieved directly with column().
+
+    Args:
+        composite_type: The Composite type of the records
+    """
+    if not isinstance(composite_type, CompositeMeta):
+        raise ValueError("'{}' is not a Composite type".format(composite_type))
+    keys = composite_type.__ordered__
+    prototypes = [_create_column(composite_type.__typemap__[key]) for key in keys]
+
+    class SerialColumns(collections.abc.Sequence, Serializable):
+        """A list of composite_type records that are stored column by column"""
+        record_type = composite_type
+
+        def __init__(self, values=()):
+            """
+            Initializes the list with an iterable of records
+
+            Args:
+                values: The composite_type records
+            """
+            self._columns = [_create_column(composite_type.__typemap__[key]) for key in keys]
+            self._length = 0
+            self.set(values)
+
+        def __len__(self):
+            """Returns the number of records"""
+            return self._length
+
+        def __getitem__(self, index):
+            """
+            Creates the record at an index, or a list of the records in a slice
+
+            Attributes that are not ints, floating points, chars, enums or strings are shared with the list.
+
+            Args:
+                index: An int or slice
+            """
+            if isinstance(index, slice):
+                return [self[i] for i in range(*index.indices(self._length))]
+            index = range(self._length)[index]
+            record = composite_type()
+            _dict = record.__dict__
+            for key, column in zip(keys, self._columns):
+                serializable = column.extract(index, _dict[key])
+                if serializable is not None:
+                    _dict[key] = serializable
+            return record
+
+        def __setitem__(self, index, value):
+            """
+            Replaces the record at an index
+
+            Args:
+                index: The index of the record
+                value: The new composite_type record
+            """
+            index = range(self._length)[index]
+            _dict = self._validate(value).__dict__
+            for key, column in zip(keys, self._columns):
+                column.assign(index, _dict[key])
+
+        @staticmethod
+        def _validate(value):
+            """
+            Confirms a value is a composite_type record
+
+            Args:
+                value: The value to validate
+            """
+            if type(value) != composite_type:
+                raise ValueError("'{}' is of type '{}', not '{}'".format(value, type(value), composite_type))
+            value._load_pending()
+            return value
+
+        def append(self, value):
+            """
+            Adds a record to the end of the list
+
+            Args:
+                value: The composite_type record
+            """
+            _dict = self._validate(value).__dict__
+            for key, column in zip(keys, self._columns):
+                column.append(_dict[key])
+            self._length += 1
+
+        def extend(self, values):
+            """
+            Adds every record of an iterable to the end of the list
+
+            Args:
+                values: The composite_type records
+            """
+            for value in values:
+                self.append(value)
+
+        def clear(self):
+            """Removes every record"""
+            for column in self._columns:
+                column.clear()
+            self._length = 0
+
+        def set(self, values):
+            """
+            Sets the records of the list to be equal to the records in an iterable
+
+            Args:
+                values: The composite_type records
+            """
+            values = [self._validate(value) for value in values]
+            self.clear()
+            self.extend(values)
+
+        def column(self, key):
+            """
+            Returns the values of one attribute of every record without creating the records
+
+            Int and floating point columns are returned as the array.array holding them, string columns as a list of
+            strings, and any other column as a list of the values or attributes.
+
+            Args:
+                key: The attribute name
+            """
+            return self._columns[keys.index(key)].values
+
+        def numpy_column(self, key):
+            """
+            Returns an int or floating point column as a numpy.ndarray that shares memory with the column
+
+            The column cannot change size while the ndarray exists.
+
+            Args:
+                key: The attribute name
+            """
+            if np is None:
+                raise ImportError('numpy is required for numpy_column')
+            column = self._columns[keys.index(key)]
+            if getattr(column, 'typecode', None) is None:
+                raise ValueError("'{}' is not an int or floating point column".format(key))
+            return np.frombuffer(column.values, np.dtype('=' + column.label))
+
+        def load_in_place(self, data, index=0):
+            """Loads the number of records as a U32 and then each column"""
+            size, index = SerialU32.from_bytes(data, index)
+            for column in self._columns:
+                index = column.load(data, index, size.get())
+            self._length = size.get()
+            return index
+
+        @classmethod
+        def skip(cls, data, index=0):
+            """Returns the index past the list, only loading columns of attributes that do not have a fixed size"""
+            size, index = SerialU32.from_bytes(data, index)
+            for column in prototypes:
+                index = column.skip(data, index, size.get())
+            return index
+
+        def load_from(self, stream):
+            """Reads the number of records as a U32 and then each column from stream"""
+            size = SerialU32.read_from(stream)
+            for column in self._columns:
+                column.read(stream, size.get())
+            self._length = size.get()
+
+        def to_bytes(self):
+            """Saves the number of records as a U32 and then each column"""
+            data = bytearray(self.serialized_size())
+            self.write_into(data)
+            return data
+
+        def serialized_size(self):
+            """Returns the size of the U32 length plus the size of every column"""
+            return 4 + sum(column.size() for column in self._columns)
+
+        def write_into(self, buffer, offset=0):
+            """Writes the number of records as a U32 and then each column directly into buffer"""
+            offset = SerialU32(self._length).write_into(buffer, offset)
+            for column in self._columns:
+                offset = column.write(buffer, offset)
+            return offset
+
+    return SerialColumns
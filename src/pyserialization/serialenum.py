@@ -1,10 +1,11 @@
-from pyserialization.serializable import Serializable
-from pyserialization.serialint import SerialU32
+from pyserialization.endianness import Endianess
+from pyserialization.serializable import Serializable, _read_exactly
+from pyserialization.serialint import SerialU32, _tag_type
 
 import enum
 
 
-def serial_enum(enum_type):
+def serial_enum(enum_type, *, compact=False):
     """
     Creates a SerialEnum object that can hold one value of the types specified in an enum
 
@@ -15,14 +16,43 @@ def serial_enum(enum_type):
         B = 'enum_b'
     MySerialEnum = serial_enum(MyEnum)
     a = MySerialEnum(MyEnum.B)
+
+    Args:
+        enum_type: The enum.Enum class to select values from
+        compact: If True, the index of the enum is stored in the smallest of U8, U16 and U32 that can hold every
+                 index, instead of always as a U32
     """
     if not issubclass(enum_type, enum.Enum):
         raise ValueError('Argument must be int enum:', enum_type)
+    members = tuple(enum_type.__members__.values())
+    positions = {name: position for position, name in enumerate(enum_type.__members__)}
+    tag_type = _tag_type(len(members)) if compact else SerialU32
+
+    def unpack_value(position):
+        """Returns the enum at a loaded index"""
+        if not 0 <= position < len(members):
+            raise ValueError('Enum index {} is out of range'.format(position))
+        return members[position]
+
+    def pack_value(value):
+        """Returns the index of an enum"""
+        return positions[value.name]
 
     class SerialEnum(Serializable):
-        """Serial enum type that stores a single enum selected from 'enum_type'"""
+        """
+        Serial enum type that stores a single enum selected from 'enum_type'
+
+        The enum is stored as its index in enum_type.__members__. The lookups between enums and indices are built
+        once when the type is created.
+        """
+        __slots__ = ('_value',)
+        __fixed_size__ = tag_type.__fixed_size__
+        _struct_label = tag_type._struct_label
+        _unpack_value = staticmethod(unpack_value)
+        _pack_value = staticmethod(pack_value)
+        _struct = tag_type._structs[Endianess.native]
 
-        def __init__(self, value=list(enum_type.__members__.values())[0]):
+        def __init__(self, value=members[0]):
             """
             Initializes the SerialEnum with a given enum or the first enum in enum_type.__members__
             """
@@ -44,14 +74,25 @@ def serial_enum(enum_type):
             self._value = value
 
         def load_in_place(self, data, index=0):
-            """Loads a U32 representing the index of the enum in enum_type"""
-            position, index = SerialU32.from_bytes(data, index)
-            self._value = list(enum_type.__members__.values())[position.get()]
-            return index
+            """Loads the index of the enum in enum_type"""
+            self._value = unpack_value(self._struct.unpack_from(data, index)[0])
+            return index + self.__fixed_size__
+
+        def load_from(self, stream):
+            """Reads the index of the enum in enum_type from stream"""
+            self.load_in_place(_read_exactly(stream, self.__fixed_size__))
 
         def to_bytes(self):
-            """Saves the index of the enum in enum_type as a U32"""
-            position = list(enum_type.__members__.keys()).index(self._value.name)
-            return SerialU32(position).to_bytes()
+            """Saves the index of the enum in enum_type"""
+            return bytearray(self._struct.pack(positions[self._value.name]))
+
+        def serialized_size(self):
+            """Returns the size of the index"""
+            return self.__fixed_size__
+
+        def write_into(self, buffer, offset=0):
+            """Writes the index of the enum in enum_type directly into buffer"""
+            self._struct.pack_into(buffer, offset, positions[self._value.name])
+            return offset + self.__fixed_size__
 
     return SerialEnum
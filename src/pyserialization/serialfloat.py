@@ -1,4 +1,4 @@
-from pyserialization.serializable import Serializable
+from pyserialization.serializable import Serializable, _read_exactly
 from pyserialization.endianness import Endianess
 
 import enum
@@ -53,7 +53,14 @@ def _create_floating_point(float_type):
     class _SerialFloatingPoint(Serializable):
         """
         A Serializable floating point type that is converted with the python struct module
+
+        Instances only hold their value and a reference to one of the precompiled structs shared by the type, one per
+        endianness, so they have no __dict__.
         """
+        __slots__ = ('_value', '_struct')
+        __fixed_size__ = float_type.value.size
+        _struct_label = float_type.value.label
+        _structs = {endian: struct.Struct(endian.value + float_type.value.label) for endian in Endianess}
 
         def __init__(self, value=0, *, endian=Endianess.native):
             """
@@ -96,17 +103,38 @@ def _create_floating_point(float_type):
             Args:
                 endian: The endianness to store and load the type. The default is the native byte order
             """
-            self._format_string = endian.value + float_type.value.label
+            self._struct = self._structs[endian]
+
+        def __getstate__(self):
+            """Returns the value and endianness to pickle, since the precompiled struct cannot be pickled"""
+            return self._value, Endianess(self._struct.format[0])
+
+        def __setstate__(self, state):
+            """Restores the value and endianness from a pickle"""
+            self._value, endian = state
+            self.set_endianness(endian)
 
         def load_in_place(self, data, index=0):
-            """Loads a floating point type using the struct module"""
-            end_index = index + float_type.value.size
-            self._value = struct.unpack(self._format_string, data[index:end_index])[0]
-            return end_index
+            """Loads a floating point type using the struct module without copying data"""
+            self._value = self._struct.unpack_from(data, index)[0]
+            return index + float_type.value.size
+
+        def load_from(self, stream):
+            """Reads a floating point type from stream"""
+            self.load_in_place(_read_exactly(stream, float_type.value.size))
 
         def to_bytes(self):
             """Loads a floating point type using the struct module"""
-            return bytearray(struct.pack(self._format_string, self._value))
+            return bytearray(self._struct.pack(self._value))
+
+        def serialized_size(self):
+            """Returns the size of the floating point"""
+            return float_type.value.size
+
+        def write_into(self, buffer, offset=0):
+            """Writes a floating point type directly into buffer using the struct module"""
+            self._struct.pack_into(buffer, offset, self._value)
+            return offset + float_type.value.size
 
     return _SerialFloatingPoint
 
@@ -1,6 +1,8 @@
-from pyserialization.serializable import Serializable
+from pyserialization.serializable import Serializable, _read_exactly
 from pyserialization.serialint import SerialU32
+from pyserialization.serialstring import SerialAsciiString
 
+import hashlib
 import io
 
 from PIL import Image
@@ -10,7 +12,16 @@ from PIL import Image
 class SerialImage(Serializable):
     """
     A Saveable image type that can hold PIL images
+
+    The image is saved as its size as a U32 and then the image encoded using the PIL library, in its original format or
+    PNG if it has none.
+
+    If a subclass sets the class attribute __lazy__ to True, loading only keeps a copy of the encoded image. Its mode
+    and size can be read without decoding it, the pixels are decoded the first time get is called, and until then the
+    image is saved by copying the encoded image instead of encoding it again.
     """
+    __lazy__ = False
+
     def __init__(self, image=Image.new('RGB', (1, 1))):
         """
         Initializes the SerialImage with a given image or a null image
@@ -19,8 +30,11 @@ class SerialImage(Serializable):
 
     def get(self):
         """
-        Returns the image object
+        Returns the image object, decoding it first if it is still pending from a lazy load
         """
+        if self._pending is not None:
+            self._image = self._decode(self._pending)
+            self._pending = None
         return self._image
 
     def set(self, value):
@@ -30,21 +44,147 @@ class SerialImage(Serializable):
         if value is not None and not isinstance(value, Image.Image):
             raise ValueError('{} is not an image type'.format(value))
         self._image = value
+        self._pending = None
+        self._cache = None
+
+    @property
+    def mode(self):
+        """Returns the mode of the image without decoding its pixels"""
+        return self._header(self._pending)[0] if self._pending is not None else self._image.mode
+
+    @property
+    def size(self):
+        """Returns the width and height of the image without decoding its pixels"""
+        return self._header(self._pending)[1] if self._pending is not None else self._image.size
 
     def load_in_place(self, data, index=0):
         """Loads the image size as a U32 and then the data using the PIL library"""
         size, index = SerialU32.from_bytes(data, index)
         end_index = index + size.get()
-        image_data = data[index:end_index]
-        with io.BytesIO(image_data) as stream:
-            stream.seek(index)
-            self._image = Image.open(stream)
-            self._image.load()
+        if end_index > len(data):
+            raise ValueError('Data too short for an image of {} bytes'.format(size.get()))
+        with memoryview(data) as view:
+            self._load(view[index:end_index])
         return end_index
 
+    @classmethod
+    def skip(cls, data, index=0):
+        """Returns the index past the image by loading only its size"""
+        size, index = SerialU32.from_bytes(data, index)
+        return index + size.get()
+
+    def load_from(self, stream):
+        """Reads the image size as a U32 and then the image data from stream"""
+        size = SerialU32.read_from(stream)
+        self._load(_read_exactly(stream, size.get()))
+
+    def _load(self, image_data):
+        """Decodes the image, or keeps a copy of its encoded data if the class is lazy"""
+        if self.__lazy__:
+            self._image = None
+            self._pending = bytes(image_data)
+        else:
+            self._image = self._decode(image_data)
+            self._pending = None
+        self._cache = None
+
+    def _decode(self, image_data):
+        """Returns the image opened and loaded from its encoded data using the PIL library"""
+        with io.BytesIO(image_data) as stream:
+            image = Image.open(stream)
+            image.load()
+        return image
+
+    def _header(self, image_data):
+        """Returns the mode and size of an encoded image by only parsing its header using the PIL library"""
+        with io.BytesIO(image_data) as stream, Image.open(stream) as image:
+            return image.mode, image.size
+
     def to_bytes(self):
-        """Saves the image by saving its size as a U32 and then the data using the PIL library"""
-        stream = io.BytesIO()
-        self._image.save(stream, format=self._image.format if self._image.format is not None else 'PNG')
-        size = SerialU32(len(stream.getvalue()))
-        return size.to_bytes() + stream.getvalue()
+        """Saves the image by saving its size as a U32 and then the data using the PIL library, encoding it once"""
+        encoded = self._pending if self._pending is not None else self._encode()
+        data = bytearray(4 + len(encoded))
+        self._write_encoded(data, 0, encoded)
+        return data
+
+    def serialized_size(self):
+        """
+        Returns the size of the U32 length plus the encoded image
+
+        The image has to be encoded to know its size. The encoding is kept for write_into with a digest of the image
+        it was encoded from, so it is only used again while the image is unchanged.
+        """
+        return 4 + len(self._encoded())
+
+    def write_into(self, buffer, offset=0):
+        """Writes the size of the encoded image as a U32 and then the encoded image directly into buffer"""
+        offset = self._write_encoded(buffer, offset, self._encoded())
+        self._cache = None
+        return offset
+
+    def _encoded(self):
+        """
+        Returns the encoded image kept by a lazy load, or the image encoded using the PIL library
+
+        The encoding is kept with the mode, size, format, palette and a digest of the pixels of the image, and is
+        returned again while they are the same.
+        """
+        if self._pending is not None:
+            return self._pending
+        image = self._image
+        key = (image.mode, image.size, image.format, image.getpalette(), hashlib.blake2b(image.tobytes()).digest())
+        if self._cache is None or self._cache[0] != key:
+            self._cache = key, self._encode()
+        return self._cache[1]
+
+    @staticmethod
+    def _write_encoded(buffer, offset, encoded):
+        """Writes the size of an encoded image as a U32 and then the encoded image directly into buffer"""
+        offset = SerialU32(len(encoded)).write_into(buffer, offset)
+        end_index = offset + len(encoded)
+        buffer[offset:end_index] = encoded
+        return end_index
+
+    def _encode(self):
+        """Returns the image encoded using the PIL library"""
+        with io.BytesIO() as stream:
+            self._image.save(stream, format=self._image.format if self._image.format is not None else 'PNG')
+            return stream.getvalue()
+
+
+class SerialRawImage(SerialImage):
+    """
+    A Saveable image type that saves the pixels of PIL images without compressing them
+
+    The image is saved as its size as a U32 and then the mode as a string, the width and height as U32s and the pixel
+    data. Saving and loading only copy the pixels, which is much faster than encoding a compressed format. Images
+    with a palette are converted to RGBA first, since the palette is not saved. The pixels are copied again instead of
+    keeping them between serialized_size and write_into, since that is as fast as checking whether they changed.
+    """
+    def _encoded(self):
+        """Returns the encoded image kept by a lazy load, or the mode, size and pixel data of the image"""
+        return self._pending if self._pending is not None else self._encode()
+
+    def _decode(self, image_data):
+        """Returns the image created from its mode, size and pixel data"""
+        mode, size, index = self._load_header(image_data)
+        return Image.frombuffer(mode, size, bytes(image_data[index:]), 'raw', mode, 0, 1)
+
+    def _header(self, image_data):
+        """Returns the mode and size of the image"""
+        return self._load_header(image_data)[:2]
+
+    @staticmethod
+    def _load_header(image_data):
+        """Returns the mode and size of the image and the index of its pixel data"""
+        mode, index = SerialAsciiString.from_bytes(image_data)
+        width, index = SerialU32.from_bytes(image_data, index)
+        height, index = SerialU32.from_bytes(image_data, index)
+        return mode.get(), (width.get(), height.get()), index
+
+    def _encode(self):
+        """Returns the mode, size and pixel data of the image"""
+        image = self._image.convert('RGBA') if self._image.mode in ('P', 'PA') else self._image
+        header = SerialAsciiString(image.mode).to_bytes() + SerialU32(image.width).to_bytes() + \
+            SerialU32(image.height).to_bytes()
+        return b''.join((header, image.tobytes()))
@@ -1,5 +1,5 @@
 from pyserialization.endianness import Endianess
-from pyserialization.serializable import Serializable
+from pyserialization.serializable import Serializable, _read_exactly
 
 import struct
 import enum
@@ -61,7 +61,14 @@ def _create_int(int_type):
     class SerialInt(Serializable):
         """
         A Serializable int type that is converted with the python struct module
+
+        Instances only hold their value and a reference to one of the precompiled structs shared by the type, one per
+        endianness, so they have no __dict__.
         """
+        __slots__ = ('_value', '_struct')
+        __fixed_size__ = int_type.value.size
+        _struct_label = int_type.value.label
+        _structs = {endian: struct.Struct(endian.value + int_type.value.label) for endian in Endianess}
 
         def __init__(self, value=0, *, endian=Endianess.native):
             """
@@ -109,17 +116,38 @@ def _create_int(int_type):
             Args:
                 endian: The endianness to store and load the type. The default is the native byte order
             """
-            self._format_string = endian.value + int_type.value.label
+            self._struct = self._structs[endian]
+
+        def __getstate__(self):
+            """Returns the value and endianness to pickle, since the precompiled struct cannot be pickled"""
+            return self._value, Endianess(self._struct.format[0])
+
+        def __setstate__(self, state):
+            """Restores the value and endianness from a pickle"""
+            self._value, endian = state
+            self.set_endianness(endian)
 
         def load_in_place(self, data, index=0):
-            """Loads a SerialInt type using the struct module"""
-            end_index = index + int_type.value.size
-            self._value = struct.unpack(self._format_string, data[index:end_index])[0]
-            return end_index
+            """Loads a SerialInt type using the struct module without copying data"""
+            self._value = self._struct.unpack_from(data, index)[0]
+            return index + int_type.value.size
+
+        def load_from(self, stream):
+            """Reads a SerialInt type from stream"""
+            self.load_in_place(_read_exactly(stream, int_type.value.size))
 
         def to_bytes(self):
             """Loads a SerialInt type using the struct module"""
-            return bytearray(struct.pack(self._format_string, self._value))
+            return bytearray(self._struct.pack(self._value))
+
+        def serialized_size(self):
+            """Returns the size of the SerialInt"""
+            return int_type.value.size
+
+        def write_into(self, buffer, offset=0):
+            """Writes a SerialInt type directly into buffer using the struct module"""
+            self._struct.pack_into(buffer, offset, self._value)
+            return offset + int_type.value.size
 
     return SerialInt
 
@@ -132,3 +160,16 @@ SerialS8 = _create_int(_IntType.S8)
 SerialS16 = _create_int(_IntType.S16)
 SerialS32 = _create_int(_IntType.S32)
 SerialS64 = _create_int(_IntType.S64)
+
+
+def _tag_type(count):
+    """
+    Returns the smallest unsigned SerialInt type that can store an index into count values
+
+    Args:
+        count: The number of values that can be indexed
+    """
+    for Type, int_type in ((SerialU8, _IntType.U8), (SerialU16, _IntType.U16), (SerialU32, _IntType.U32)):
+        if count - 1 <= int_type.value.range[1]:
+            return Type
+    raise ValueError('Cannot index {} values'.format(count))
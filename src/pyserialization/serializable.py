@@ -1,4 +1,96 @@
 from abc import abstractmethod, ABCMeta
+import asyncio
+import inspect
+import os
+import sys
+import weakref
+
+
+_types_by_id = weakref.WeakValueDictionary()
+_type_hooks = []
+
+
+def _struct_type(Type):
+    """
+    Returns the class that defines the struct label of a fixed-width scalar type, or None if the type must be
+    serialized through its own methods.
+
+    A type is only considered fixed-width if it still loads and saves itself with the methods of the class that
+    declared the struct label, so subclasses that override the conversion keep their custom behaviour.
+
+    Args:
+        Type: Any Serializable type
+    """
+    for base in Type.__mro__:
+        if '_struct_label' in base.__dict__:
+            if all(getattr(Type, name) is getattr(base, name) for name in ('load_in_place', 'to_bytes', 'write_into')):
+                return base
+            return None
+    return None
+
+
+def _byte_order(Type):
+    """
+    Returns the struct byte order character a new object of a fixed-width scalar type is saved with
+
+    Types whose objects are created with a little or big Endianess, such as subclasses passing endian to __init__,
+    give '<' or '>'. Every other type, including chars, gives '=' for native byte order. The characters are also valid
+    numpy.dtype byte orders.
+
+    Args:
+        Type: A Serializable type for which _struct_type does not return None
+    """
+    order = Type()._struct.format[0]
+    return {'<': '<', '>': '>', '!': '>'}.get(order, '=')
+
+
+def _byte_swapped(Type):
+    """
+    Returns True if a new object of a fixed-width scalar type is saved in the opposite of native byte order
+
+    Args:
+        Type: A Serializable type for which _struct_type does not return None
+    """
+    return _byte_order(Type) == ('>' if sys.byteorder == 'little' else '<')
+
+
+def _read_exactly(stream, size):
+    """
+    Reads exactly size bytes from a binary stream, raising an EOFError if the stream ends first
+
+    Args:
+        stream: Any readable binary file-like object, such as a file, io.BufferedReader or socket.makefile('rb')
+        size: The number of bytes to read
+    """
+    data = stream.read(size)
+    if data is not None and len(data) == size:
+        return data
+    data = bytearray(data or b'')
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise EOFError('Stream ended after {} of {} bytes'.format(len(data), size))
+        data += chunk
+    return data
+
+
+class _ThreadedReader:
+    """
+    A blocking binary stream, used from a worker thread, that reads exactly the requested bytes from an
+    asyncio.StreamReader running on an event loop in another thread
+    """
+    def __init__(self, reader, loop):
+        """
+        Args:
+            reader: The asyncio.StreamReader to read from
+            loop:   The event loop the reader belongs to
+        """
+        self.reader = reader
+        self.loop = loop
+
+    def read(self, size):
+        """Waits for exactly size bytes from the reader, raising an EOFError if it ends first"""
+        return asyncio.run_coroutine_threadsafe(self.reader.readexactly(size), self.loop).result()
 
 
 class Serializable(metaclass=ABCMeta):
@@ -8,13 +100,40 @@ class Serializable(metaclass=ABCMeta):
     Each type must define it's own to_bytes and from_bytes methods. As each type clearly defines how it is stored,
     in contrast to storing data with pickle, the data should be compact, easily loadable, and easily interpreted from
     other programming languages.
+
+    Types whose bytearray representation always has the same size set the class attribute __fixed_size__ to that size.
+
+    Serializable defines no instance attributes itself, so subclasses that declare __slots__ carry no __dict__.
     """
+    __slots__ = ()
+    __fixed_size__ = None
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Records every Serializable type by its id, so types created inside functions can be found again
+
+        Methods generated by codegen.compile for a base class are replaced by the ones the base had before it was
+        compiled, since the subclass may add attributes the generated code does not know about. Each function in
+        _type_hooks is then called with the new type.
+        """
+        super().__init_subclass__(**kwargs)
+        _types_by_id[id(cls)] = cls
+        for base in cls.__mro__[1:]:
+            for name, (method, original) in base.__dict__.get('__compiled__', {}).items():
+                inherited = inspect.getattr_static(cls, name)
+                if getattr(inherited, '__wrapped__', inherited) is method:
+                    type.__setattr__(cls, name, original)
+        for hook in _type_hooks:
+            hook(cls)
 
     @classmethod
     def from_bytes(cls, data, index=0, **kwargs):
         """
         Returns a new Serializable object from a bytearray
 
+        Any object supporting the buffer protocol can be loaded from, such as bytes, bytearray, memoryview or mmap.
+        Types read directly from the buffer instead of slicing it, so large buffers are not copied.
+
         Args:
             byte_array: The bytearray representing the object
             index:      The index in the bytearray where the data starts
@@ -23,11 +142,140 @@ class Serializable(metaclass=ABCMeta):
         index = obj.load_in_place(data, index)
         return obj, index
 
+    @classmethod
+    def skip(cls, data, index=0):
+        """
+        Returns the index just past the bytearray representation of an object of this type starting at index
+
+        Types should override this to find the end of their data without decoding it.
+
+        Args:
+            data:  The bytearray containing the object
+            index: The index in the bytearray where the data starts
+        """
+        if cls.__fixed_size__ is not None:
+            return index + cls.__fixed_size__
+        return cls.from_bytes(data, index)[1]
+
+    @classmethod
+    def read_from(cls, stream, **kwargs):
+        """
+        Returns a new Serializable object read from a binary stream
+
+        Only the bytes making up the object are read, so a stream of concatenated objects can be decoded one at a time.
+
+        Args:
+            stream: Any readable binary file-like object, such as a file, io.BufferedReader or socket.makefile('rb')
+        """
+        obj = cls(**kwargs)
+        obj.load_from(stream)
+        return obj
+
+    def load_from(self, stream):
+        """
+        Takes an existing Serializable and updates it by reading exactly its bytearray representation from a stream
+
+        Types with a fixed size read exactly that many bytes. Other types are loaded from the rest of a seekable stream,
+        which is then moved to just past the object, and a ValueError is raised if the stream cannot seek. Types should
+        override this to read only their own bytes from any stream.
+
+        Args:
+            stream: Any readable binary file-like object, such as a file, io.BufferedReader or socket.makefile('rb')
+        """
+        if self.__fixed_size__ is not None:
+            self.load_in_place(_read_exactly(stream, self.__fixed_size__))
+            return
+        seekable = getattr(stream, 'seekable', None)
+        if seekable is None or not seekable():
+            raise ValueError("'{}' can only be read from a seekable stream".format(type(self)))
+        start = stream.tell()
+        data = stream.read()
+        stream.seek(start + self.load_in_place(data))
+
+    @classmethod
+    async def read_async(cls, reader, **kwargs):
+        """
+        Returns a new Serializable object read from an asyncio.StreamReader
+
+        Only the bytes making up the object are read, so a stream of concatenated objects can be decoded one at a time.
+
+        Args:
+            reader: The asyncio.StreamReader to read from
+        """
+        obj = cls(**kwargs)
+        await obj.load_async(reader)
+        return obj
+
+    async def load_async(self, reader):
+        """
+        Takes an existing Serializable and updates it by reading exactly its bytearray representation from an
+        asyncio.StreamReader
+
+        Types with a fixed size read all of their bytes at once. Otherwise load_from is run in a worker thread that
+        reads from the reader as the event loop receives data, so the event loop is never blocked. Types should override
+        this to read their data directly.
+
+        Args:
+            reader: The asyncio.StreamReader to read from
+        """
+        if self.__fixed_size__ is not None:
+            self.load_in_place(await reader.readexactly(self.__fixed_size__))
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.load_from, _ThreadedReader(reader, loop))
+
     @abstractmethod
     def to_bytes(self):
         """Return a bytearray representation of the Serializable"""
         return bytes()
 
+    def serialized_size(self):
+        """
+        Returns the number of bytes in the bytearray representation of the Serializable
+
+        Types should override this when the size can be known without serializing.
+        """
+        return len(self.to_bytes())
+
+    def write_into(self, buffer, offset=0):
+        """
+        Writes the bytearray representation of the Serializable into an existing buffer and returns the index just
+        past the written data
+
+        Types should override this to write directly into the buffer.
+
+        Args:
+            buffer: A writable buffer such as a bytearray, memoryview or mmap with at least serialized_size() bytes
+                    after offset
+            offset: The index in the buffer where the data starts
+        """
+        data = self.to_bytes()
+        end_index = offset + len(data)
+        buffer[offset:end_index] = data
+        return end_index
+
+    def write_to(self, stream):
+        """
+        Writes the bytearray representation of the Serializable to a binary stream
+
+        Types should override this to write their data in pieces instead of creating the whole bytearray first.
+
+        Args:
+            stream: Any writable binary file-like object, such as a file, io.BytesIO or socket.makefile('wb')
+        """
+        stream.write(self.to_bytes())
+
+    async def write_async(self, writer):
+        """
+        Writes the bytearray representation of the Serializable to an asyncio.StreamWriter and waits until the
+        writer's buffer has drained enough to accept more data
+
+        Args:
+            writer: The asyncio.StreamWriter to write to
+        """
+        self.write_to(writer)
+        await writer.drain()
+
     @abstractmethod
     def load_in_place(self, data, index=0):
         """
@@ -44,3 +292,8 @@ class Serializable(metaclass=ABCMeta):
         new = type(self)()
         new.load_in_place(self.to_bytes())
         return new
+
+
+if os.environ.get('PYSERIALIZATION_PROFILE'):
+    from pyserialization.profiling import _profile_process
+    _profile_process()
@@ -1,21 +1,107 @@
-from pyserialization.serializable import Serializable
+from pyserialization.parallel import _encode_shard, _map_forked, _shards
+from pyserialization.serializable import Serializable, _byte_order, _byte_swapped, _read_exactly, _struct_type
 from pyserialization.serialint import SerialU32
+from pyserialization.serialvarint import _SerialVarInt, _read_varuints, _write_varuints, _unzigzag, _zigzag
 
+import array
+import struct
 
-def serial_list(list_type):
+
+def _array_typecode(label):
+    """
+    Returns the array module typecode storing the same values as a struct label, or None if there is none.
+
+    Args:
+        label: The struct label of a fixed-width int or floating point type
+    """
+    if label in 'fd':
+        return label
+    if label in 'bhilqBHILQ':
+        size = struct.calcsize('=' + label)
+        for typecode in ('bhilq' if label.islower() else 'BHILQ'):
+            if array.array(typecode).itemsize == size:
+                return typecode
+    return None
+
+
+def _length_unpacker(length_type):
+    """
+    Returns a function loading the number of objects of a list from data at index and returning it and the index past it
+
+    Fixed-width int lengths are unpacked directly instead of through a length_type object.
+
+    Args:
+        length_type: The Serializable int type the number of objects is saved as
+    """
+    struct_type = _struct_type(length_type)
+    if struct_type is None or getattr(struct_type, '_unpack_value', None) is not None:
+        def unpack_length(data, index):
+            size, index = length_type.from_bytes(data, index)
+            return size.get(), index
+        return unpack_length
+    unpack_from = struct.Struct(_byte_order(length_type) + struct_type._struct_label).unpack_from
+    size = struct_type.__fixed_size__
+
+    def unpack_length(data, index):
+        return unpack_from(data, index)[0], index + size
+    return unpack_length
+
+
+def serial_list(list_type, *, compact=False, length_type=SerialU32, reuse=False):
     """
     Returns a homogeneous Serializable list type of type list_type
 
     Arss:
         list_type: The Serializable type to store in the array
+        compact: If True, returns a list type backed by an array.array that stores the plain values of a fixed-width
+                 int or floating point list_type instead of list_type objects. The bytes produced are the same.
+                 SerialVarUInt and SerialVarSInt values are also stored in an array.array and are encoded and decoded
+                 all at once.
+        length_type: The Serializable int type the number of objects is saved as, such as SerialVarUInt to save short
+                     lists in fewer bytes
+        reuse: If True, load_in_place loads into the list_type objects already in the list instead of replacing them,
+               only creating or removing objects when the number of them changes. Objects taken from the list before
+               it is loaded again are changed by the load. Compact lists do not hold objects, so this does not apply
+               to them.
     """
+    if compact:
+        return _create_compact_list(list_type, length_type)
+    unpack_length = _length_unpacker(length_type)
 
     class SerialList(list, Serializable):
         """A list type that can store homogeneous Serializable types."""
+        __listtype__ = list_type
+        __lengthtype__ = length_type
+        __reuse__ = reuse
         array_type = property(lambda self: self._array_type)
 
-        def __init__(self, values=[]):
-            self.set(values)
+        def __init__(self, values=(), trusted=False):
+            """
+            Initializes the list with an iterable of values
+
+            Args:
+                values:  The list_type objects, or values that can be converted to them
+                trusted: If True, values must already be list_type objects and are added without being validated
+            """
+            if trusted:
+                list.extend(self, values)
+            else:
+                self.set(values)
+
+        @classmethod
+        def from_values_unchecked(cls, values):
+            """
+            Returns a new SerialList holding the list_type objects of an iterable without validating them
+
+            This is for objects that are known to be list_type objects, such as ones that were just loaded, and skips
+            the check of each item.
+
+            Args:
+                values: The list_type objects
+            """
+            obj = cls()
+            list.extend(obj, values)
+            return obj
 
         @staticmethod
         def _validate(value):
@@ -51,34 +137,401 @@ def serial_list(list_type):
             """
             list.insert(self, ind, self._validate(value))
 
+        @staticmethod
+        def _convert(values):
+            """
+            Returns a list of the values of an iterable, each validated and converted to a list_type object once
+
+            Args:
+                values: The list_type objects, or values that can be converted to them
+            """
+            validate = SerialList._validate
+            return [value if type(value) is list_type else validate(value) for value in values]
+
+        def __setitem__(self, index, value):
+            """
+            Replaces the list_type object at an index, or the objects in a slice with those of an iterable
+
+            Args:
+                index: An int or slice
+                value: The list_type object, or an iterable of them for a slice
+            """
+            if isinstance(index, slice):
+                list.__setitem__(self, index, self._convert(value))
+            else:
+                list.__setitem__(self, index, self._validate(value))
+
+        def __iadd__(self, values):
+            self.extend(values)
+            return self
+
+        def extend(self, values):
+            """
+            Adds the list_type objects of an iterable to the end of the list
+
+            Args:
+                values: The list_type objects, or values that can be converted to them
+            """
+            list.extend(self, self._convert(values))
+
         def set(self, values):
             """
             Sets the items of the SerialList to be equal to the list_type objects in an iterable
 
+            Every value is validated before the list is changed, so the list is left as it was if one is invalid.
+
             Args:
-                values: The list_type objects
+                values: The list_type objects, or values that can be converted to them
             """
-            for value in values:
-                self._validate(value)
-            self.clear()
-            for value in values:
-                self.append(value)
+            list.__setitem__(self, slice(None), self._convert(values))
 
         def load_in_place(self, data, index=0):
-            """Loads a SerialList by loading the number of objects as a U32 and then loading that many list_types"""
-            self.clear()
-            size, index = SerialU32.from_bytes(data, index)
-            for _ in range(size.get()):
+            """
+            Loads a SerialList by loading the number of objects and then loading that many list_types
+
+            If the list type reuses its objects, the list_type objects already in the list are loaded in place and
+            only the objects past the old end of the list are created, so loading data of the same shape again
+            creates no new objects.
+            """
+            size, index = unpack_length(data, index)
+            if not reuse:
+                list.clear(self)
+            elif size < len(self):
+                del self[size:]
+            for position, obj in enumerate(self):
+                if type(obj) is list_type:
+                    index = obj.load_in_place(data, index)
+                else:
+                    obj, index = list_type.from_bytes(data, index)
+                    list.__setitem__(self, position, obj)
+            for _ in range(size - len(self)):
                 obj, index = list_type.from_bytes(data, index)
                 list.append(self, obj)
             return index
 
-        def to_bytes(self):
-            """Saves a SerialList by saving the number of objects as a U32 and then saving that many list_types"""
-            size = SerialU32(len(self))
-            data = size.to_bytes()
-            for val in self:
-                data += val.to_bytes()
+        @classmethod
+        def skip(cls, data, index=0):
+            """Returns the index past the list, only loading the list_types if they do not have a fixed size"""
+            size, index = unpack_length(data, index)
+            if list_type.__fixed_size__ is not None:
+                return index + size * list_type.__fixed_size__
+            for _ in range(size):
+                index = list_type.skip(data, index)
+            return index
+
+        def load_from(self, stream):
+            """Reads the number of objects and then reads that many list_types from stream"""
+            self.clear()
+            size = length_type.read_from(stream)
+            for _ in range(size.get()):
+                list.append(self, list_type.read_from(stream))
+
+        async def load_async(self, reader):
+            """Reads the number of objects and then reads that many list_types from an asyncio.StreamReader"""
+            self.clear()
+            size = await length_type.read_async(reader)
+            for _ in range(size.get()):
+                list.append(self, await list_type.read_async(reader))
+
+        def to_bytes(self, workers=None):
+            """
+            Saves a SerialList by saving the number of objects and then saving that many list_types
+
+            If workers is more than 1, shards of the list are saved at once by that many forked worker processes, which
+            share the list without it being copied. Starting the workers and sending back their bytes takes time, so
+            this only pays off for very large lists of composites that are slow to save and a machine with that many
+            free cores. On platforms that cannot fork, the list is saved in this process.
+
+            There is no parallel from_bytes. Objects loaded by workers would have to be pickled back and created again
+            in this process, which takes longer than loading them here in the first place, so lists are always loaded
+            in this process.
+
+            Args:
+                workers: The number of worker processes, or None to save the list in this process
+            """
+            if workers is not None and workers > 1 and len(self) > 1:
+                shards = _map_forked(_encode_shard, self, _shards(len(self), workers), workers)
+                if shards is not None:
+                    data = bytearray(length_type(len(self)).to_bytes())
+                    for shard in shards:
+                        data += shard
+                    return data
+            data = bytearray(self.serialized_size())
+            self.write_into(data)
             return data
 
+        def serialized_size(self):
+            """Returns the size of the length plus the size of every list_type"""
+            if list_type.__fixed_size__ is not None:
+                return length_type(len(self)).serialized_size() + len(self) * list_type.__fixed_size__
+            return length_type(len(self)).serialized_size() + sum(val.serialized_size() for val in self)
+
+        def write_into(self, buffer, offset=0):
+            """Writes the number of objects and then each list_type directly into buffer"""
+            offset = length_type(len(self)).write_into(buffer, offset)
+            for val in self:
+                offset = val.write_into(buffer, offset)
+            return offset
+
+        def write_to(self, stream):
+            """Writes the number of objects and then each list_type to stream"""
+            length_type(len(self)).write_to(stream)
+            for val in self:
+                val.write_to(stream)
+
     return SerialList
+
+
+def _create_compact_list(list_type, length_type):
+    """
+    Returns a homogeneous Serializable list type backed by an array.array
+
+    Args:
+        list_type:   The fixed-width int, floating point or varint Serializable type whose values are stored
+        length_type: The Serializable int type the number of values is saved as
+    """
+    struct_type = _struct_type(list_type)
+    typecode = None
+    swap = False
+    if issubclass(list_type, _SerialVarInt):
+        typecode = _array_typecode('q' if list_type._range[0] < 0 else 'Q')
+    elif struct_type is not None and getattr(struct_type, '_unpack_value', None) is None:
+        typecode = _array_typecode(struct_type._struct_label)
+        swap = _byte_swapped(list_type)
+    if typecode is None:
+        raise ValueError("'{}' cannot be stored in a compact list".format(list_type))
+    itemsize = array.array(typecode).itemsize
+    unpack_length = _length_unpacker(length_type)
+
+    class SerialArray(array.array, Serializable):
+        """
+        A list type that stores the values of fixed-width list_type objects in an array.array.
+
+        Items are the plain int or float values rather than list_type objects, which avoids creating an object per
+        element. Loading and saving copies the whole array with one call, byte swapping it when list_type uses the
+        other byte order.
+        """
+        __slots__ = ()
+        array_type = property(lambda self: list_type)
+
+        def __new__(cls, values=()):
+            return array.array.__new__(cls, typecode)
+
+        def __init__(self, values=()):
+            self.set(values)
+
+        @staticmethod
+        def _convert(values):
+            """
+            Returns an array of the values, which may be numbers or list_type objects
+
+            Args:
+                values: An iterable of the values to convert
+            """
+            if not isinstance(values, (list, tuple, array.array)):
+                values = list(values)
+            try:
+                try:
+                    return array.array(typecode, values)
+                except TypeError:
+                    return array.array(typecode, [value.get() if isinstance(value, list_type) else value
+                                                  for value in values])
+            except (TypeError, OverflowError) as ex:
+                raise ValueError("'{}' cannot be stored as '{}'".format(values, list_type)) from ex
+
+        def append(self, value):
+            """
+            Adds a value to the list
+
+            Args:
+                value: A number or list_type object
+            """
+            array.array.extend(self, self._convert((value,)))
+
+        def insert(self, ind, value):
+            """
+            Inserts a value into the list
+
+            Args:
+                ind: The index to insert at
+                value: A number or list_type object
+            """
+            array.array.insert(self, ind, self._convert((value,))[0])
+
+        def __setitem__(self, index, value):
+            """
+            Replaces the value at an index, or the values in a slice with those of an iterable
+
+            Args:
+                index: An int or slice
+                value: A number or list_type object, or an iterable of them for a slice
+            """
+            if isinstance(index, slice):
+                array.array.__setitem__(self, index, self._convert(value))
+            else:
+                array.array.__setitem__(self, index, self._convert((value,))[0])
+
+        def extend(self, values):
+            """
+            Adds the values of an iterable to the list
+
+            Args:
+                values: The numbers or list_type objects
+            """
+            array.array.extend(self, self._convert(values))
+
+        def set(self, values):
+            """
+            Sets the items of the list to be equal to the values in an iterable
+
+            Args:
+                values: The numbers or list_type objects
+            """
+            array.array.__setitem__(self, slice(None), self._convert(values))
+
+        def load_in_place(self, data, index=0):
+            """Loads the number of values and then all of the values with a single copy"""
+            size, index = unpack_length(data, index)
+            end_index = index + size * self.itemsize
+            if end_index > len(data):
+                raise ValueError('Data too short for {} values of {}'.format(size, list_type))
+            del self[:]
+            with memoryview(data) as view:
+                self.frombytes(view[index:end_index])
+            if swap:
+                self.byteswap()
+            return end_index
+
+        @classmethod
+        def skip(cls, data, index=0):
+            """Returns the index past the list by loading only the number of values"""
+            size, index = unpack_length(data, index)
+            return index + size * itemsize
+
+        def load_from(self, stream):
+            """Reads the number of values and then all of the values from stream"""
+            size = length_type.read_from(stream)
+            data = _read_exactly(stream, size.get() * self.itemsize)
+            del self[:]
+            self.frombytes(data)
+            if swap:
+                self.byteswap()
+
+        async def load_async(self, reader):
+            """Reads the number of values and then all of the values from an asyncio.StreamReader"""
+            size = await length_type.read_async(reader)
+            data = await reader.readexactly(size.get() * self.itemsize)
+            del self[:]
+            self.frombytes(data)
+            if swap:
+                self.byteswap()
+
+        def to_bytes(self):
+            """Saves the number of values and then all of the values with a single copy"""
+            data = bytearray(self.serialized_size())
+            self.write_into(data)
+            return data
+
+        def serialized_size(self):
+            """Returns the size of the length plus the size of the values"""
+            return length_type(len(self)).serialized_size() + len(self) * self.itemsize
+
+        def write_into(self, buffer, offset=0):
+            """Writes the number of values and then copies all of the values directly into buffer"""
+            offset = length_type(len(self)).write_into(buffer, offset)
+            end_index = offset + len(self) * self.itemsize
+            with memoryview(self._saved()) as view:
+                buffer[offset:end_index] = view.cast('B')
+            return end_index
+
+        def write_to(self, stream):
+            """Writes the number of values and then all of the values to stream with a single write"""
+            length_type(len(self)).write_to(stream)
+            stream.write(self._saved().tobytes())
+
+        def _saved(self):
+            """Returns the values in the byte order they are saved in, which is the list itself in native order"""
+            if not swap:
+                return self
+            values = array.array(typecode, self)
+            values.byteswap()
+            return values
+
+    if issubclass(list_type, _SerialVarInt):
+        return _create_varint_list(SerialArray, list_type, length_type)
+    return SerialArray
+
+
+def _create_varint_list(array_type, list_type, length_type):
+    """
+    Returns a compact list type that saves its values as varints
+
+    Args:
+        array_type:  The compact list type storing the values of list_type in an array.array
+        list_type:   SerialVarUInt, SerialVarSInt or a subclass of either
+        length_type: The Serializable int type the number of values is saved as
+    """
+    signed = list_type._range[0] < 0
+    unpack_length = _length_unpacker(length_type)
+
+    class SerialVarIntArray(array_type):
+        """
+        A compact list type that saves each value as a varint
+
+        Every value is encoded into, or decoded from, a single bytes object in one pass without creating a list_type
+        object per element. Values below 128 are converted all at once.
+        """
+        __slots__ = ()
+
+        def _encoded(self):
+            """Returns the varint encodings of every value"""
+            if signed:
+                return _write_varuints([_zigzag(value) for value in self])
+            return _write_varuints(self)
+
+        def load_in_place(self, data, index=0):
+            """Loads the number of values and then decodes all of the varints"""
+            size, index = unpack_length(data, index)
+            values, index = _read_varuints(data, index, size)
+            if signed:
+                values = [_unzigzag(value) for value in values]
+            self.set(values)
+            return index
+
+        @classmethod
+        def skip(cls, data, index=0):
+            """Returns the index past the list by decoding the varints"""
+            size, index = unpack_length(data, index)
+            return _read_varuints(data, index, size)[1]
+
+        def load_from(self, stream):
+            """Reads the number of values and then each varint from stream"""
+            size = length_type.read_from(stream)
+            self.set([list_type.read_from(stream).get() for _ in range(size.get())])
+
+        async def load_async(self, reader):
+            """Reads the number of values and then each varint from an asyncio.StreamReader"""
+            size = await length_type.read_async(reader)
+            values = []
+            for _ in range(size.get()):
+                values.append((await list_type.read_async(reader)).get())
+            self.set(values)
+
+        def serialized_size(self):
+            """Returns the size of the length plus the size of every varint"""
+            return length_type(len(self)).serialized_size() + len(self._encoded())
+
+        def write_into(self, buffer, offset=0):
+            """Writes the number of values and then the encoded varints directly into buffer"""
+            offset = length_type(len(self)).write_into(buffer, offset)
+            encoded = self._encoded()
+            end_index = offset + len(encoded)
+            buffer[offset:end_index] = encoded
+            return end_index
+
+        def write_to(self, stream):
+            """Writes the number of values and then the encoded varints to stream with a single write"""
+            length_type(len(self)).write_to(stream)
+            stream.write(self._encoded())
+
+    return SerialVarIntArray
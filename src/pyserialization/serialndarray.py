@@ -1,10 +1,14 @@
-from pyserialization.serializable import Serializable
-from pyserialization.serialint import SerialU32
+from pyserialization.compression import compress, decompress, _codec, _codec_from_tag
+from pyserialization.serializable import Serializable, _read_exactly
+from pyserialization.serialint import SerialU8, SerialU32, SerialU64, SerialS64
 from pyserialization.seriallist import serial_list
 from pyserialization.serialstring import SerialAsciiString
+from pyserialization.serialvarint import SerialVarUInt
 
+from concurrent.futures import ThreadPoolExecutor
 from operator import mul
 import functools
+import hashlib
 import numpy as np
 
 
@@ -13,10 +17,33 @@ class _IntList(serial_list(SerialU32)):
     pass
 
 
+_VarIntList = serial_list(SerialVarUInt, length_type=SerialVarUInt)
+_ShapeList = serial_list(SerialU64, compact=True)
+_StridesList = serial_list(SerialS64, compact=True)
+
+_ALIGNMENT = 64
+
+
+def _bytes_of(array):
+    """
+    Returns a flat uint8 ndarray sharing the memory of a C-contiguous ndarray
+
+    memoryview cannot export some data types, such as datetime64 and timedelta64, so their bytes are exported through
+    a uint8 view instead.
+
+    Args:
+        array: A C-contiguous ndarray
+    """
+    return array.reshape(-1).view(np.uint8)
+
+
 class SerialNdArray(Serializable):
     """
     Type for serializing a numpy.ndarray
     """
+    _length_type = SerialU32
+    _shape_type = _IntList
+
     def __init__(self, value=None):
         """
         Initializes the array with an empty ndarray or an existing ndarray
@@ -54,13 +81,30 @@ class SerialNdArray(Serializable):
         data in the ndarray, and then a list of U32s giving the shape of the array.
         """
         data_type, index = SerialAsciiString.from_bytes(data, index)
-        array_size, index = SerialU32.from_bytes(data, index)
+        array_size, index = self._length_type.from_bytes(data, index)
         self._array = np.frombuffer(data, data_type.get(), array_size.get(), index)
         index += self._array.nbytes
-        size_array, index = _IntList.from_bytes(data, index)
+        size_array, index = self._shape_type.from_bytes(data, index)
         self._array = np.reshape(self._array, [value.get() for value in size_array])
         return index
 
+    @classmethod
+    def skip(cls, data, index=0):
+        """Returns the index past the ndarray by loading only its data type and number of elements"""
+        data_type, index = SerialAsciiString.from_bytes(data, index)
+        array_size, index = cls._length_type.from_bytes(data, index)
+        index += array_size.get() * np.dtype(data_type.get()).itemsize
+        return cls._shape_type.skip(data, index)
+
+    def load_from(self, stream):
+        """Reads the data type, number of elements, data and shape of the ndarray from stream"""
+        data_type = SerialAsciiString.read_from(stream)
+        array_size = self._length_type.read_from(stream)
+        dtype = np.dtype(data_type.get())
+        data = bytearray(_read_exactly(stream, array_size.get() * dtype.itemsize))
+        size_array = self._shape_type.read_from(stream)
+        self._array = np.reshape(np.frombuffer(data, dtype), [value.get() for value in size_array])
+
     def to_bytes(self):
         """
         Serializes the ndarray
@@ -68,11 +112,406 @@ class SerialNdArray(Serializable):
         Type is serialized by first saving the data type as a string, the number of elements in the flattened array, the
         data in the ndarray, and then a list of U32s giving the shape of the array.
         """
-        data = SerialAsciiString(str(self._array.dtype)).to_bytes()
-        data += SerialU32(functools.reduce(mul, self._array.shape, 1)).to_bytes()
-        data += self._array.tobytes()
-        size_array = _IntList()
-        for value in self._array.shape:
-            size_array.append(value)
-        data += size_array.to_bytes()
+        data = bytearray(self.serialized_size())
+        self.write_into(data)
         return data
+
+    def serialized_size(self):
+        """Returns the size of the data type string, element count, data and shape list"""
+        return (SerialAsciiString(str(self._array.dtype)).serialized_size() +
+                self._length_type(self._array.size).serialized_size() + self._array.nbytes +
+                self._shape_type(self._array.shape).serialized_size())
+
+    def write_into(self, buffer, offset=0):
+        """Writes the ndarray directly into buffer, copying its data only if it is not C-contiguous"""
+        offset = SerialAsciiString(str(self._array.dtype)).write_into(buffer, offset)
+        offset = self._length_type(functools.reduce(mul, self._array.shape, 1)).write_into(buffer, offset)
+        end_index = offset + self._array.nbytes
+        with memoryview(_bytes_of(np.ascontiguousarray(self._array))) as view:
+            buffer[offset:end_index] = view
+        return self._shape_type(self._array.shape).write_into(buffer, end_index)
+
+
+class SerialVarNdArray(SerialNdArray):
+    """
+    Type for serializing a numpy.ndarray with its number of elements, number of dimensions and shape saved as varints
+
+    Small arrays take up to 10 fewer bytes than with SerialNdArray, which saves each of them as a U32.
+    """
+    _length_type = SerialVarUInt
+    _shape_type = _VarIntList
+
+
+class SerialAlignedNdArray(SerialNdArray):
+    """
+    Type for serializing a numpy.ndarray with its description first and its data aligned, so it can be loaded without
+    copying
+
+    Type is serialized by first saving the data type string including its byte order, a compact list of U64s giving
+    the shape and a compact list of S64s giving the strides of the saved data. Then a U8 gives the number of zero bytes
+    that follow to place the data on a 64 byte boundary of the buffer, then the data and then zero bytes to make the
+    padding add up to 63 bytes, so the size never depends on where the array is written.
+
+    C-contiguous and Fortran-contiguous arrays are written straight from their own memory, and other arrays are copied
+    into C order first. When written to a stream, the padding is worked out from the position given by its tell, and
+    streams without one, such as sockets, are padded as if the array started on a 64 byte boundary. Loading returns an
+    ndarray that is a view of the loaded data, such as a bytes object or an mmap, so the data must outlive the array and
+    a bytearray cannot be resized while the array exists.
+    """
+    def _contiguous(self):
+        """Returns the stored ndarray if it is C-contiguous or Fortran-contiguous, otherwise a C-contiguous copy"""
+        if self._array.flags.c_contiguous or self._array.flags.f_contiguous:
+            return self._array
+        return np.ascontiguousarray(self._array)
+
+    @staticmethod
+    def _header(array):
+        """
+        Returns the data type string, shape list and strides list describing the saved data of an ndarray
+
+        Args:
+            array: A C-contiguous or Fortran-contiguous ndarray
+        """
+        return SerialAsciiString(array.dtype.str), _ShapeList(array.shape), _StridesList(array.strides)
+
+    @staticmethod
+    def _load_header(data, index):
+        """
+        Returns the data type, shape and strides of the saved data, the number of zero bytes before the data, and the
+        index of the first zero byte
+
+        Args:
+            data:  The bytearray containing the array
+            index: The index in the bytearray where the data starts
+        """
+        data_type, index = SerialAsciiString.from_bytes(data, index)
+        shape, index = _ShapeList.from_bytes(data, index)
+        strides, index = _StridesList.from_bytes(data, index)
+        padding, index = SerialU8.from_bytes(data, index)
+        if padding.get() >= _ALIGNMENT:
+            raise ValueError('Padding of {} bytes is not less than the alignment'.format(padding.get()))
+        return np.dtype(data_type.get()), tuple(shape), tuple(strides), padding.get(), index
+
+    def load_in_place(self, data, index=0):
+        """Loads the description of the ndarray and then creates an ndarray viewing the data without copying it"""
+        dtype, shape, strides, padding, index = self._load_header(data, index)
+        index += padding
+        nbytes = functools.reduce(mul, shape, 1) * dtype.itemsize
+        end_index = index + nbytes + _ALIGNMENT - 1 - padding
+        if end_index > len(data):
+            raise ValueError('Data too short for an array of {} bytes'.format(nbytes))
+        self._array = np.ndarray(shape, dtype, data, index, strides)
+        return end_index
+
+    @classmethod
+    def skip(cls, data, index=0):
+        """Returns the index past the ndarray by loading only its description"""
+        dtype, shape, strides, padding, index = cls._load_header(data, index)
+        return index + functools.reduce(mul, shape, 1) * dtype.itemsize + _ALIGNMENT - 1
+
+    def load_from(self, stream):
+        """Reads the description, padding and data of the ndarray from stream into a new buffer"""
+        data_type = SerialAsciiString.read_from(stream)
+        shape = _ShapeList.read_from(stream)
+        strides = _StridesList.read_from(stream)
+        padding = SerialU8.read_from(stream)
+        if padding.get() >= _ALIGNMENT:
+            raise ValueError('Padding of {} bytes is not less than the alignment'.format(padding.get()))
+        dtype = np.dtype(data_type.get())
+        nbytes = functools.reduce(mul, shape, 1) * dtype.itemsize
+        _read_exactly(stream, padding.get())
+        data = bytearray(_read_exactly(stream, nbytes))
+        _read_exactly(stream, _ALIGNMENT - 1 - padding.get())
+        self._array = np.ndarray(tuple(shape), dtype, data, 0, tuple(strides))
+
+    def serialized_size(self):
+        """Returns the size of the description, the padding byte, the 63 bytes of padding and the data"""
+        return sum(value.serialized_size() for value in self._header(self._contiguous())) + _ALIGNMENT + \
+            self._array.nbytes
+
+    def write_into(self, buffer, offset=0):
+        """Writes the ndarray directly into buffer, copying its data only if it is not C or Fortran-contiguous"""
+        array = self._contiguous()
+        if array.dtype.hasobject:
+            raise ValueError('Arrays of Python objects cannot be serialized')
+        for value in self._header(array):
+            offset = value.write_into(buffer, offset)
+        padding = -(offset + 1) % _ALIGNMENT
+        offset = SerialU8(padding).write_into(buffer, offset)
+        buffer[offset:offset + padding] = bytes(padding)
+        offset += padding
+        end_index = offset + array.nbytes
+        if array.nbytes:
+            with memoryview(_bytes_of(array if array.flags.c_contiguous else array.T)) as view:
+                buffer[offset:end_index] = view
+        trailing = _ALIGNMENT - 1 - padding
+        buffer[end_index:end_index + trailing] = bytes(trailing)
+        return end_index + trailing
+
+    def write_to(self, stream):
+        """Writes the description and padding for the position of stream and then the data without copying it"""
+        array = self._contiguous()
+        if array.dtype.hasobject:
+            raise ValueError('Arrays of Python objects cannot be serialized')
+        header = b''.join(value.to_bytes() for value in self._header(array))
+        try:
+            position = stream.tell()
+        except (AttributeError, OSError):
+            position = 0
+        padding = -(position + len(header) + 1) % _ALIGNMENT
+        stream.write(header + SerialU8(padding).to_bytes() + bytes(padding))
+        if array.nbytes:
+            with memoryview(_bytes_of(array if array.flags.c_contiguous else array.T)) as view:
+                stream.write(view)
+        stream.write(bytes(_ALIGNMENT - 1 - padding))
+
+
+def _map_chunks(function, chunks, workers):
+    """
+    Returns a list of the results of a function applied to each chunk, in a thread pool if there is more than one chunk
+
+    Args:
+        function: The function to call on each chunk
+        chunks:   A list of chunks
+        workers:  The maximum number of threads, or None for the ThreadPoolExecutor default
+    """
+    if len(chunks) < 2 or workers == 1:
+        return [function(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(function, chunks))
+
+
+def serial_chunked_ndarray(codec='zlib', level=None, chunk_size=1 << 20, workers=None):
+    """
+    Returns a Serializable numpy.ndarray type that saves its data as compressed chunks
+
+    The data of the array in C order is split into chunks of chunk_size bytes, and each chunk is compressed with a
+    standard library codec. The codecs release the GIL, so chunks are compressed and decompressed concurrently by a
+    pool of threads.
+
+    Type is serialized by first saving the data type string including its byte order, a compact list of U64s giving
+    the shape, the codec tag as a U8 and the uncompressed chunk size as a U64. Then a compact list of U64s gives the
+    compressed size of each chunk, followed by every compressed chunk. The codec and chunk size are read from the data,
+    so any chunked array type can load data saved by any other.
+
+    Args:
+        codec:      The Codec or name of the codec used to save, such as 'zlib', 'bz2' or 'lzma'
+        level:      The compression level, or None for the codec's default
+        chunk_size: The number of uncompressed bytes in each chunk
+        workers:    The maximum number of threads, or None for the ThreadPoolExecutor default
+    """
+    codec = _codec(codec)
+    if chunk_size <= 0:
+        raise ValueError('Chunk size must be positive, not {}'.format(chunk_size))
+
+    class SerialChunkedNdArray(SerialNdArray):
+        """
+        Type for serializing a numpy.ndarray as compressed chunks
+
+        The array has to be compressed to know its size, so serialized_size keeps the compressed chunks with a digest
+        of the array, to be reused by the next call to write_into if the array still holds the same data. to_bytes
+        compresses the array once without hashing it. read_rows loads part of the array by decompressing only the
+        chunks it needs.
+        """
+        _chunks = None
+
+        def set(self, value):
+            """
+            Sets the SerialChunkedNdArray with an existing ndarray
+
+            Args:
+                value: The new ndarray to track
+            """
+            SerialNdArray.set(self, value)
+            self._chunks = None
+
+        @staticmethod
+        def _load_header(data, index):
+            """
+            Returns the data type, shape, codec, chunk size and compressed chunk sizes, and the index of the first chunk
+
+            Args:
+                data:  The bytearray containing the array
+                index: The index in the bytearray where the data starts
+            """
+            data_type, index = SerialAsciiString.from_bytes(data, index)
+            shape, index = _ShapeList.from_bytes(data, index)
+            tag, index = SerialU8.from_bytes(data, index)
+            size, index = SerialU64.from_bytes(data, index)
+            sizes, index = _ShapeList.from_bytes(data, index)
+            return np.dtype(data_type.get()), tuple(shape), _codec_from_tag(tag.get()), size.get(), sizes, index
+
+        @staticmethod
+        def _decompress(dtype, shape, chunk_codec, chunks):
+            """
+            Returns a new ndarray from its compressed chunks
+
+            Args:
+                dtype:       The data type of the array
+                shape:       The shape of the array
+                chunk_codec: The Codec the chunks were saved with
+                chunks:      A list of each compressed chunk
+            """
+            array = np.empty(shape, dtype)
+            with memoryview(_bytes_of(array)) as view:
+                offset = 0
+                for chunk in _map_chunks(functools.partial(decompress, chunk_codec), chunks, workers):
+                    view[offset:offset + len(chunk)] = chunk
+                    offset += len(chunk)
+            if offset != array.nbytes:
+                raise ValueError('Chunks hold {} bytes, not {}'.format(offset, array.nbytes))
+            return array
+
+        def load_in_place(self, data, index=0):
+            """Loads the description of the ndarray and then decompresses every chunk"""
+            dtype, shape, chunk_codec, size, sizes, index = self._load_header(data, index)
+            chunks = []
+            with memoryview(data) as view:
+                for chunk_size in sizes:
+                    chunks.append(view[index:index + chunk_size])
+                    index += chunk_size
+                if index > len(data):
+                    raise ValueError('Data too short for chunks of {} bytes'.format(sum(sizes)))
+                self.set(self._decompress(dtype, shape, chunk_codec, chunks))
+            return index
+
+        @classmethod
+        def read_rows(cls, data, start, stop, index=0):
+            """
+            Returns a new ndarray of the rows start to stop of the first axis of a saved array, decompressing only the
+            chunks that hold those rows
+
+            Args:
+                data:  The bytearray containing the array
+                start: The index of the first row
+                stop:  The index past the last row
+                index: The index in the bytearray where the data starts
+            """
+            dtype, shape, chunk_codec, size, sizes, index = cls._load_header(data, index)
+            if not shape:
+                raise ValueError('A zero dimensional array has no rows')
+            start, stop, _ = slice(start, stop).indices(shape[0])
+            count = max(stop - start, 0)
+            row_size = functools.reduce(mul, shape[1:], 1) * dtype.itemsize
+            if not count * row_size:
+                return np.empty((count,) + shape[1:], dtype)
+            first, last = start * row_size // size, -(-stop * row_size // size)
+            chunks = []
+            with memoryview(data) as view:
+                for chunk_index, chunk_size in enumerate(sizes):
+                    if first <= chunk_index < last:
+                        chunks.append(view[index:index + chunk_size])
+                    index += chunk_size
+                rows = bytearray().join(_map_chunks(functools.partial(decompress, chunk_codec), chunks, workers))
+            array = np.frombuffer(rows, dtype, count * row_size // dtype.itemsize, start * row_size - first * size)
+            return array.reshape((count,) + shape[1:])
+
+        @classmethod
+        def skip(cls, data, index=0):
+            """Returns the index past the ndarray by loading only its description and chunk sizes"""
+            dtype, shape, chunk_codec, size, sizes, index = cls._load_header(data, index)
+            return index + sum(sizes)
+
+        def load_from(self, stream):
+            """Reads the description and then every compressed chunk of the ndarray from stream"""
+            data_type = SerialAsciiString.read_from(stream)
+            shape = _ShapeList.read_from(stream)
+            tag = SerialU8.read_from(stream)
+            SerialU64.read_from(stream)
+            sizes = _ShapeList.read_from(stream)
+            chunks = [_read_exactly(stream, chunk_size) for chunk_size in sizes]
+            self.set(self._decompress(np.dtype(data_type.get()), tuple(shape), _codec_from_tag(tag.get()), chunks))
+
+        def _contiguous(self):
+            """Returns the stored ndarray in C order, raising a ValueError if it holds Python objects"""
+            array = np.ascontiguousarray(self._array)
+            if array.dtype.hasobject:
+                raise ValueError('Arrays of Python objects cannot be serialized')
+            return array
+
+        @staticmethod
+        def _compress(view):
+            """
+            Returns a list of each compressed chunk of the data of an array
+
+            Args:
+                view: A memoryview of the bytes of the array in C order
+            """
+            chunks = [view[offset:offset + chunk_size] for offset in range(0, len(view), chunk_size)]
+            return _map_chunks(functools.partial(compress, codec, level=level), chunks, workers)
+
+        def _kept_chunks(self):
+            """
+            Returns a list of each compressed chunk of the stored ndarray
+
+            The chunks are kept with a digest of the data they were compressed from and are returned again while the
+            array holds the same data, so changing the array in place is never missed.
+            """
+            array = self._contiguous()
+            with memoryview(_bytes_of(array)) as view:
+                key = (array.dtype.str, array.shape, hashlib.blake2b(view).digest())
+                if self._chunks is not None and self._chunks[0] == key:
+                    return self._chunks[1]
+                chunks = self._compress(view)
+            self._chunks = key, chunks
+            return chunks
+
+        def _header(self, chunks):
+            """
+            Returns each Serializable describing the ndarray and its chunks
+
+            Args:
+                chunks: A list of each compressed chunk
+            """
+            return (SerialAsciiString(self._array.dtype.str), _ShapeList(self._array.shape), SerialU8(codec.value),
+                    SerialU64(chunk_size), _ShapeList(len(chunk) for chunk in chunks))
+
+        def to_bytes(self):
+            """Saves the description and then every compressed chunk, compressing the array once"""
+            with memoryview(_bytes_of(self._contiguous())) as view:
+                chunks = self._compress(view)
+            data = bytearray(self._size(chunks))
+            self._write_chunks(data, 0, chunks)
+            return data
+
+        def serialized_size(self):
+            """
+            Returns the size of the description and every compressed chunk
+
+            The array has to be compressed to know its size, so the chunks are kept and reused by the next call to
+            write_into if the array still holds the same data
+            """
+            return self._size(self._kept_chunks())
+
+        def _size(self, chunks):
+            """
+            Returns the size of the description and the compressed chunks
+
+            Args:
+                chunks: A list of each compressed chunk
+            """
+            return sum(value.serialized_size() for value in self._header(chunks)) + sum(len(chunk) for chunk in chunks)
+
+        def write_into(self, buffer, offset=0):
+            """Writes the description and then every compressed chunk directly into buffer"""
+            chunks = self._kept_chunks()
+            self._chunks = None
+            return self._write_chunks(buffer, offset, chunks)
+
+        def _write_chunks(self, buffer, offset, chunks):
+            """
+            Writes the description and then the compressed chunks directly into buffer
+
+            Args:
+                buffer: The buffer to write into
+                offset: The index in the buffer to start at
+                chunks: A list of each compressed chunk
+            """
+            for value in self._header(chunks):
+                offset = value.write_into(buffer, offset)
+            for chunk in chunks:
+                buffer[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+            return offset
+
+    return SerialChunkedNdArray
@@ -1,27 +1,30 @@
-from pyserialization.serializable import Serializable
+from pyserialization.serializable import Serializable, _read_exactly
 from pyserialization.serialint import SerialU32
+from pyserialization.serialvarint import SerialVarUInt
 
-import struct
 
-
-def _create_string(encoding='ascii'):
+def _create_string(encoding='ascii', length_type=SerialU32):
     """
-    Returns a class type for a Serializable string saved with the 's' struct type.
+    Returns a class type for a Serializable string saved as its length and encoded data.
 
     This function should not be used directly, as each call returns a distinct type. Consequently,
     _create_string('ascii') != _create_int('ascii'), which can cause problems with composite types. Instead
-    use the SerialString and SerialAsciiString types specified in the top-level of this module.
+    use the SerialString, SerialAsciiString, SerialVarString and SerialVarAsciiString types specified in the
+    top-level of this module.
 
     Args:
-        encoding: Encoding to use when serializing the string
+        encoding:    Encoding to use when serializing the string
+        length_type: The Serializable int type the length of the string data is saved as
     """
     class _SerialString(Serializable):
         """
-        A Serializable string type that is converted with the python struct module
+        A Serializable string type
 
-        The string is represented as a 32-bit unsigned int denoting the length of the string data followed by the data
-        in the specified encoding
+        The string is represented as a length_type int denoting the length of the string data followed by the data in
+        the specified encoding
         """
+        __slots__ = ('_value', '_data')
+        _encoding = encoding
 
         def __init__(self, value=''):
             """
@@ -30,7 +33,6 @@ def _create_string(encoding='ascii'):
             Args:
                 The initial value of the string
             """
-            self._format_string = '{}s'
             self.set(value)
 
         def __str__(self):
@@ -57,20 +59,63 @@ def _create_string(encoding='ascii'):
                 raise ValueError("String '{}' cannot be encoded to encoding '{}'".format(value, encoding)) from ex
 
         def load_in_place(self, data, index=0):
-            """Loads the string as a U32 length and then loads the decoded string data"""
-            length, index = SerialU32.from_bytes(data, index)
+            """
+            Loads the string as a length and then decodes the string data directly from data
+
+            The encoded data is not kept; it is recreated the next time the string is serialized.
+            """
+            length, index = length_type.from_bytes(data, index)
             end_index = index + length.get()
-            encoded = struct.unpack(self._format_string.format(length.get()), data[index:end_index])[0]
-            self._value = encoded.decode(encoding)
+            if end_index > len(data):
+                raise ValueError('Data too short for string of length {}'.format(length.get()))
+            with memoryview(data) as view:
+                self._value = str(view[index:end_index], encoding)
+            self._data = None
             return end_index
 
+        @classmethod
+        def skip(cls, data, index=0):
+            """Returns the index past the string by loading only its length"""
+            length, index = length_type.from_bytes(data, index)
+            return index + length.get()
+
+        def load_from(self, stream):
+            """Reads the length and then the encoded string data from stream"""
+            length = length_type.read_from(stream)
+            self._value = str(_read_exactly(stream, length.get()), encoding)
+            self._data = None
+
+        async def load_async(self, reader):
+            """Reads the length and then the encoded string data from an asyncio.StreamReader"""
+            length = await length_type.read_async(reader)
+            self._value = str(await reader.readexactly(length.get()), encoding)
+            self._data = None
+
         def to_bytes(self):
-            """Serializes the string as a U32 length and the encoded string data"""
-            length = SerialU32(len(self._data))
-            return length.to_bytes() + struct.pack(self._format_string.format(length.get()), self._data)
+            """Serializes the string as a length and the encoded string data"""
+            data = bytearray(self.serialized_size())
+            self.write_into(data)
+            return data
+
+        def serialized_size(self):
+            """Returns the size of the length plus the encoded string data"""
+            if self._data is None:
+                self._data = self._value.encode(encoding)
+            return length_type(len(self._data)).serialized_size() + len(self._data)
+
+        def write_into(self, buffer, offset=0):
+            """Writes the length and the encoded string data directly into buffer"""
+            if self._data is None:
+                self._data = self._value.encode(encoding)
+            offset = length_type(len(self._data)).write_into(buffer, offset)
+            end_index = offset + len(self._data)
+            buffer[offset:end_index] = self._data
+            return end_index
 
     return _SerialString
 
 
 SerialAsciiString = _create_string('ascii')
 SerialString = _create_string('utf-8')
+SerialVarAsciiString = _create_string('ascii', SerialVarUInt)
+SerialVarString = _create_string('utf-8', SerialVarUInt)
@@ -0,0 +1,239 @@
+from pyserialization.serializable import Serializable, _read_exactly
+
+import array
+
+
+_MAX_VARINT_SIZE = 10
+
+
+def _varuint_size(value):
+    """
+    Returns the number of bytes in the LEB128 encoding of an unsigned int
+
+    Args:
+        value: The unsigned int
+    """
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def _write_varuint(value, buffer, offset):
+    """
+    Writes the LEB128 encoding of an unsigned int into buffer and returns the index past it
+
+    Args:
+        value:  The unsigned int
+        buffer: A writable buffer
+        offset: The index in the buffer where the encoding starts
+    """
+    while value >= 0x80:
+        buffer[offset] = (value & 0x7f) | 0x80
+        value >>= 7
+        offset += 1
+    buffer[offset] = value
+    return offset + 1
+
+
+def _read_varuint(data, index):
+    """
+    Returns an unsigned int loaded from its LEB128 encoding in data and the index past it
+
+    Args:
+        data:  The bytearray containing the encoding
+        index: The index in the bytearray where the encoding starts
+    """
+    value = shift = 0
+    for position in range(index, min(index + _MAX_VARINT_SIZE, len(data))):
+        byte = data[position]
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position + 1
+        shift += 7
+    if index + _MAX_VARINT_SIZE <= len(data):
+        raise ValueError('Varint is longer than {} bytes'.format(_MAX_VARINT_SIZE))
+    raise ValueError('Data too short for varint')
+
+
+def _write_varuints(values):
+    """
+    Returns the LEB128 encodings of many unsigned ints one after another
+
+    When every value is below 128 the encodings are the values themselves, so they are converted in a single call.
+
+    Args:
+        values: An iterable of unsigned ints supporting len and max, such as a list or an array.array
+    """
+    if not values or max(values) < 0x80:
+        return array.array('B', values).tobytes()
+    data = bytearray()
+    append = data.append
+    for value in values:
+        while value >= 0x80:
+            append((value & 0x7f) | 0x80)
+            value >>= 7
+        append(value)
+    return data
+
+
+def _read_varuints(data, index, count):
+    """
+    Returns a list of count unsigned ints loaded from their LEB128 encodings in data and the index past them
+
+    When the next count bytes are all below 128 each is a whole encoding, so they are converted in a single call.
+
+    Args:
+        data:  The bytearray containing the encodings
+        index: The index in the bytearray where the first encoding starts
+        count: The number of unsigned ints to load
+    """
+    with memoryview(data) as view:
+        run = view[index:index + count].tobytes()
+    if len(run) == count and run.isascii():
+        return list(run), index + count
+    values = []
+    append = values.append
+    end = len(data)
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            if index >= end:
+                raise ValueError('Data too short for varint')
+            byte = data[index]
+            index += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+            if shift == 7 * _MAX_VARINT_SIZE:
+                raise ValueError('Varint is longer than {} bytes'.format(_MAX_VARINT_SIZE))
+        append(value)
+    return values, index
+
+
+def _zigzag(value):
+    """Returns the unsigned int that a signed int is zigzag encoded as, so small magnitudes stay small"""
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value):
+    """Returns the signed int that was zigzag encoded as an unsigned int"""
+    return (value >> 1) ^ -(value & 1)
+
+
+class _SerialVarInt(Serializable):
+    """
+    A Serializable int type saved as a variable number of bytes
+
+    The int is saved in LEB128, seven bits at a time from the least significant, with the high bit of each byte set
+    if another byte follows. Values below 128 take a single byte, and no value takes more than ten.
+    """
+    __slots__ = ('_value',)
+    _range = (0, 0)
+
+    def __init__(self, value=0):
+        """
+        Initializes the integer to be equal to 'value'
+
+        Args:
+            value: The initial value of the integer
+        """
+        self.set(value)
+
+    def __str__(self):
+        """Returns the __str__ representation of the stored integer"""
+        return self._value.__str__()
+
+    def __repr__(self):
+        """Returns the __repr__ representation of the stored integer"""
+        return self._value.__repr__()
+
+    def get(self):
+        """Returns the stored integer"""
+        return self._value
+
+    def set(self, value):
+        """
+        Sets the value of the stored integer while also performing a range check
+
+        Args:
+            value: The integer to store
+        """
+        if not isinstance(value, int):
+            raise ValueError("Value not int! {}".format(value))
+        _min, _max = self._range
+        if value < _min:
+            raise ValueError("Int {} is too small. Min={}".format(value, _min))
+        if value > _max:
+            raise ValueError("Int {} is too large. Max={}".format(value, _max))
+        self._value = value
+
+    @staticmethod
+    def _encode(value):
+        """Returns the unsigned int saved for a value"""
+        return value
+
+    @staticmethod
+    def _decode(value):
+        """Returns the value loaded from an unsigned int"""
+        return value
+
+    def load_in_place(self, data, index=0):
+        """Loads the integer one byte at a time until a byte without the high bit set"""
+        value, index = _read_varuint(data, index)
+        self.set(self._decode(value))
+        return index
+
+    @classmethod
+    def skip(cls, data, index=0):
+        """Returns the index past the integer"""
+        return _read_varuint(data, index)[1]
+
+    def load_from(self, stream):
+        """Reads the integer from stream one byte at a time"""
+        data = bytearray()
+        while not data or data[-1] >= 0x80:
+            if len(data) == _MAX_VARINT_SIZE:
+                raise ValueError('Varint is longer than {} bytes'.format(_MAX_VARINT_SIZE))
+            data += _read_exactly(stream, 1)
+        self.load_in_place(data)
+
+    async def load_async(self, reader):
+        """Reads the integer from an asyncio.StreamReader one byte at a time"""
+        data = bytearray()
+        while not data or data[-1] >= 0x80:
+            if len(data) == _MAX_VARINT_SIZE:
+                raise ValueError('Varint is longer than {} bytes'.format(_MAX_VARINT_SIZE))
+            data += await reader.readexactly(1)
+        self.load_in_place(data)
+
+    def to_bytes(self):
+        """Saves the integer in as few bytes as possible"""
+        data = bytearray(self.serialized_size())
+        self.write_into(data)
+        return data
+
+    def serialized_size(self):
+        """Returns the number of bytes needed for the integer"""
+        return _varuint_size(self._encode(self._value))
+
+    def write_into(self, buffer, offset=0):
+        """Writes the integer directly into buffer"""
+        return _write_varuint(self._encode(self._value), buffer, offset)
+
+
+class SerialVarUInt(_SerialVarInt):
+    """A Serializable unsigned int of up to 64 bits saved in LEB128"""
+    __slots__ = ()
+    _range = (0, 18446744073709551615)
+
+
+class SerialVarSInt(_SerialVarInt):
+    """
+    A Serializable signed int of up to 64 bits saved in LEB128 after zigzag encoding
+
+    Zigzag encoding maps 0, -1, 1, -2, 2... to 0, 1, 2, 3, 4..., so ints of small magnitude take few bytes whatever
+    their sign.
+    """
+    __slots__ = ()
+    _range = (-9223372036854775808, 9223372036854775807)
+    _encode = staticmethod(_zigzag)
+    _decode = staticmethod(_unzigzag)
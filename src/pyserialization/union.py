@@ -1,15 +1,54 @@
 from pyserialization.serializable import Serializable
-from pyserialization.serialint import SerialU8
+from pyserialization.serialint import _tag_type
 
 from abc import ABCMeta
 import collections
 import inspect
 
 
+class _UnionField:
+    """
+    Data descriptor installed on a Union class for each possible type.
+
+    Getting the attribute returns the current value, or the result of its 'get' method if it has one, and raises a
+    ValueError if the union is not currently set to that type. Setting the attribute switches the union to that type
+    and calls its 'set' method; types without a 'set' method cannot be assigned.
+    """
+    def __init__(self, key, Type):
+        """
+        Args:
+            key: The attribute name
+            Type: The Serializable type of the attribute
+        """
+        self.key = key
+        self.Type = Type
+        self.has_get = callable(getattr(Type, 'get', None))
+        self.has_set = callable(getattr(Type, 'set', None))
+
+    def __get__(self, instance, owner):
+        """Returns the current value if it is of this type, or the type itself when accessed on the class"""
+        if instance is None:
+            return self.Type
+        current = instance.__dict__['_current']
+        if type(current) != self.Type:
+            raise ValueError('Type is not currently set to {}'.format(self.key))
+        return current.get() if self.has_get else current
+
+    def __set__(self, instance, value):
+        """Switches the union to this type if needed and calls its set method"""
+        if not self.has_set:
+            raise ValueError("Cannot assign directly to '{}' ({})".format(self.key, self.Type))
+        if self.key != instance.__revtypemap__[type(instance._current)]:
+            instance.set(self.Type)
+        instance._current.set(value)
+
+
 class UnionMeta(ABCMeta):
     """
     Meta class that keeps track of an ordered list of class attributes to later be used by the Composite class.
-    Adds all class attributes of type SaveableType to member __ordered__ of the class __dict__
+    Adds all class attributes of type SaveableType to member __ordered__ of the class __dict__ and then replaces each
+    of them with a descriptor that gets and sets the current value. The index of each type is precomputed into
+    __indexmap__, and __tagtype__ is the smallest unsigned int type that can store every index.
     """
     @classmethod
     def __prepare__(mcs, name, bases):
@@ -19,14 +58,19 @@ class UnionMeta(ABCMeta):
         for base in bases:
             if hasattr(base, '__ordered__'):
                 for key in base.__ordered__:
-                    classdict[key] = base.__dict__[key]
+                    classdict[key] = base.__typemap__[key]
         classdict['__ordered__'] = [key for key in classdict.keys() if
                                     inspect.isclass(classdict[key]) and
                                     issubclass(classdict[key], Serializable)]
         classdict['__typemap__'] = {key: classdict[key] for key in classdict['__ordered__']}
         classdict['__revtypemap__'] = {classdict[key]: key for key in classdict['__ordered__']}
+        classdict['__indexmap__'] = {Type: classdict['__ordered__'].index(key)
+                                     for Type, key in classdict['__revtypemap__'].items()}
+        classdict['__tagtype__'] = _tag_type(len(classdict['__ordered__']))
+        for key in classdict['__ordered__']:
+            classdict[key] = _UnionField(key, classdict[key])
 
-        return type.__new__(mcs, name, bases, dict(classdict))
+        return ABCMeta.__new__(mcs, name, bases, dict(classdict))
 
 
 class Union(Serializable, metaclass=UnionMeta):
@@ -40,6 +84,8 @@ class Union(Serializable, metaclass=UnionMeta):
     The bytearray representation of a composite is each bytearray representation of the composite in the order they were
     declared, one after another
 
+    The index of the current type is stored as a U8, or as a U16 or U32 if the union has more than 256 types.
+
     Ex.
     class Composite1(Composite):
         val1 = saveable_int('u32')
@@ -91,48 +137,67 @@ class Union(Serializable, metaclass=UnionMeta):
             return
         raise ValueError('Invalid Type {}'.format(Type))
 
-    def __setattr__(self, key, value):
-        """
-        Catches all attribute setting. Only allows the setting if the attribute being set has a 'set' method. If it does
-        calls attribute.set(value). Otherwise setting is disallowed
-        """
-        if key in self.__typemap__:
-            Type = self.__typemap__[key]
-            if not callable(getattr(Type, 'set', None)):
-                raise ValueError("Cannot assign directly to '{}' ({})".format(key, type(Type)))
-            if key != self.__revtypemap__[type(self._current)]:
-                self.set(Type)
-            self._current.set(value)
-        else:
-            Serializable.__setattr__(self, key, value)
-
-    def __getattribute__(self, item):
-        """
-        Catches all attribute getting. If the attribute defines a 'get' method returns that instead, otherwise just
-        returns the attribute
-        """
-        get_attribute = lambda item: Serializable.__getattribute__(self, item)
-        if item not in get_attribute('__typemap__'):
-            return get_attribute(item)
-        current = get_attribute('__dict__')['_current']
-        SetType = get_attribute('__typemap__')[item]
-        if type(current) != SetType:
-            raise ValueError('Type is not currently set to {}'.format(item))
-        return current.get() if callable(getattr(current, 'get', None)) else current
-
     def load_in_place(self, data, index=0):
         """Loads the union type as an index into the possible types and then calls from_byte_array on that type"""
-        type_ind, index = SerialU8.from_bytes(data, index)
-        if not (0 <= type_ind.get() < len(self.__ordered__)):
-            raise ValueError('Union index {} is out of range'.format(type_ind.get()))
-        Type = self.__typemap__[self.__ordered__[type_ind.get()]]
+        type_ind, index = self.__tagtype__.from_bytes(data, index)
+        Type = self._index_type(type_ind.get())
         value, index = Type.from_bytes(data, index)
         self.set(Type, value)
         return index
 
+    @classmethod
+    def skip(cls, data, index=0):
+        """Returns the index past the union by loading its type index and skipping that type"""
+        type_ind, index = cls.__tagtype__.from_bytes(data, index)
+        return cls._index_type(type_ind.get()).skip(data, index)
+
+    def load_from(self, stream):
+        """Reads the index into the possible types and then reads that type from stream"""
+        type_ind = self.__tagtype__.read_from(stream)
+        Type = self._index_type(type_ind.get())
+        self.set(Type, Type.read_from(stream))
+
+    async def load_async(self, reader):
+        """Reads the index into the possible types and then reads that type from an asyncio.StreamReader"""
+        type_ind = await self.__tagtype__.read_async(reader)
+        Type = self._index_type(type_ind.get())
+        self.set(Type, await Type.read_async(reader))
+
+    @classmethod
+    def _index_type(cls, type_ind):
+        """
+        Returns the type stored at an index of the possible types
+
+        Args:
+            type_ind: The index loaded for the type
+        """
+        if not (0 <= type_ind < len(cls.__ordered__)):
+            raise ValueError('Union index {} is out of range'.format(type_ind))
+        return cls.__typemap__[cls.__ordered__[type_ind]]
+
     def to_bytes(self):
-        """Stores the index of the current type as a U8 and then calls to_bytes on that type"""
+        """Stores the index of the current type followed by the current type"""
+        data = bytearray(self.serialized_size())
+        self.write_into(data)
+        return data
+
+    def serialized_size(self):
+        """Returns the size of the index plus the size of the current type"""
+        if self._current is None:
+            raise ValueError('Union is null')
+        return self.__tagtype__.__fixed_size__ + self._current.serialized_size()
+
+    def write_into(self, buffer, offset=0):
+        """Writes the index of the current type and then the current type directly into buffer"""
+        if self._current is None:
+            raise ValueError('Union is null')
+        type_ind = self.__tagtype__(self.__indexmap__[type(self._current)])
+        offset = type_ind.write_into(buffer, offset)
+        return self._current.write_into(buffer, offset)
+
+    def write_to(self, stream):
+        """Writes the index of the current type and then the current type to stream"""
         if self._current is None:
             raise ValueError('Union is null')
-        type_ind = SerialU8(self.__ordered__.index(self.__revtypemap__[type(self._current)]))
-        return type_ind.to_bytes() + self._current.to_bytes()
+        self.__tagtype__(self.__indexmap__[type(self._current)]).write_to(stream)
+        self._current.write_to(stream)
@@ -0,0 +1,83 @@
+from pyserialization.composite import Composite
+from pyserialization.compression import serial_compressed
+from pyserialization.serialbytes import SerialBytes
+from pyserialization.serialint import SerialU8, SerialU32
+from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialString
+from pyserialization.union import Union
+
+import asyncio
+import socket
+import unittest
+
+
+class AsyncComposite(Composite):
+    a = SerialU8
+    b = SerialString
+    c = serial_list(SerialU32)
+    d = serial_list(SerialU32, compact=True)
+    e = SerialBytes
+    f = serial_compressed(serial_list(SerialString))
+
+
+class AsyncUnion(Union):
+    a = SerialU32
+    b = AsyncComposite
+
+
+def make_composite(i):
+    composite = AsyncComposite()
+    composite.a = i
+    composite.b = 'message {}'.format(i)
+    composite.c.set(range(i))
+    composite.d = range(i * 2)
+    composite.e = bytes(range(i))
+    composite.f = ['x' * i] * 3
+    return composite
+
+
+def check_composite(test, composite, i):
+    test.assertEqual(composite.a, i)
+    test.assertEqual(composite.b, 'message {}'.format(i))
+    test.assertEqual([value.get() for value in composite.c], list(range(i)))
+    test.assertEqual(list(composite.d), list(range(i * 2)))
+    test.assertEqual(composite.e, bytes(range(i)))
+    test.assertEqual([value.get() for value in composite.f], ['x' * i] * 3)
+
+
+class TestAsync(unittest.TestCase):
+    def test_read_async(self):
+        async def read():
+            reader = asyncio.StreamReader()
+            for i in range(5):
+                reader.feed_data(make_composite(i).to_bytes())
+            reader.feed_eof()
+            composites = [await AsyncComposite.read_async(reader) for _ in range(5)]
+            with self.assertRaises(EOFError):
+                await AsyncComposite.read_async(reader)
+            return composites
+        for i, composite in enumerate(asyncio.run(read())):
+            check_composite(self, composite, i)
+
+    def test_socket(self):
+        async def transfer():
+            receiver, sender = socket.socketpair()
+            reader, receiver_writer = await asyncio.open_connection(sock=receiver)
+            sender_reader, writer = await asyncio.open_connection(sock=sender)
+            union = AsyncUnion(AsyncComposite, make_composite(200))
+
+            async def read_all():
+                return [await AsyncUnion.read_async(reader) for _ in range(3)]
+            read = asyncio.ensure_future(read_all())
+            for _ in range(3):
+                await union.write_async(writer)
+            unions = await read
+            writer.close()
+            receiver_writer.close()
+            return unions
+        for union in asyncio.run(transfer()):
+            check_composite(self, union.b, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+from pyserialization.serialbytes import SerialBytes, SerialBytesView
+
+import unittest
+
+
+class TestSerialBytes(unittest.TestCase):
+    def test_empty(self):
+        bytes1 = SerialBytes()
+        bytes2 = SerialBytes.from_bytes(bytes1.to_bytes())[0]
+        self.assertEqual(bytes2.get(), b'')
+
+    def test_buffers(self):
+        data = b'\x00' + SerialBytes(b'abc').to_bytes()
+        for buffer in (bytearray(data), memoryview(data)):
+            bytes2, index = SerialBytes.from_bytes(buffer, 1)
+            self.assertEqual(bytes2.get(), b'abc')
+            self.assertIsInstance(bytes2.get(), bytes)
+            self.assertEqual(index, len(data))
+
+    def test_view(self):
+        data = bytearray(SerialBytes(b'abc').to_bytes())
+        view = SerialBytesView.from_bytes(data)[0]
+        self.assertIsInstance(view.get(), memoryview)
+        data[-1] = ord('d')
+        self.assertEqual(view.get(), b'abd')
+        self.assertEqual(SerialBytes.from_bytes(view.to_bytes())[0].get(), b'abd')
+
+    def test_too_short(self):
+        self.assertRaises(ValueError, SerialBytes.from_bytes, SerialBytes(b'abc').to_bytes()[:-1])
@@ -0,0 +1,203 @@
+from pyserialization.codegen import compile
+from pyserialization.composite import Composite
+from pyserialization.endianness import Endianess
+from pyserialization.serialchar import SerialChar
+from pyserialization.serialenum import serial_enum
+from pyserialization.serialfloat import SerialDouble
+from pyserialization.serialint import SerialU8, SerialU16, SerialU32, SerialS64
+from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialString
+from pyserialization.serialvarint import SerialVarUInt
+from pyserialization.union import Union
+
+import enum
+import io
+import unittest
+
+
+class Color(enum.Enum):
+    red = 1
+    green = 2
+
+
+class Point(Composite):
+    x = SerialDouble
+    y = SerialDouble
+
+
+class Shape(Composite):
+    id = SerialU32
+    origin = Point
+    flag = SerialChar
+    color = serial_enum(Color)
+    name = SerialString
+    points = serial_list(Point)
+    sizes = serial_list(SerialU16, length_type=SerialVarUInt)
+
+
+class LazyShape(Composite):
+    __lazy__ = True
+    id = SerialU32
+    name = SerialString
+
+
+class Message(Union):
+    shape = Shape
+    point = Point
+    number = SerialS64
+    lazy = LazyShape
+
+
+class BigU16(SerialU16):
+    def __init__(self, value=0):
+        super().__init__(value, endian=Endianess.big)
+
+
+class Mixed(Composite):
+    a = SerialU16
+    b = BigU16
+    c = BigU16
+    values = serial_list(SerialU8, length_type=BigU16)
+
+
+Shapes = serial_list(Shape)
+ReusedShapes = serial_list(Shape, reuse=True)
+
+
+def _shape(number):
+    shape = Shape()
+    shape.id = number
+    shape.origin.x = number / 2
+    shape.flag = 'a'
+    shape.color = Color.green
+    shape.name = 'shape {}'.format(number)
+    shape.points.append(Point())
+    shape.points.append(Point())
+    shape.points[1].y = -1.5
+    shape.sizes.append(number)
+    shape.sizes.append(300)
+    return shape
+
+
+class TestCompile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.shapes = Shapes([_shape(number) for number in range(5)])
+        cls.data = bytes(cls.shapes.to_bytes())
+        cls.messages = [Message(Shape, _shape(7)), Message(Point, Point()), Message(SerialS64, -4)]
+        cls.message_data = [bytes(message.to_bytes()) for message in cls.messages]
+        compile(Shapes)
+        compile(ReusedShapes)
+        compile(Message)
+
+    def test_compiled(self):
+        for Type in (Shapes, Shape, Point, Message, Shape.points):
+            self.assertIn('__compiled__', Type.__dict__)
+        self.assertNotIn('__compiled__', LazyShape.__dict__)
+        self.assertIn('def load_in_place', Shape.__source__)
+
+    def test_same_bytes(self):
+        self.assertEqual(bytes(self.shapes.to_bytes()), self.data)
+        self.assertEqual(self.shapes.serialized_size(), len(self.data))
+        for message, data in zip(self.messages, self.message_data):
+            self.assertEqual(bytes(message.to_bytes()), data)
+
+    def test_load(self):
+        shapes, index = Shapes.from_bytes(b'\x00' + self.data, 1)
+        self.assertEqual(index, len(self.data) + 1)
+        self.assertEqual(Shapes.skip(self.data), len(self.data))
+        self.assertEqual(bytes(shapes.to_bytes()), self.data)
+        self.assertEqual(shapes[3].origin.x, 1.5)
+        self.assertEqual(shapes[3].flag, 'a')
+        self.assertEqual(shapes[3].color, Color.green)
+        self.assertEqual(shapes[3].name, 'shape 3')
+        self.assertEqual(shapes[3].points[1].y, -1.5)
+        self.assertEqual([size.get() for size in shapes[3].sizes], [3, 300])
+
+    def test_loaded_objects_are_independent(self):
+        shapes = Shapes.from_bytes(self.data)[0]
+        shapes[0].origin.y = 9.0
+        shapes[0].id = 100
+        self.assertEqual(shapes[1].origin.y, 0.0)
+        self.assertEqual(Point().x, 0.0)
+        self.assertRaises(ValueError, setattr, shapes[0], 'id', -1)
+
+    def test_reuse(self):
+        shapes = ReusedShapes.from_bytes(self.data)[0]
+        first = shapes[0]
+        shapes[1] = _shape(1)
+        shapes.load_in_place(Shapes(self.shapes[:2]).to_bytes())
+        self.assertIs(shapes[0], first)
+        self.assertEqual(len(shapes), 2)
+        self.assertEqual(shapes.load_in_place(self.data), len(self.data))
+        self.assertIs(shapes[0], first)
+        self.assertEqual(bytes(shapes.to_bytes()), self.data)
+
+    def test_union(self):
+        for message, data in zip(self.messages, self.message_data):
+            loaded, index = Message.from_bytes(data)
+            self.assertEqual(index, len(data))
+            self.assertEqual(Message.skip(data), len(data))
+            self.assertIs(loaded.get_type(), message.get_type())
+            self.assertEqual(bytes(loaded.to_bytes()), data)
+        lazy = Message.from_bytes(Message(LazyShape).to_bytes())[0]
+        self.assertEqual(lazy.get().name, '')
+        self.assertRaises(ValueError, Message.from_bytes, b'\x09')
+
+    def test_streams(self):
+        stream = io.BytesIO()
+        self.shapes.write_to(stream)
+        self.assertEqual(stream.getvalue(), self.data)
+        self.assertEqual(bytes(Shapes.read_from(io.BytesIO(self.data)).to_bytes()), self.data)
+
+    def test_dump(self):
+        stream = io.StringIO()
+        self.assertIs(compile(Point, dump=stream), Point)
+        self.assertEqual(stream.getvalue(), Point.__source__)
+        self.assertIn('unpack_from', stream.getvalue())
+
+    def test_subclass(self):
+        class Point3(Point):
+            z = SerialDouble
+        point = Point3()
+        point.z = 2.0
+        data = point.to_bytes()
+        self.assertEqual(len(data), 24)
+        self.assertEqual(Point3.from_bytes(data)[0].z, 2.0)
+        self.assertNotIn('__compiled__', Point3.__dict__)
+
+    def test_endianness(self):
+        mixed = Mixed()
+        mixed.a, mixed.b, mixed.c = 1, 2, 3
+        mixed.values.append(4)
+        data = bytes(mixed.to_bytes())
+        compile(Mixed)
+        self.assertEqual(bytes(mixed.to_bytes()), data)
+        self.assertEqual(data, b'\x01\x00\x00\x02\x00\x03\x00\x01\x04')
+        loaded = Mixed.from_bytes(data)[0]
+        self.assertEqual((loaded.a, loaded.b, loaded.c, loaded.values[0].get()), (1, 2, 3, 4))
+
+    def test_set_endianness(self):
+        class Pair(Composite):
+            a = SerialU32
+            b = SerialU16
+        pair = Pair()
+        pair.a, pair.b = 1, 2
+        pair.__dict__['a'].set_endianness(Endianess.big)
+        data = bytes(pair.to_bytes())
+        compile(Pair)
+        self.assertEqual(bytes(pair.to_bytes()), data)
+        self.assertEqual(data, b'\x00\x00\x00\x01\x02\x00')
+        pair.a, pair.b = 0, 0
+        self.assertEqual(pair.load_in_place(data), 6)
+        self.assertEqual((pair.a, pair.b), (1, 2))
+        self.assertEqual(Pair.from_bytes(data)[0].a, 0x1000000)
+
+    def test_cannot_compile(self):
+        self.assertRaises(ValueError, compile, LazyShape)
+        self.assertRaises(ValueError, compile, SerialU8)
+        self.assertRaises(ValueError, compile, serial_list(SerialU8, compact=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
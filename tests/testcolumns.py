@@ -0,0 +1,135 @@
+from pyserialization.composite import Composite
+from pyserialization.endianness import Endianess
+from pyserialization.serialchar import SerialChar
+from pyserialization.serialcolumns import serial_columns
+from pyserialization.serialenum import serial_enum
+from pyserialization.serialfloat import SerialDouble
+from pyserialization.serialint import SerialU8, SerialU16, SerialS32
+from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialString
+
+import enum
+import io
+import unittest
+
+
+class Color(enum.Enum):
+    red = 1
+    green = 2
+
+
+class Record(Composite):
+    id = SerialS32
+    score = SerialDouble
+    letter = SerialChar
+    color = serial_enum(Color)
+    name = SerialString
+    tags = serial_list(SerialU8)
+
+
+RecordColumns = serial_columns(Record)
+
+
+class BigU16(SerialU16):
+    def __init__(self, value=0):
+        super().__init__(value, endian=Endianess.big)
+
+
+class BigRecord(Composite):
+    value = BigU16
+    letter = SerialChar
+
+
+BigRecordColumns = serial_columns(BigRecord)
+
+
+def make_record(number):
+    record = Record()
+    record.id = number
+    record.score = number / 2
+    record.letter = chr(ord('a') + number % 26)
+    record.color = Color.green if number % 2 else Color.red
+    record.name = 'record{}'.format(number) * (number % 3)
+    record.tags.set([number % 256, 7])
+    return record
+
+
+class TestSerialColumns(unittest.TestCase):
+    def assert_record(self, record, number):
+        self.assertEqual(record.id, number)
+        self.assertEqual(record.score, number / 2)
+        self.assertEqual(record.letter, chr(ord('a') + number % 26))
+        self.assertEqual(record.color, Color.green if number % 2 else Color.red)
+        self.assertEqual(record.name, 'record{}'.format(number) * (number % 3))
+        self.assertEqual([tag.get() for tag in record.tags], [number % 256, 7])
+
+    def test_empty(self):
+        columns = RecordColumns.from_bytes(RecordColumns().to_bytes())[0]
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(RecordColumns.skip(RecordColumns().to_bytes()), 4)
+
+    def test_round_trip(self):
+        data = RecordColumns([make_record(number) for number in range(100)]).to_bytes()
+        columns, index = RecordColumns.from_bytes(data)
+        self.assertEqual(index, len(data))
+        self.assertEqual(len(columns), 100)
+        for number, record in enumerate(columns):
+            self.assert_record(record, number)
+        self.assert_record(columns[-1], 99)
+        self.assertEqual([record.id for record in columns[2:5]], [2, 3, 4])
+
+    def test_layout(self):
+        columns = RecordColumns([make_record(1), make_record(2)])
+        data = columns.to_bytes()
+        self.assertEqual(len(data), columns.serialized_size())
+        self.assertEqual(data[:12], b'\x02\x00\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00')
+
+    def test_endianness(self):
+        records = [BigRecord() for number in range(2)]
+        records[0].value, records[1].value = 1, 0x203
+        data = BigRecordColumns(records).to_bytes()
+        self.assertEqual(data[4:8], b'\x00\x01\x02\x03')
+        columns = BigRecordColumns.from_bytes(data)[0]
+        self.assertEqual(list(columns.column('value')), [1, 0x203])
+        self.assertEqual(columns[1].value, 0x203)
+
+    def test_column(self):
+        columns = RecordColumns([make_record(number) for number in range(5)])
+        self.assertEqual(list(columns.column('id')), [0, 1, 2, 3, 4])
+        self.assertEqual(columns.column('letter'), ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(columns.column('name'), [make_record(number).name for number in range(5)])
+
+    def test_setitem(self):
+        columns = RecordColumns([make_record(number) for number in range(5)])
+        columns[1] = make_record(8)
+        columns[-1] = make_record(10)
+        columns = RecordColumns.from_bytes(columns.to_bytes())[0]
+        for number, record in zip([0, 8, 2, 3, 10], columns):
+            self.assert_record(record, number)
+
+    def test_invalid_record(self):
+        self.assertRaises(ValueError, RecordColumns, [1])
+        self.assertRaises(ValueError, serial_columns, SerialU8)
+
+    def test_skip_and_read_from(self):
+        data = RecordColumns([make_record(number) for number in range(10)]).to_bytes()
+        self.assertEqual(RecordColumns.skip(data + data), len(data))
+        stream = io.BytesIO(data + data)
+        self.assertEqual(len(RecordColumns.read_from(stream)), 10)
+        columns = RecordColumns.read_from(stream)
+        for number, record in enumerate(columns):
+            self.assert_record(record, number)
+        self.assertRaises(EOFError, RecordColumns.read_from, io.BytesIO(data[:-1]))
+
+    def test_numpy_column(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        columns = RecordColumns([make_record(number) for number in range(5)])
+        self.assertEqual(columns.numpy_column('score').sum(), 5.0)
+        self.assertRaises(ValueError, columns.numpy_column, 'name')
+
+
+if __name__ == '__main__':
+    unittest.main()
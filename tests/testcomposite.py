@@ -1,7 +1,14 @@
 from pyserialization.composite import Composite
-from pyserialization.serialint import SerialU16, SerialU32
+from pyserialization.endianness import Endianess
+from pyserialization.serialchar import SerialChar
+from pyserialization.serialfloat import SerialFloat, SerialDouble
+from pyserialization.serialint import SerialU8, SerialU16, SerialU32, SerialS64
+from pyserialization.seriallist import serial_list
 from pyserialization.serialstring import SerialString
 
+import io
+import socket
+import threading
 import unittest
 
 
@@ -11,6 +18,10 @@ class TestComposite(Composite):
     c = SerialString
 
 
+class TestSubComposite(TestComposite):
+    d = SerialU8
+
+
 class TestSerialComposite(unittest.TestCase):
     def test_all(self):
         composite1 = TestComposite()
@@ -22,8 +33,239 @@ class TestSerialComposite(unittest.TestCase):
         self.assertEqual(composite2.b, 5)
         self.assertEqual(composite2.c, 'apple')
 
+    def test_class_attributes(self):
+        self.assertEqual(TestComposite.a, SerialU16)
+        self.assertEqual(TestSubComposite.__ordered__, ['d', 'a', 'b', 'c'])
+        composite = TestSubComposite()
+        composite.a = 3
+        composite.d = 4
+        self.assertEqual((composite.a, composite.d), (3, 4))
+
+    def test_other_attributes(self):
+        composite = TestComposite()
+        composite.other = 'value'
+        self.assertEqual(composite.other, 'value')
+        self.assertNotIn('other', composite.__ordered__)
+
     def test_set_wrong_type(self):
         composite = TestComposite()
         def set_a(value):
             composite.a = value
-        self.assertRaises(ValueError, set_a, 'a')
\ No newline at end of file
+        self.assertRaises(ValueError, set_a, 'a')
+
+class TestScalarComposite(Composite):
+    a = SerialU8
+    b = SerialS64
+    c = SerialChar
+    d = SerialDouble
+    e = SerialString
+    f = SerialFloat
+    g = SerialU16
+
+
+class TestScalarNumbers(Composite):
+    f = SerialFloat
+    g = SerialU16
+
+
+class BigU32(SerialU32):
+    def __init__(self, value=0):
+        super().__init__(value, endian=Endianess.big)
+
+
+class TestEndianComposite(Composite):
+    a = SerialU16
+    b = BigU32
+    c = SerialU16
+
+
+class TestSerialCompositeScalars(unittest.TestCase):
+    def test_endianness(self):
+        self.assertEqual(BigU32(1).to_bytes(), b'\x00\x00\x00\x01')
+        composite1 = TestEndianComposite()
+        composite1.a, composite1.b, composite1.c = 1, 2, 3
+        composite1.__dict__['c'].set_endianness(Endianess.big)
+        data = composite1.to_bytes()
+        self.assertEqual(data, b''.join(composite1.__dict__[key].to_bytes() for key in 'abc'))
+        self.assertEqual(data[2:], b'\x00\x00\x00\x02\x00\x03')
+        stream = io.BytesIO()
+        composite1.write_to(stream)
+        self.assertEqual(stream.getvalue(), data)
+        composite2 = TestEndianComposite()
+        composite2.__dict__['c'].set_endianness(Endianess.big)
+        self.assertEqual(composite2.load_in_place(data), len(data))
+        self.assertEqual((composite2.a, composite2.b, composite2.c), (1, 2, 3))
+        self.assertEqual(TestEndianComposite.from_bytes(data[:6] + SerialU16(3).to_bytes())[0].c, 3)
+
+
+    def test_scalars(self):
+        composite1 = TestScalarComposite()
+        composite1.a = 255
+        composite1.b = -2**63
+        composite1.c = 'z'
+        composite1.d = 2.5
+        composite1.e = 'pear'
+        composite1.f = -1.5
+        composite1.g = 65535
+        composite2 = TestScalarComposite.from_bytes(composite1.to_bytes())[0]
+        self.assertEqual(composite2.a, 255)
+        self.assertEqual(composite2.b, -2**63)
+        self.assertEqual(composite2.c, 'z')
+        self.assertEqual(composite2.d, 2.5)
+        self.assertEqual(composite2.e, 'pear')
+        self.assertEqual(composite2.f, -1.5)
+        self.assertEqual(composite2.g, 65535)
+
+    def test_same_bytes_as_members(self):
+        composite = TestScalarComposite()
+        composite.b = 12345
+        composite.c = 'q'
+        composite.e = 'apple'
+        data = bytearray()
+        for key in composite.__ordered__:
+            data += composite.__dict__[key].to_bytes()
+        self.assertEqual(composite.to_bytes(), data)
+
+    def test_index(self):
+        composite = TestScalarComposite()
+        data = b'\xff' + composite.to_bytes()
+        self.assertEqual(composite.load_in_place(data, 1), len(data))
+
+    def test_write_into(self):
+        composite = TestScalarComposite()
+        composite.e = 'banana'
+        size = composite.serialized_size()
+        self.assertEqual(size, len(composite.to_bytes()))
+        buffer = bytearray(size + 3)
+        with memoryview(buffer) as view:
+            self.assertEqual(composite.write_into(view, 3), size + 3)
+        self.assertEqual(buffer[3:], composite.to_bytes())
+
+    def test_write_to(self):
+        composite = TestScalarComposite()
+        composite.e = 'banana'
+        stream = io.BytesIO()
+        composite.write_to(stream)
+        self.assertEqual(stream.getvalue(), composite.to_bytes())
+
+    def test_read_from(self):
+        composites = [TestScalarComposite() for _ in range(3)]
+        for i, composite in enumerate(composites):
+            composite.a = i
+            composite.e = 'x' * i
+        stream = io.BytesIO(b''.join(composite.to_bytes() for composite in composites))
+        for i in range(3):
+            composite = TestScalarComposite.read_from(stream)
+            self.assertEqual(composite.a, i)
+            self.assertEqual(composite.e, 'x' * i)
+        self.assertRaises(EOFError, TestScalarComposite.read_from, stream)
+
+    def test_read_from_socket(self):
+        composite1 = TestComposite()
+        composite1.c = 'hello' * 1000
+        data = composite1.to_bytes()
+        sender, receiver = socket.socketpair()
+        with sender, receiver, receiver.makefile('rb') as stream:
+            thread = threading.Thread(target=sender.sendall, args=(data,))
+            thread.start()
+            composite2 = TestComposite.read_from(stream)
+            thread.join()
+        self.assertEqual(composite2.c, 'hello' * 1000)
+
+
+class TestNumpyComposite(Composite):
+    a = SerialU8
+    b = SerialS64
+    c = SerialChar
+    d = SerialDouble
+    sub = TestScalarNumbers
+
+
+class TestSerialCompositeNumpy(unittest.TestCase):
+    def setUp(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed')
+
+    def make_composite(self, i):
+        composite = TestNumpyComposite()
+        composite.a = i
+        composite.b = -i
+        composite.c = chr(ord('a') + i)
+        composite.d = i / 4
+        composite.sub.f = i * 2
+        composite.sub.g = i + 1
+        return composite
+
+    def test_dtype(self):
+        dtype = TestNumpyComposite.numpy_dtype()
+        self.assertEqual(dtype.names, ('a', 'b', 'c', 'd', 'sub'))
+        self.assertEqual(dtype.itemsize, TestNumpyComposite.__fixed_size__)
+        self.assertRaises(ValueError, TestScalarComposite.numpy_dtype)
+
+    def test_endianness(self):
+        composite = TestEndianComposite()
+        composite.a, composite.b, composite.c = 1, 2, 3
+        array = TestEndianComposite.array_from_bytes(composite.to_bytes(), 1)[0]
+        self.assertEqual(TestEndianComposite.numpy_dtype()['b'].byteorder, '>')
+        self.assertEqual((array['a'][0], array['b'][0], array['c'][0]), (1, 2, 3))
+        self.assertEqual(TestEndianComposite.to_bytes_from_array(array), composite.to_bytes())
+
+    def test_array_from_bytes(self):
+        data = b'\xff' + b''.join(self.make_composite(i).to_bytes() for i in range(10))
+        array, index = TestNumpyComposite.array_from_bytes(data, 10, 1)
+        self.assertEqual(index, len(data))
+        self.assertEqual(list(array['a']), list(range(10)))
+        self.assertEqual(list(array['b']), [-i for i in range(10)])
+        self.assertEqual(array['c'][3], b'd')
+        self.assertEqual(array['d'][2], 0.5)
+        self.assertEqual(list(array['sub']['g']), list(range(1, 11)))
+        self.assertRaises(ValueError, TestNumpyComposite.array_from_bytes, data, 11, 1)
+
+    def test_to_bytes_from_array(self):
+        data = b''.join(self.make_composite(i).to_bytes() for i in range(10))
+        array = TestNumpyComposite.array_from_bytes(data, 10)[0]
+        self.assertEqual(TestNumpyComposite.to_bytes_from_array(array), data)
+        self.assertEqual(TestNumpyComposite.to_bytes_from_array(array[::3]),
+                         b''.join(self.make_composite(i).to_bytes() for i in range(0, 10, 3)))
+        self.assertRaises(ValueError, TestNumpyComposite.to_bytes_from_array, array['a'])
+
+
+class TestLazyComposite(Composite):
+    __lazy__ = True
+    a = SerialU16
+    b = SerialString
+    c = serial_list(SerialString)
+    d = SerialU32
+
+
+class TestSerialCompositeLazy(unittest.TestCase):
+    def setUp(self):
+        composite = TestLazyComposite()
+        composite.a = 1
+        composite.b = 'header'
+        composite.c = ['x' * i for i in range(10)]
+        composite.d = 2
+        self.data = bytearray(composite.to_bytes())
+
+    def test_pending(self):
+        composite = TestLazyComposite.from_bytes(self.data)[0]
+        self.assertEqual(composite.a, 1)
+        self.assertEqual(composite.d, 2)
+        self.assertEqual(sorted(composite.__dict__['_pending']), ['b', 'c'])
+        self.assertEqual(composite.b, 'header')
+        self.assertEqual(sorted(composite.__dict__['_pending']), ['c'])
+        self.assertEqual([string.get() for string in composite.c], ['x' * i for i in range(10)])
+        self.assertEqual(composite.__dict__['_pending'], {})
+
+    def test_copy_pending(self):
+        composite = TestLazyComposite.from_bytes(self.data)[0]
+        self.assertEqual(composite.to_bytes(), self.data)
+        composite.b = 'changed'
+        self.assertEqual(TestLazyComposite.from_bytes(composite.to_bytes())[0].b, 'changed')
+
+    def test_skip(self):
+        self.assertEqual(TestLazyComposite.skip(self.data), len(self.data))
+        self.assertEqual(TestScalarComposite.skip(TestScalarComposite().to_bytes(), 0),
+                         TestScalarComposite().serialized_size())
@@ -0,0 +1,74 @@
+from pyserialization.composite import Composite
+from pyserialization.compression import serial_compressed, Codec
+from pyserialization.serialint import SerialU32
+from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialString
+
+import io
+import unittest
+
+StringList = serial_list(SerialString)
+CompressedStrings = serial_compressed(StringList)
+
+
+class TestCompressedComposite(Composite):
+    a = SerialU32
+    b = CompressedStrings
+    c = serial_compressed(serial_list(SerialU32, compact=True), 'lzma', 1)
+
+
+class TestSerialCompressed(unittest.TestCase):
+    def test_codecs(self):
+        strings = StringList(['hello world'] * 1000)
+        for codec in ['none', 'zlib', 'bz2', 'lzma', Codec.zlib]:
+            compressed1 = serial_compressed(StringList, codec)(strings)
+            data = compressed1.to_bytes()
+            self.assertEqual(len(data), compressed1.serialized_size())
+            compressed2, index = CompressedStrings.from_bytes(data)
+            self.assertEqual(index, len(data))
+            self.assertEqual([value.get() for value in compressed2.get()], ['hello world'] * 1000)
+            if codec != 'none':
+                self.assertLess(len(data), len(strings.to_bytes()) // 10)
+
+    def test_composite(self):
+        composite1 = TestCompressedComposite()
+        composite1.a = 5
+        composite1.b = ['apple', 'pear']
+        composite1.c = range(10000)
+        data = b'\xff' + composite1.to_bytes()
+        composite2, index = TestCompressedComposite.from_bytes(data, 1)
+        self.assertEqual(index, len(data))
+        self.assertEqual(TestCompressedComposite.skip(data, 1), len(data))
+        self.assertEqual(composite2.a, 5)
+        self.assertEqual([value.get() for value in composite2.b], ['apple', 'pear'])
+        self.assertEqual(list(composite2.c), list(range(10000)))
+
+    def test_read_from(self):
+        data = CompressedStrings(['a', 'b']).to_bytes()
+        stream = io.BytesIO(data * 2)
+        for _ in range(2):
+            self.assertEqual([value.get() for value in CompressedStrings.read_from(stream).get()], ['a', 'b'])
+
+    def test_changed_after_size(self):
+        compressed = CompressedStrings(['a', 'b'])
+        size = compressed.serialized_size()
+        buffer = bytearray(size)
+        self.assertEqual(compressed.write_into(buffer), size)
+        self.assertEqual(bytes(buffer), compressed.to_bytes())
+        compressed.serialized_size()
+        compressed.get().append('c')
+        buffer = bytearray(100)
+        end_index = compressed.write_into(buffer)
+        self.assertEqual([value.get() for value in CompressedStrings.from_bytes(buffer[:end_index])[0].get()],
+                         ['a', 'b', 'c'])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, serial_compressed, StringList, 'gzip')
+        self.assertRaises(ValueError, CompressedStrings, 5)
+        data = bytearray(CompressedStrings().to_bytes())
+        data[0] = 200
+        self.assertRaises(ValueError, CompressedStrings.from_bytes, data)
+
+
+if __name__ == '__main__':
+    unittest.main()
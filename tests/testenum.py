@@ -1,4 +1,6 @@
+from pyserialization.composite import Composite
 from pyserialization.serialenum import serial_enum
+from pyserialization.serialint import SerialU8
 
 import unittest
 import enum
@@ -11,6 +13,13 @@ class TestEnum(enum.Enum):
     D = 34
 
 SerialTestEnum = serial_enum(TestEnum)
+CompactTestEnum = serial_enum(TestEnum, compact=True)
+
+
+class TestEnumComposite(Composite):
+    a = SerialU8
+    b = SerialTestEnum
+    c = CompactTestEnum
 
 
 class TestSerialEnum(unittest.TestCase):
@@ -27,4 +36,23 @@ class TestSerialEnum(unittest.TestCase):
         self.assertEqual(b.get().value, int)
 
     def test_incorrect(self):
-        self.assertRaises(ValueError, SerialTestEnum, 0)
\ No newline at end of file
+        self.assertRaises(ValueError, SerialTestEnum, 0)
+
+    def test_compact(self):
+        a = CompactTestEnum(TestEnum.D)
+        self.assertEqual(len(a.to_bytes()), 1)
+        self.assertEqual(len(SerialTestEnum(TestEnum.D).to_bytes()), 4)
+        self.assertEqual(CompactTestEnum.from_bytes(a.to_bytes())[0].get(), TestEnum.D)
+
+    def test_out_of_range(self):
+        self.assertRaises(ValueError, SerialTestEnum.from_bytes, b'\x04\x00\x00\x00')
+
+    def test_composite(self):
+        composite1 = TestEnumComposite()
+        composite1.b = TestEnum.B
+        composite1.c = TestEnum.C
+        data = composite1.to_bytes()
+        self.assertEqual(len(data), 6)
+        self.assertEqual(data[1:5], SerialTestEnum(TestEnum.B).to_bytes())
+        composite2 = TestEnumComposite.from_bytes(data)[0]
+        self.assertEqual((composite2.b, composite2.c), (TestEnum.B, TestEnum.C))
@@ -1,9 +1,16 @@
+from pyserialization.endianness import Endianess
 from pyserialization.serialfloat import SerialHalf, SerialFloat, SerialDouble
 
+import copy
+import pickle
 import unittest
 import sys
 
 
+class PickledDouble(SerialDouble):
+    pass
+
+
 def has_half_float_type():
     return sys.version_info[0] > 3 and sys.version_info[1] > 6
 
@@ -30,3 +37,17 @@ class TestSerialFloat(unittest.TestCase):
         if has_half_float_type():
             half = SerialHalf(10)
             self.assertEqual(len(half.to_bytes()), 2)
+
+    def test_endianness(self):
+        little = SerialDouble(1.5, endian=Endianess.little)
+        big = SerialDouble(1.5, endian=Endianess.big)
+        self.assertEqual(little.to_bytes(), big.to_bytes()[::-1])
+        self.assertEqual(SerialDouble.from_bytes(big.to_bytes(), endian=Endianess.big)[0].get(), 1.5)
+        self.assertFalse(hasattr(big, '__dict__'))
+
+    def test_pickle(self):
+        copied = copy.deepcopy(SerialDouble(1.5, endian=Endianess.big))
+        self.assertEqual(copied.to_bytes(), SerialDouble(1.5, endian=Endianess.big).to_bytes())
+        pickled = pickle.loads(pickle.dumps(PickledDouble(1.5, endian=Endianess.little)))
+        self.assertIs(type(pickled), PickledDouble)
+        self.assertEqual(pickled.to_bytes(), SerialDouble(1.5, endian=Endianess.little).to_bytes())
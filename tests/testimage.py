@@ -7,7 +7,18 @@ except ImportError:
     pil_installed = False
 
 if pil_installed:
-    from pyserialization.serialimage import SerialImage
+    from pyserialization.composite import Composite
+    from pyserialization.serialimage import SerialImage, SerialRawImage
+
+    class CountedImage(SerialImage):
+        encodes = 0
+
+        def _encode(self):
+            CountedImage.encodes += 1
+            return super()._encode()
+
+    class ImageHolder(Composite):
+        image = CountedImage
 
 
 @unittest.skipIf(not pil_installed, 'PIL not installed')
@@ -26,4 +37,83 @@ class TestSerialImage(unittest.TestCase):
                 r, g, b = image2.get().getpixel((i, j))
                 self.assertEqual(r, 255)
                 self.assertEqual(g, 0)
-                self.assertEqual(b, 0)
\ No newline at end of file
+                self.assertEqual(b, 0)
+
+    def test_offset(self):
+        data = b'\x00' + SerialImage(Image.new('RGB', (3, 2), color='blue')).to_bytes()
+        image, index = SerialImage.from_bytes(memoryview(data), 1)
+        self.assertEqual(image.get().getpixel((2, 1)), (0, 0, 255))
+        self.assertEqual(index, len(data))
+
+    def test_changed_after_size(self):
+        image = Image.new('RGB', (3, 2), color='blue')
+        image1 = SerialImage(image)
+        image1.serialized_size()
+        image.putpixel((0, 0), (255, 0, 0))
+        image2 = SerialImage.from_bytes(image1.to_bytes())[0]
+        self.assertEqual(image2.get().getpixel((0, 0)), (255, 0, 0))
+
+    def test_encoded_once(self):
+        holder = ImageHolder()
+        holder.image = Image.new('RGB', (3, 2), color='blue')
+        CountedImage.encodes = 0
+        data = holder.to_bytes()
+        self.assertEqual(CountedImage.encodes, 1)
+        self.assertEqual(ImageHolder.from_bytes(data)[0].image.getpixel((0, 0)), (0, 0, 255))
+
+    def test_changed_after_size_in_composite(self):
+        holder = ImageHolder()
+        holder.image = Image.new('RGB', (3, 2), color='blue')
+        holder.serialized_size()
+        holder.image.putpixel((0, 0), (255, 0, 0))
+        self.assertEqual(ImageHolder.from_bytes(holder.to_bytes())[0].image.getpixel((0, 0)), (255, 0, 0))
+
+
+if pil_installed:
+    class LazyImage(SerialImage):
+        __lazy__ = True
+
+    class LazyRawImage(SerialRawImage):
+        __lazy__ = True
+
+
+@unittest.skipIf(not pil_installed, 'PIL not installed')
+class TestSerialRawImage(unittest.TestCase):
+    def test_modes(self):
+        for mode in ['1', 'L', 'RGB', 'RGBA', 'I', 'F', 'CMYK']:
+            image1 = Image.new(mode, (7, 5), color=1)
+            image2, index = SerialRawImage.from_bytes(SerialRawImage(image1).to_bytes())
+            self.assertEqual(image2.get().mode, mode)
+            self.assertEqual(image2.get().size, (7, 5))
+            self.assertEqual(image2.get().tobytes(), image1.tobytes())
+
+    def test_palette(self):
+        image1 = Image.new('RGB', (4, 4), color='green').convert('P')
+        image2 = SerialRawImage.from_bytes(SerialRawImage(image1).to_bytes())[0]
+        self.assertEqual(image2.get().getpixel((1, 1)), image1.convert('RGBA').getpixel((1, 1)))
+
+    def test_offset(self):
+        data = b'\x00' + SerialRawImage(Image.new('RGB', (3, 2), color='blue')).to_bytes()
+        image, index = SerialRawImage.from_bytes(memoryview(data), 1)
+        self.assertEqual(image.get().getpixel((2, 1)), (0, 0, 255))
+        self.assertEqual(index, len(data))
+        self.assertEqual(SerialRawImage.skip(data, 1), len(data))
+
+    def test_short(self):
+        data = SerialRawImage(Image.new('RGB', (3, 2))).to_bytes()
+        self.assertRaises(ValueError, SerialRawImage.from_bytes, data[:-1])
+
+
+@unittest.skipIf(not pil_installed, 'PIL not installed')
+class TestLazyImage(unittest.TestCase):
+    def test_lazy(self):
+        for ImageType, LazyType in [(SerialImage, LazyImage), (SerialRawImage, LazyRawImage)]:
+            data = ImageType(Image.new('RGB', (30, 20), color='red')).to_bytes()
+            image = LazyType.from_bytes(data)[0]
+            self.assertIsNone(image._image)
+            self.assertEqual(image.mode, 'RGB')
+            self.assertEqual(image.size, (30, 20))
+            self.assertEqual(image.to_bytes(), data)
+            self.assertEqual(image.get().getpixel((29, 19)), (255, 0, 0))
+            self.assertEqual(image.size, (30, 20))
+            self.assertEqual(ImageType.from_bytes(image.to_bytes())[0].get().getpixel((0, 0)), (255, 0, 0))
@@ -1,8 +1,17 @@
-from pyserialization.serialint import SerialU8, SerialU16, SerialU32, SerialU64, SerialS8, SerialS16, SerialS32, SerialS64
+from pyserialization.endianness import Endianess
+from pyserialization.serialint import (SerialU8, SerialU16, SerialU32, SerialU64, SerialS8, SerialS16, SerialS32,
+                                        SerialS64)
 
+import copy
+import mmap
+import pickle
 import unittest
 
 
+class PickledU32(SerialU32):
+    pass
+
+
 class TestSerialInt(unittest.TestCase):
     def setUp(self):
         self.u8 = SerialU8()
@@ -59,3 +68,24 @@ class TestSerialInt(unittest.TestCase):
         self.assertRaises(ValueError, self.s16.set, s16)
         self.assertRaises(ValueError, self.s32.set, s32)
         self.assertRaises(ValueError, self.s64.set, s64)
+
+    def test_buffers(self):
+        data = SerialU16(1).to_bytes() + SerialS64(-5).to_bytes()
+        with mmap.mmap(-1, len(data)) as mapped:
+            mapped[:] = data
+            for buffer in (bytes(data), bytearray(data), memoryview(data), mapped):
+                u16, index = SerialU16.from_bytes(buffer)
+                s64, index = SerialS64.from_bytes(buffer, index)
+                self.assertEqual((u16.get(), s64.get(), index), (1, -5, len(data)))
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.u8, '__dict__'))
+        self.assertRaises(AttributeError, setattr, self.u8, 'other', 0)
+
+    def test_pickle(self):
+        for value in [SerialU32(7, endian=Endianess.big), PickledU32(7, endian=Endianess.big)]:
+            copied = copy.deepcopy(value)
+            self.assertEqual((copied.get(), copied.to_bytes()), (7, b'\x00\x00\x00\x07'))
+        pickled = pickle.loads(pickle.dumps(PickledU32(7, endian=Endianess.big)))
+        self.assertIs(type(pickled), PickledU32)
+        self.assertEqual((pickled.get(), pickled.to_bytes()), (7, b'\x00\x00\x00\x07'))
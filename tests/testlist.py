@@ -1,10 +1,38 @@
+from pyserialization.composite import Composite
+from pyserialization.endianness import Endianess
 from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialString
 from pyserialization.serialint import SerialU16
+from pyserialization.serialfloat import SerialDouble, SerialHalf
+from pyserialization.serialvarint import SerialVarUInt
 
+import io
+import multiprocessing
+import threading
 import unittest
 import random
 
 SerialU16List = serial_list(SerialU16)
+CompactU16List = serial_list(SerialU16, compact=True)
+CompactDoubleList = serial_list(SerialDouble, compact=True)
+
+
+class BigU16(SerialU16):
+    def __init__(self, value=0):
+        super().__init__(value, endian=Endianess.big)
+
+
+CompactBigU16List = serial_list(BigU16, compact=True)
+
+
+class TestListElement(Composite):
+    a = SerialU16
+    b = SerialString
+    c = serial_list(SerialU16)
+
+
+ElementList = serial_list(TestListElement)
+ReusedElementList = serial_list(TestListElement, reuse=True)
 
 
 class TestSerialList(unittest.TestCase):
@@ -27,3 +55,169 @@ class TestSerialList(unittest.TestCase):
 
     def test_inconvertible_type(self):
         self.assertRaises(ValueError, SerialU16List, ['hello'])
+
+    def test_extend_and_set_validate(self):
+        list1 = SerialU16List([1])
+        list1.extend(value for value in [2, SerialU16(3)])
+        list1 += [4]
+        list1[0] = 5
+        list1[1:3] = [6, 7]
+        self.assertEqual([value.get() for value in list1], [5, 6, 7, 4])
+        self.assertTrue(all(type(value) is SerialU16 for value in list1))
+        self.assertRaises(ValueError, list1.extend, [8, 'hello'])
+        self.assertRaises(ValueError, list1.__setitem__, 0, 'hello')
+        self.assertRaises(ValueError, list1.set, [9, 'hello'])
+        self.assertEqual([value.get() for value in list1], [5, 6, 7, 4])
+
+    def test_default_not_shared(self):
+        list1 = SerialU16List()
+        list1.append(1)
+        self.assertEqual(SerialU16List(), [])
+
+    def test_trusted(self):
+        values = [SerialU16(1), SerialU16(2)]
+        for list1 in [SerialU16List(values, trusted=True), SerialU16List.from_values_unchecked(iter(values))]:
+            self.assertIs(type(list1), SerialU16List)
+            self.assertIs(list1[1], values[1])
+            self.assertEqual([value.get() for value in SerialU16List.from_bytes(list1.to_bytes())[0]], [1, 2])
+
+    def test_reuse(self):
+        def make(count):
+            list1 = ElementList()
+            for number in range(count):
+                list1.append(TestListElement())
+                list1[number].a = number
+                list1[number].c.set(range(number))
+            return list1.to_bytes()
+
+        list1 = ReusedElementList.from_bytes(make(3))[0]
+        elements = list(list1)
+        for count in (3, 5, 2):
+            self.assertEqual(list1.load_in_place(make(count)), len(make(count)))
+            self.assertEqual([element.a for element in list1], list(range(count)))
+            self.assertEqual([len(element.c) for element in list1], list(range(count)))
+            for element, previous in zip(list1, elements):
+                self.assertIs(element, previous)
+        self.assertEqual(list1.to_bytes(), make(2))
+
+        list2 = ElementList.from_bytes(make(2))[0]
+        element = list2[0]
+        list2.load_in_place(make(2))
+        self.assertIsNot(list2[0], element)
+
+    def test_varint_length(self):
+        list1 = serial_list(SerialU16, length_type=SerialVarUInt)([1, 2])
+        data = list1.to_bytes()
+        self.assertEqual(len(data), 5)
+        self.assertEqual([value.get() for value in type(list1).from_bytes(data)[0]], [1, 2])
+
+    def test_read_from(self):
+        stream = io.BytesIO(SerialU16List([1, 2, 3]).to_bytes() + CompactU16List([4, 5]).to_bytes())
+        self.assertEqual([value.get() for value in SerialU16List.read_from(stream)], [1, 2, 3])
+        self.assertEqual(list(CompactU16List.read_from(stream)), [4, 5])
+
+    def test_write_into(self):
+        list1 = SerialU16List([1, 2, 3])
+        buffer = bytearray(2 + list1.serialized_size())
+        self.assertEqual(list1.write_into(buffer, 2), len(buffer))
+        self.assertEqual([value.get() for value in SerialU16List.from_bytes(buffer, 2)[0]], [1, 2, 3])
+
+    def test_write_to(self):
+        for list1 in [SerialU16List([1, 2, 3]), CompactU16List([4, 5])]:
+            stream = io.BytesIO()
+            list1.write_to(stream)
+            self.assertEqual(stream.getvalue(), list1.to_bytes())
+
+
+@unittest.skipIf('fork' not in multiprocessing.get_all_start_methods(), 'fork not supported')
+class TestParallelSerialList(unittest.TestCase):
+    def make_list(self, size):
+        elements = []
+        for i in range(size):
+            element = TestListElement()
+            element.a = i
+            element.b = 'x' * (i % 7)
+            element.c.set([i, i + 1])
+            elements.append(element)
+        return ElementList(elements)
+
+    def test_to_bytes(self):
+        list1 = self.make_list(101)
+        self.assertEqual(list1.to_bytes(workers=3), list1.to_bytes())
+
+    def test_threads(self):
+        lists = [self.make_list(size) for size in (50, 80, 101)]
+        results = [None] * len(lists)
+
+        def encode(position):
+            results[position] = lists[position].to_bytes(workers=2)
+        threads = [threading.Thread(target=encode, args=(position,)) for position in range(len(lists))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [list1.to_bytes() for list1 in lists])
+
+
+class TestCompactSerialList(unittest.TestCase):
+    def test_empty(self):
+        list1 = CompactU16List()
+        list2 = CompactU16List.from_bytes(list1.to_bytes())[0]
+        self.assertEqual(list(list2), [])
+
+    def test_same_bytes(self):
+        values = [int(random.random() * 65535) for _ in range(1000)]
+        self.assertEqual(CompactU16List(values).to_bytes(), SerialU16List(values).to_bytes())
+        list2 = CompactU16List.from_bytes(SerialU16List(values).to_bytes())[0]
+        self.assertEqual(list(list2), values)
+
+    def test_doubles(self):
+        values = [random.random() for _ in range(100)]
+        list2 = CompactDoubleList.from_bytes(CompactDoubleList(values).to_bytes())[0]
+        self.assertEqual(list(list2), values)
+
+    def test_serializable_values(self):
+        list1 = CompactU16List([SerialU16(3), 4])
+        self.assertEqual(list(list1), [3, 4])
+
+    def test_out_of_range(self):
+        self.assertRaises(ValueError, CompactU16List, [65536])
+        self.assertRaises(ValueError, CompactU16List, ['hello'])
+        self.assertRaises(ValueError, CompactU16List().append, -1)
+        list1 = CompactU16List([1, 2, 3])
+        list1[0] = SerialU16(3)
+        list1[1:] = [SerialU16(4), 5]
+        self.assertEqual(list(list1), [3, 4, 5])
+        self.assertRaises(ValueError, list1.__setitem__, 0, 70000)
+        self.assertRaises(ValueError, list1.__setitem__, slice(0, 1), ['hello'])
+        self.assertEqual(list(list1), [3, 4, 5])
+
+    def test_write_into(self):
+        list1 = CompactU16List([1, 2, 3])
+        buffer = bytearray(2 + list1.serialized_size())
+        with memoryview(buffer) as view:
+            self.assertEqual(list1.write_into(view, 2), len(buffer))
+        self.assertEqual(CompactU16List.from_bytes(buffer, 2)[0], list1)
+
+    def test_endianness(self):
+        list1 = CompactBigU16List([1, 0x203])
+        data = list1.to_bytes()
+        self.assertEqual(data, serial_list(BigU16)([1, 0x203]).to_bytes())
+        self.assertEqual(data[4:], b'\x00\x01\x02\x03')
+        self.assertEqual(list(CompactBigU16List.from_bytes(data)[0]), [1, 0x203])
+        self.assertEqual(list(CompactBigU16List.read_from(io.BytesIO(data))), [1, 0x203])
+        stream = io.BytesIO()
+        list1.write_to(stream)
+        self.assertEqual(stream.getvalue(), data)
+        self.assertEqual(list(list1), [1, 0x203])
+
+    def test_big_endian_length(self):
+        list_type = serial_list(SerialU16, length_type=BigU16)
+        data = list_type([5]).to_bytes()
+        self.assertEqual(data, b'\x00\x01\x05\x00')
+        self.assertEqual(list_type.skip(data), 4)
+        self.assertEqual([value.get() for value in list_type.from_bytes(data)[0]], [5])
+        self.assertEqual(list(serial_list(SerialU16, compact=True, length_type=BigU16).from_bytes(data)[0]), [5])
+
+    def test_unsupported_type(self):
+        self.assertRaises(ValueError, serial_list, SerialHalf, compact=True)
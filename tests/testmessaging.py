@@ -0,0 +1,105 @@
+from pyserialization.composite import Composite
+from pyserialization.messaging import MessageReader, MessageWriter
+from pyserialization.serialint import SerialU32
+from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialString
+from pyserialization.union import Union
+
+import socket
+import threading
+import unittest
+
+
+class Ping(Composite):
+    sequence = SerialU32
+
+
+class Data(Composite):
+    name = SerialString
+    values = serial_list(SerialU32, compact=True)
+
+
+class Message(Union):
+    ping = Ping
+    data = Data
+
+
+def make_ping(i):
+    ping = Ping()
+    ping.sequence = i
+    return ping
+
+
+def make_data(i, size):
+    data = Data()
+    data.name = 'data {}'.format(i)
+    data.values = range(size)
+    return data
+
+
+class TestMessaging(unittest.TestCase):
+    def transfer(self, messages, batch_size=1 << 16, buffer_size=1 << 16):
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            def send():
+                with sender, MessageWriter(sender, Message, batch_size) as writer:
+                    for message in messages:
+                        writer.write(message)
+            thread = threading.Thread(target=send)
+            thread.start()
+            received = list(MessageReader(receiver, Message, buffer_size))
+            thread.join()
+        return received
+
+    def test_small_messages(self):
+        received = self.transfer([make_ping(i) for i in range(10000)])
+        self.assertEqual([ping.sequence for ping in received], list(range(10000)))
+
+    def test_mixed_messages(self):
+        messages = []
+        for i in range(100):
+            messages.append(make_ping(i))
+            messages.append(make_data(i, i * 100))
+        received = self.transfer(messages, batch_size=1000, buffer_size=64)
+        self.assertEqual(len(received), 200)
+        for i in range(100):
+            self.assertEqual(received[2 * i].sequence, i)
+            self.assertEqual(received[2 * i + 1].name, 'data {}'.format(i))
+            self.assertEqual(list(received[2 * i + 1].values), list(range(i * 100)))
+
+    def test_union_message(self):
+        received = self.transfer([Message(Data, make_data(1, 3))])
+        self.assertEqual(list(received[0].values), [0, 1, 2])
+
+    def test_invalid_message(self):
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            self.assertRaises(ValueError, MessageWriter(sender, Message).write, SerialU32(5))
+            self.assertRaises(ValueError, MessageWriter, sender, Ping)
+
+    def test_closed_mid_message(self):
+        sender, receiver = socket.socketpair()
+        with receiver:
+            with sender:
+                sender.sendall(b'\x10\x00\x00\x00\x00')
+            self.assertRaises(EOFError, MessageReader(receiver, Message).read)
+
+
+    def test_frame_too_large(self):
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            sender.sendall(b'\xff\xff\xff\xff\x00')
+            reader = MessageReader(receiver, Message, buffer_size=64)
+            self.assertRaises(ValueError, reader.read)
+            self.assertEqual(len(reader._buffer), 64)
+        received = self.transfer([make_data(1, 100)])
+        self.assertEqual(len(received[0].values), 100)
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            with MessageWriter(sender, Message) as writer:
+                writer.write(make_data(1, 100))
+            self.assertRaises(ValueError, MessageReader(receiver, Message, max_frame_size=100).read)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,11 +7,21 @@ except ImportError:
     numpy_installed = False
 
 if numpy_installed:
-    from pyserialization.serialndarray import SerialNdArray
+    from pyserialization.serialndarray import SerialNdArray, SerialAlignedNdArray, serial_chunked_ndarray
+    SerialChunkedNdArray = serial_chunked_ndarray()
+    from pyserialization.composite import Composite
+    from pyserialization.compression import decompress, serial_compressed
+    from pyserialization.serialint import SerialU8, SerialU16
+
+    class AlignedHolder(Composite):
+        a = SerialU8
+        b = SerialU16
+        array = SerialAlignedNdArray
 
 
 import unittest
 import random
+import io
 
 
 @unittest.skipIf(not numpy_installed, 'numpy not installed')
@@ -25,6 +35,16 @@ class TestSerialNdArray(unittest.TestCase):
             array2 = SerialNdArray.from_bytes(data)[0]
             self.assertEqual(array2.get()[0], 1)
 
+    def test_datetimes(self):
+        for array in [np.arange('2020-01-01', '2020-01-10', dtype='datetime64[D]').reshape([3, 3]),
+                      np.array([1, -2, 3], dtype='timedelta64[ms]')]:
+            array1 = SerialNdArray(array)
+            data = array1.to_bytes()
+            self.assertEqual(len(data), array1.serialized_size())
+            array2 = SerialNdArray.from_bytes(data)[0].get()
+            self.assertEqual(array2.dtype, array.dtype)
+            self.assertTrue(np.all(array2 == array))
+
     def test_empty(self):
         array = np.zeros([])
         array1 = SerialNdArray(array)
@@ -43,4 +63,168 @@ class TestSerialNdArray(unittest.TestCase):
             array[i][j][k] = random.random()
         array1 = SerialNdArray(array)
         array2 = SerialNdArray.from_bytes(array1.to_bytes())[0]
-        self.assertTrue(np.all(array == array2.get()))
\ No newline at end of file
+        self.assertTrue(np.all(array == array2.get()))
+
+    def test_not_contiguous(self):
+        array = np.arange(100, dtype='int32').reshape([10, 10]).T[::2]
+        array1 = SerialNdArray(array)
+        self.assertEqual(array1.serialized_size(), len(array1.to_bytes()))
+        array2 = SerialNdArray.from_bytes(array1.to_bytes())[0]
+        self.assertTrue(np.all(array == array2.get()))
+
+    def test_read_from(self):
+        array = np.arange(24, dtype='float32').reshape([2, 3, 4])
+        stream = io.BytesIO(SerialNdArray(array).to_bytes() * 2)
+        for _ in range(2):
+            self.assertTrue(np.all(SerialNdArray.read_from(stream).get() == array))
+
+    def test_skip(self):
+        data = SerialNdArray(np.zeros([3, 4], dtype='complex64')).to_bytes()
+        self.assertEqual(SerialNdArray.skip(data), len(data))
+
+
+@unittest.skipIf(not numpy_installed, 'numpy not installed')
+class TestSerialAlignedNdArray(unittest.TestCase):
+    def round_trip(self, array, offset=0):
+        array1 = SerialAlignedNdArray(array)
+        size = array1.serialized_size()
+        buffer = bytearray(b'\xff' * (offset + size))
+        self.assertEqual(array1.write_into(buffer, offset), offset + size)
+        array2, index = SerialAlignedNdArray.from_bytes(bytes(buffer), offset)
+        self.assertEqual(index, offset + size)
+        self.assertEqual(SerialAlignedNdArray.skip(buffer, offset), index)
+        self.assertEqual(array2.get().dtype, array.dtype)
+        self.assertEqual(array2.get().shape, array.shape)
+        self.assertTrue(np.all(array2.get() == array))
+        return array2.get()
+
+    def test_dtypes(self):
+        for data_type in ['bool_', 'int8', 'uint16', 'int32', 'int64', 'float16', '>f4', '<f8', 'complex128']:
+            self.round_trip(np.arange(10).astype(data_type))
+        self.round_trip(np.asfortranarray(np.arange('2020-01-01', '2020-01-10', dtype='datetime64[D]').reshape([3, 3])))
+        self.round_trip(np.array([1, -2, 3], dtype='timedelta64[ms]'))
+
+    def test_aligned(self):
+        array1 = SerialAlignedNdArray(np.arange(12, dtype='float64').reshape([3, 4]))
+        for offset in range(70):
+            buffer = np.zeros(offset + array1.serialized_size(), dtype='uint8')
+            array1.write_into(memoryview(buffer), offset)
+            array2 = SerialAlignedNdArray.from_bytes(buffer, offset)[0].get()
+            self.assertEqual((array2.ctypes.data - buffer.ctypes.data) % 64, 0)
+            self.assertTrue(np.all(array1.get() == array2))
+
+    def test_zero_copy(self):
+        data = SerialAlignedNdArray(np.arange(100, dtype='int32')).to_bytes()
+        array = SerialAlignedNdArray.from_bytes(data)[0].get()
+        array2 = SerialAlignedNdArray.from_bytes(data)[0].get()
+        self.assertTrue(np.shares_memory(array, array2))
+
+    def test_layouts(self):
+        array = np.arange(60, dtype='int16').reshape([3, 4, 5])
+        self.round_trip(array)
+        self.assertTrue(self.round_trip(np.asfortranarray(array)).flags.f_contiguous)
+        self.assertTrue(self.round_trip(array[:, ::2, 1:]).flags.c_contiguous)
+        self.round_trip(np.zeros([]))
+        self.round_trip(np.zeros([0, 3]))
+
+    def test_read_from(self):
+        array = np.arange(24, dtype='float32').reshape([2, 3, 4])
+        stream = io.BytesIO(SerialAlignedNdArray(array).to_bytes() * 2)
+        for _ in range(2):
+            self.assertTrue(np.all(SerialAlignedNdArray.read_from(stream).get() == array))
+
+    def test_write_to(self):
+        holder = AlignedHolder()
+        holder.array = np.arange(12, dtype='float64').reshape([3, 4])
+        for offset in range(3):
+            stream = io.BytesIO()
+            stream.write(bytes(offset))
+            holder.write_to(stream)
+            buffer = np.frombuffer(stream.getvalue(), dtype='uint8')
+            array = AlignedHolder.from_bytes(buffer, offset)[0].array
+            self.assertEqual((array.ctypes.data - buffer.ctypes.data) % 64, 0)
+            self.assertTrue(np.all(array == holder.array))
+        stream = io.BytesIO()
+        holder.write_to(stream)
+        self.assertEqual(stream.getvalue(), holder.to_bytes())
+        data = serial_compressed(AlignedHolder)(holder).to_bytes()
+        self.assertEqual(decompress('zlib', data[5:]), holder.to_bytes())
+
+    def test_short(self):
+        data = SerialAlignedNdArray(np.arange(10)).to_bytes()
+        self.assertRaises(ValueError, SerialAlignedNdArray.from_bytes, data[:-1])
+
+
+@unittest.skipIf(not numpy_installed, 'numpy not installed')
+class TestSerialChunkedNdArray(unittest.TestCase):
+    def setUp(self):
+        self.array = np.arange(1000 * 7, dtype='int32').reshape([1000, 7])
+
+    def test_codecs(self):
+        for codec in ['none', 'zlib', 'bz2', 'lzma']:
+            ArrayType = serial_chunked_ndarray(codec, chunk_size=1000)
+            array1 = ArrayType(self.array)
+            data = array1.to_bytes()
+            self.assertEqual(len(data), array1.serialized_size())
+            array2, index = ArrayType.from_bytes(data)
+            self.assertEqual(index, len(data))
+            self.assertEqual(ArrayType.skip(data), len(data))
+            self.assertTrue(np.all(array2.get() == self.array))
+
+    def test_compresses(self):
+        array = SerialChunkedNdArray(np.zeros([1000, 1000]))
+        self.assertLess(array.serialized_size(), array.get().nbytes // 100)
+
+    def test_other_codec(self):
+        data = serial_chunked_ndarray('lzma', 1, chunk_size=333, workers=2)(self.array).to_bytes()
+        self.assertTrue(np.all(SerialChunkedNdArray.from_bytes(data)[0].get() == self.array))
+
+    def test_read_rows(self):
+        ArrayType = serial_chunked_ndarray(chunk_size=100)
+        data = b'\xff' + ArrayType(self.array).to_bytes()
+        for start, stop in [(0, 1000), (0, 1), (3, 4), (10, 500), (999, 1000), (-5, None), (7, 3)]:
+            rows = ArrayType.read_rows(data, start, stop, 1)
+            self.assertTrue(np.all(rows == self.array[start:stop]))
+            self.assertEqual(rows.shape, self.array[start:stop].shape)
+
+    def test_shapes(self):
+        for array in [np.zeros([]), np.zeros([0, 3]), np.arange(10, dtype='>f8'), np.arange(60).reshape([3, 4, 5]).T]:
+            array2 = SerialChunkedNdArray.from_bytes(SerialChunkedNdArray(array).to_bytes())[0].get()
+            self.assertEqual(array2.shape, array.shape)
+            self.assertTrue(np.all(array2 == array))
+
+    def test_changed_after_size(self):
+        array = np.arange(3)
+        array1 = SerialChunkedNdArray(array)
+        array1.serialized_size()
+        array[0] = 99
+        data = array1.to_bytes()
+        self.assertEqual(len(data), array1.serialized_size())
+        self.assertEqual(list(SerialChunkedNdArray.from_bytes(data)[0].get()), [99, 1, 2])
+        array[1] = 98
+        buffer = bytearray(len(data))
+        self.assertEqual(array1.write_into(buffer), len(data))
+        self.assertEqual(list(SerialChunkedNdArray.from_bytes(buffer)[0].get()), [99, 98, 2])
+
+    def test_to_bytes_not_kept(self):
+        array1 = SerialChunkedNdArray(self.array)
+        data = array1.to_bytes()
+        self.assertIsNone(array1._chunks)
+        buffer = bytearray(array1.serialized_size())
+        array1.write_into(buffer)
+        self.assertEqual(buffer, data)
+
+    def test_datetimes(self):
+        array = np.arange('2020-01-01', '2020-01-10', dtype='datetime64[D]').reshape([3, 3])
+        array2 = SerialChunkedNdArray.from_bytes(SerialChunkedNdArray(array).to_bytes())[0].get()
+        self.assertEqual(array2.dtype, array.dtype)
+        self.assertTrue(np.all(array2 == array))
+
+    def test_read_from(self):
+        stream = io.BytesIO(SerialChunkedNdArray(self.array).to_bytes() * 2)
+        for _ in range(2):
+            self.assertTrue(np.all(SerialChunkedNdArray.read_from(stream).get() == self.array))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, serial_chunked_ndarray, 'gzip')
+        self.assertRaises(ValueError, serial_chunked_ndarray, chunk_size=0)
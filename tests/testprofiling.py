@@ -0,0 +1,109 @@
+from pyserialization.composite import Composite
+from pyserialization.profiling import Profile
+from pyserialization.serialint import SerialU8, SerialU32
+from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialString
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+class ProfiledItem(Composite):
+    id = SerialU8
+    name = SerialString
+
+
+class ProfiledMessage(Composite):
+    id = SerialU32
+    items = serial_list(ProfiledItem)
+
+
+def _message(count):
+    message = ProfiledMessage()
+    for number in range(count):
+        item = ProfiledItem()
+        item.name = 'item {}'.format(number)
+        message.items.append(item)
+    return message
+
+
+class TestProfile(unittest.TestCase):
+    def test_stats(self):
+        data = _message(10).to_bytes()
+        with Profile() as profile:
+            ProfiledMessage.from_bytes(data)
+            _message(3).to_bytes()
+        message_stats = profile.stats[ProfiledMessage]
+        self.assertEqual((message_stats.decode_calls, message_stats.encode_calls), (1, 1))
+        self.assertEqual(message_stats.decode_bytes, len(data))
+        self.assertEqual(message_stats.max_depth, 0)
+        item_stats = profile.stats[ProfiledItem]
+        self.assertEqual((item_stats.decode_calls, item_stats.encode_calls), (10, 3))
+        self.assertEqual(item_stats.max_depth, 2)
+        self.assertEqual(profile.stats[SerialString].decode_calls, 10)
+        self.assertGreaterEqual(message_stats.decode_time, item_stats.decode_time)
+        self.assertLessEqual(message_stats.own_time, message_stats.decode_time + message_stats.encode_time)
+
+    def test_keyword_arguments(self):
+        buffer = bytearray(8)
+        with Profile() as profile:
+            self.assertEqual(SerialU32(5).write_into(buffer, offset=4), 8)
+            self.assertEqual(SerialU32().load_in_place(data=buffer, index=4), 8)
+            SerialU32().load_in_place(buffer)
+        self.assertEqual(SerialU32.from_bytes(buffer, 4)[0].get(), 5)
+        stats = profile.stats[SerialU32]
+        self.assertEqual((stats.encode_bytes, stats.decode_bytes), (4, 8))
+
+    def test_to_bytes(self):
+        with Profile() as profile:
+            SerialU32(5).to_bytes()
+        stats = profile.stats[SerialU32]
+        self.assertEqual((stats.encode_calls, stats.encode_bytes, stats.max_depth), (1, 4, 0))
+        with Profile() as profile:
+            data = _message(2).to_bytes()
+        message_stats = profile.stats[ProfiledMessage]
+        self.assertEqual((message_stats.encode_calls, message_stats.encode_bytes), (1, len(data)))
+        self.assertEqual(message_stats.max_depth, 0)
+        self.assertEqual(profile.stats[ProfiledItem].max_depth, 2)
+
+    def test_disabled(self):
+        load_in_place = ProfiledMessage.load_in_place
+        write_into = SerialString.write_into
+        with Profile() as profile:
+            self.assertIsNot(ProfiledMessage.load_in_place, load_in_place)
+            self.assertRaises(ValueError, Profile().enable)
+        self.assertIs(ProfiledMessage.load_in_place, load_in_place)
+        self.assertIs(SerialString.write_into, write_into)
+        _message(1).to_bytes()
+        self.assertNotIn(ProfiledItem, profile.stats)
+
+    def test_new_types(self):
+        with Profile() as profile:
+            class Late(Composite):
+                name = SerialString
+            Late.from_bytes(Late().to_bytes())
+        self.assertEqual(profile.stats[Late].decode_calls, 1)
+        self.assertNotIn('load_in_place', Late.__dict__)
+
+    def test_report(self):
+        with Profile() as profile:
+            _message(5).to_bytes()
+        lines = profile.report().splitlines()
+        self.assertTrue(lines[0].startswith('type'))
+        self.assertTrue(lines[1].startswith('ProfiledMessage'))
+        self.assertTrue(any(line.startswith('SerialList[ProfiledItem]') for line in lines))
+        self.assertEqual(len(profile.report('own', limit=2).splitlines()), 3)
+        self.assertRaises(ValueError, profile.report, 'size')
+
+    def test_environment(self):
+        environment = dict(os.environ, PYSERIALIZATION_PROFILE='1',
+                           PYTHONPATH=os.pathsep.join(sys.path))
+        code = 'from pyserialization.serialstring import SerialString; SerialString("abc").to_bytes()'
+        result = subprocess.run([sys.executable, '-c', code], env=environment, stderr=subprocess.PIPE, check=True)
+        self.assertIn(b'SerialString', result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+from pyserialization.composite import Composite
+from pyserialization.recordfile import MappedList, RecordFile
+from pyserialization.serialchar import SerialChar
+from pyserialization.serialfloat import SerialDouble
+from pyserialization.serialint import SerialS32
+from pyserialization.serialstring import SerialString
+
+import os
+import tempfile
+import unittest
+
+
+class TestRecord(Composite):
+    time = SerialDouble
+    value = SerialS32
+    flag = SerialChar
+
+
+class TestVariableRecord(Composite):
+    value = SerialS32
+    name = SerialString
+
+
+def make_record(i):
+    record = TestRecord()
+    record.time = i / 2
+    record.value = -i
+    record.flag = 'abc'[i % 3]
+    return record
+
+
+class TestRecordFile(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, 'wb') as file:
+            for i in range(100):
+                file.write(make_record(i).to_bytes())
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_read(self):
+        with RecordFile(TestRecord, self.path) as records:
+            self.assertEqual(len(records), 100)
+            self.assertEqual(records[42].value, -42)
+            self.assertEqual(records[-1].time, 49.5)
+            self.assertEqual([record.flag for record in records[3:9:2]], ['a', 'c', 'b'])
+            self.assertRaises(IndexError, lambda: records[100])
+
+    def test_write(self):
+        with RecordFile(TestRecord, self.path, writable=True) as records:
+            records[7] = make_record(1000)
+            records[8:10] = [make_record(2000), make_record(3000)]
+        with RecordFile(TestRecord, self.path) as records:
+            self.assertEqual([records[i].value for i in range(6, 11)], [-6, -1000, -2000, -3000, -10])
+            self.assertRaises(TypeError, records.__setitem__, 0, make_record(0))
+
+    def test_empty(self):
+        open(self.path, 'wb').close()
+        with RecordFile(TestRecord, self.path) as records:
+            self.assertEqual(len(records), 0)
+
+    def test_variable_size(self):
+        self.assertRaises(ValueError, MappedList, TestVariableRecord, bytes())
+
+    def test_bad_size(self):
+        self.assertRaises(ValueError, MappedList, TestRecord, bytes(TestRecord.__fixed_size__ + 1))
+
+    def test_buffer(self):
+        records = MappedList(TestRecord, bytearray(make_record(5).to_bytes() * 2))
+        records[1] = make_record(6)
+        self.assertEqual([record.value for record in records], [-5, -6])
@@ -0,0 +1,56 @@
+from pyserialization.serializable import Serializable
+
+import io
+import socket
+import unittest
+
+
+class Pair(Serializable):
+    __fixed_size__ = 2
+
+    def __init__(self):
+        self.values = (0, 0)
+
+    def load_in_place(self, data, index=0):
+        self.values = (data[index], data[index + 1])
+        return index + 2
+
+    def to_bytes(self):
+        return bytearray(self.values)
+
+
+class Word(Serializable):
+    def __init__(self, value=b''):
+        self.value = value
+
+    def load_in_place(self, data, index=0):
+        end_index = index + 1 + data[index]
+        self.value = bytes(data[index + 1:end_index])
+        return end_index
+
+    def to_bytes(self):
+        return bytearray([len(self.value)]) + self.value
+
+
+class TestSerializable(unittest.TestCase):
+    def test_load_from_fixed_size(self):
+        stream = io.BytesIO(b'\x01\x02\x03\x04')
+        self.assertEqual(Pair.read_from(stream).values, (1, 2))
+        self.assertEqual(Pair.read_from(stream).values, (3, 4))
+        self.assertRaises(EOFError, Pair.read_from, stream)
+
+    def test_load_from_seekable(self):
+        stream = io.BytesIO(Word(b'abc').to_bytes() + Word(b'de').to_bytes())
+        self.assertEqual(Word.read_from(stream).value, b'abc')
+        self.assertEqual(stream.tell(), 4)
+        self.assertEqual(Word.read_from(stream).value, b'de')
+
+    def test_load_from_not_seekable(self):
+        sender, receiver = socket.socketpair()
+        with sender, receiver, receiver.makefile('rb') as stream:
+            sender.sendall(Word(b'abc').to_bytes())
+            self.assertRaises(ValueError, Word.read_from, stream)
+
+
+if __name__ == '__main__':
+    unittest.main()
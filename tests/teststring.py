@@ -37,3 +37,22 @@ class TestSerialString(unittest.TestCase):
         string2ascii = SerialString.from_bytes(string1ascii.to_bytes())[0]
         self.assertEqual(string2.get(), text)
         self.assertEqual(string2ascii.get(), text)
+
+    def test_buffers(self):
+        text = 'a\u0e55\u0e57a'
+        data = b'\x00' + SerialString(text).to_bytes()
+        for buffer in (bytearray(data), memoryview(data)):
+            string, index = SerialString.from_bytes(buffer, 1)
+            self.assertEqual(string.get(), text)
+            self.assertEqual(index, len(data))
+
+    def test_reserialize_loaded(self):
+        string1 = SerialString('first')
+        string1.load_in_place(SerialString('second').to_bytes())
+        self.assertEqual(SerialString.from_bytes(string1.to_bytes())[0].get(), 'second')
+
+    def test_too_short(self):
+        self.assertRaises(ValueError, SerialString.from_bytes, SerialString('abc').to_bytes()[:-1])
+
+    def test_slots(self):
+        self.assertFalse(hasattr(SerialString(), '__dict__'))
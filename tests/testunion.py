@@ -1,7 +1,9 @@
-from pyserialization.union import Union
-from pyserialization.serialint import SerialU16, SerialU32
+from pyserialization.composite import Composite
+from pyserialization.union import Union, UnionMeta
+from pyserialization.serialint import SerialU8, SerialU16, SerialU32
 from pyserialization.serialstring import SerialString
 
+import io
 import unittest
 
 
@@ -45,3 +47,46 @@ class TestSerialUnion(unittest.TestCase):
         union2 = TestUnion.from_bytes(union1.to_bytes())[0]
         self.assertEqual(union2.get().get(), '')
         self.assertEqual(union2.get_type(), SerialString)
+
+    def test_read_from(self):
+        stream = io.BytesIO(TestUnion(SerialString, 'hello').to_bytes() + TestUnion(SerialU32, 7).to_bytes())
+        self.assertEqual(TestUnion.read_from(stream).c, 'hello')
+        self.assertEqual(TestUnion.read_from(stream).b, 7)
+
+    def test_write_to(self):
+        union = TestUnion(SerialString, 'hello')
+        stream = io.BytesIO()
+        union.write_to(stream)
+        self.assertEqual(stream.getvalue(), union.to_bytes())
+
+    def test_skip(self):
+        data = TestUnion(SerialString, 'hello').to_bytes()
+        self.assertEqual(TestUnion.skip(data), len(data))
+
+    def test_set_attribute(self):
+        union = TestUnion()
+        union.c = 'hello'
+        self.assertEqual(union.get_type(), SerialString)
+        self.assertEqual(union.c, 'hello')
+        self.assertEqual(TestUnion.c, SerialString)
+
+    def test_wide_tag(self):
+        types = {'t{}'.format(i): type('T{}'.format(i), (SerialU8,), {}) for i in range(300)}
+        WideUnion = UnionMeta('WideUnion', (Union,), dict(types))
+        union1 = WideUnion(types['t299'], 7)
+        self.assertEqual(len(union1.to_bytes()), 3)
+        union2 = WideUnion.from_bytes(union1.to_bytes())[0]
+        self.assertEqual(union2.t299, 7)
+        self.assertEqual(len(TestUnion(SerialU32, 1).to_bytes()), 5)
+
+    def test_isinstance(self):
+        class Ping(Composite):
+            sequence = SerialU32
+
+        class Message(Union):
+            ping = Ping
+
+        self.assertNotIsInstance(Ping(), Message)
+        self.assertNotIsInstance(TestUnion(), Message)
+        self.assertNotIsInstance(Message(), Ping)
+        self.assertIsInstance(Message(), Union)
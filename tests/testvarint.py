@@ -0,0 +1,133 @@
+from pyserialization.serialbytes import SerialVarBytes
+from pyserialization.seriallist import serial_list
+from pyserialization.serialstring import SerialVarString
+from pyserialization.serialvarint import SerialVarUInt, SerialVarSInt
+
+import asyncio
+import io
+import unittest
+
+try:
+    import numpy as np
+    numpy_installed = True
+except ImportError:
+    numpy_installed = False
+
+if numpy_installed:
+    from pyserialization.serialndarray import SerialVarNdArray
+
+
+class TestSerialVarInt(unittest.TestCase):
+    def test_encoding(self):
+        self.assertEqual(SerialVarUInt(0).to_bytes(), b'\x00')
+        self.assertEqual(SerialVarUInt(127).to_bytes(), b'\x7f')
+        self.assertEqual(SerialVarUInt(300).to_bytes(), b'\xac\x02')
+        self.assertEqual(SerialVarSInt(-1).to_bytes(), b'\x01')
+        self.assertEqual(SerialVarSInt(1).to_bytes(), b'\x02')
+        self.assertEqual(SerialVarSInt(-64).to_bytes(), b'\x7f')
+
+    def test_round_trip(self):
+        for Type in (SerialVarUInt, SerialVarSInt):
+            low, high = Type._range
+            for value in (low, low + 1, 0, 1, 127, 128, 16383, 16384, high - 1, high):
+                data = b'\xff' + Type(value).to_bytes()
+                obj, index = Type.from_bytes(data, 1)
+                self.assertEqual(obj.get(), value)
+                self.assertEqual(index, len(data))
+                self.assertEqual(Type.skip(data, 1), len(data))
+                self.assertEqual(Type(value).serialized_size(), len(data) - 1)
+                self.assertEqual(Type.read_from(io.BytesIO(data[1:])).get(), value)
+        self.assertEqual(len(SerialVarUInt(2 ** 64 - 1).to_bytes()), 10)
+
+    def test_range(self):
+        self.assertRaises(ValueError, SerialVarUInt, -1)
+        self.assertRaises(ValueError, SerialVarUInt, 2 ** 64)
+        self.assertRaises(ValueError, SerialVarSInt, 2 ** 63)
+        self.assertRaises(ValueError, SerialVarSInt, 1.0)
+
+    def test_bad_data(self):
+        self.assertRaises(ValueError, SerialVarUInt.from_bytes, b'\x80\x80')
+        self.assertRaises(ValueError, SerialVarUInt.from_bytes, b'\x80' * 11)
+        self.assertRaises(ValueError, SerialVarUInt.read_from, io.BytesIO(b'\x80' * 11))
+        self.assertRaises(ValueError, SerialVarUInt.from_bytes, b'\xff' * 9 + b'\x02')
+
+    def test_async(self):
+        async def read(data):
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            return await SerialVarSInt.read_async(reader)
+        self.assertEqual(asyncio.run(read(SerialVarSInt(-300).to_bytes())).get(), -300)
+
+
+class TestVarLengths(unittest.TestCase):
+    def test_string(self):
+        data = SerialVarString('abc').to_bytes()
+        self.assertEqual(data, b'\x03abc')
+        self.assertEqual(SerialVarString.from_bytes(data)[0].get(), 'abc')
+        self.assertEqual(len(SerialVarString('a' * 200).to_bytes()), 202)
+
+    def test_bytes(self):
+        data = SerialVarBytes(b'abc').to_bytes()
+        self.assertEqual(data, b'\x03abc')
+        self.assertEqual(SerialVarBytes.from_bytes(data)[0].get(), b'abc')
+        self.assertEqual(SerialVarBytes.skip(data), 4)
+
+    def test_list(self):
+        StringList = serial_list(SerialVarString, length_type=SerialVarUInt)
+        strings = StringList(['a', 'bc'])
+        data = strings.to_bytes()
+        self.assertEqual(data, b'\x02\x01a\x02bc')
+        self.assertEqual(len(data), strings.serialized_size())
+        self.assertEqual([value.get() for value in StringList.from_bytes(data)[0]], ['a', 'bc'])
+        self.assertEqual(StringList.skip(data), len(data))
+
+    @unittest.skipIf(not numpy_installed, 'numpy not installed')
+    def test_ndarray(self):
+        array = np.arange(6, dtype='<i2').reshape(2, 3)
+        obj = SerialVarNdArray(array)
+        data = obj.to_bytes()
+        self.assertEqual(len(data), obj.serialized_size())
+        loaded, index = SerialVarNdArray.from_bytes(data)
+        np.testing.assert_array_equal(loaded.get(), array)
+        self.assertEqual(index, len(data))
+        self.assertEqual(SerialVarNdArray.skip(data), len(data))
+        np.testing.assert_array_equal(SerialVarNdArray.read_from(io.BytesIO(data)).get(), array)
+
+
+class TestCompactVarIntList(unittest.TestCase):
+    def test_same_bytes(self):
+        for Type in (SerialVarUInt, SerialVarSInt):
+            values = [0, 1, 100, 127, 128, 5000, Type._range[1]] + ([-1, -200, Type._range[0]] if Type is SerialVarSInt
+                                                                  else [])
+            for length_type in (None, SerialVarUInt):
+                kwargs = {} if length_type is None else {'length_type': length_type}
+                regular = serial_list(Type, **kwargs)(values).to_bytes()
+                CompactList = serial_list(Type, compact=True, **kwargs)
+                compact = CompactList(values)
+                self.assertEqual(compact.to_bytes(), regular)
+                self.assertEqual(compact.serialized_size(), len(regular))
+                loaded, index = CompactList.from_bytes(b'\x00' + regular, 1)
+                self.assertEqual(list(loaded), values)
+                self.assertEqual(index, len(regular) + 1)
+                self.assertEqual(CompactList.skip(regular), len(regular))
+                self.assertEqual(list(CompactList.read_from(io.BytesIO(regular))), values)
+                stream = io.BytesIO()
+                compact.write_to(stream)
+                self.assertEqual(stream.getvalue(), regular)
+
+    def test_single_bytes(self):
+        CompactList = serial_list(SerialVarUInt, compact=True)
+        values = list(range(128)) * 3
+        data = CompactList(values).to_bytes()
+        self.assertEqual(len(data), 4 + len(values))
+        self.assertEqual(list(CompactList.from_bytes(data)[0]), values)
+
+    def test_bad_values(self):
+        CompactList = serial_list(SerialVarUInt, compact=True)
+        self.assertRaises(ValueError, CompactList, [-1])
+        self.assertRaises(ValueError, CompactList.from_bytes, CompactList([1, 300]).to_bytes()[:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()